@@ -1,7 +1,7 @@
 import numpy as np
 import scipy.sparse as sprs
 from scipy.sparse import csgraph
-from openpnm._skgraph.tools import conns_to_am, dict_to_am, dict_to_im
+from openpnm._skgraph.tools import conns_to_am, dict_to_am
 from openpnm._skgraph.tools import istriu, isgtriu
 from openpnm._skgraph.tools import get_node_prefix, get_edge_prefix
 
@@ -136,8 +136,9 @@ def find_connected_nodes(network, inds, flatten=True, logic='or'):
     edges = np.array(inds, ndmin=1)
     if len(edges) == 0:  # Short-circuit this function if edges is empty
         return []
-    am = dict_to_am(network)
-    neighbors = np.hstack((am.row[edges], am.col[edges]))
+    conns = network[get_edge_prefix(network)+'.conns']
+    head, tail = conns[edges, 0], conns[edges, 1]
+    neighbors = np.hstack((head, tail))
     if neighbors.size > 0:
         n_sites = np.amax(neighbors)
     if logic in ['or', 'union', 'any']:
@@ -147,7 +148,7 @@ def find_connected_nodes(network, inds, flatten=True, logic='or'):
     elif logic in ['xnor', 'nxor']:
         neighbors = np.unique(np.where(np.bincount(neighbors) > 1)[0])
     elif logic in ['and', 'all', 'intersection']:
-        temp = np.vstack((am.row[edges], am.col[edges])).T.tolist()
+        temp = np.vstack((head, tail)).T.tolist()
         temp = [set(pair) for pair in temp]
         neighbors = temp[0]
         [neighbors.intersection_update(pair) for pair in temp[1:]]
@@ -158,7 +159,7 @@ def find_connected_nodes(network, inds, flatten=True, logic='or'):
         if neighbors.size:
             mask = np.zeros(shape=n_sites + 1, dtype=bool)
             mask[neighbors] = True
-            temp = np.hstack((am.row[edges], am.col[edges])).astype(np.int64)
+            temp = np.hstack((head, tail)).astype(np.int64)
             temp[~mask[temp]] = -1
             inds = np.where(temp == -1)[0]
             if len(inds):
@@ -224,67 +225,33 @@ def find_neighbor_edges(network, inds, flatten=True, logic='or'):
     if global sites are considered.
 
     """
-    if flatten == False:
-        im = dict_to_im(network)
-        am = None
-    else:
-        am = dict_to_am(network)
-        im = None
-    if im is not None:
-        if im.format != 'lil':
-            im = im.tolil(copy=False)
-        rows = [im.rows[i] for i in np.array(inds, ndmin=1, dtype=np.int64)]
-        if len(rows) == 0:
-            return []
-        neighbors = np.hstack(rows).astype(np.int64)
-        n_bonds = int(im.nnz / 2)
-        if logic in ['or', 'union', 'any']:
-            neighbors = np.unique(neighbors)
-        elif logic in ['xor', 'exclusive_or']:
-            neighbors = np.unique(np.where(np.bincount(neighbors) == 1)[0])
-        elif logic in ['xnor', 'shared']:
-            neighbors = np.unique(np.where(np.bincount(neighbors) > 1)[0])
-        elif logic in ['and', 'all', 'intersection']:
-            neighbors = set(neighbors)
-            [neighbors.intersection_update(i) for i in rows]
-            neighbors = np.array(list(neighbors), dtype=int, ndmin=1)
-        else:
-            raise Exception('Specified logic is not implemented')
-        if (flatten is False):
-            if (neighbors.size > 0):
-                mask = np.zeros(shape=n_bonds, dtype=bool)
-                mask[neighbors] = True
-                for i in range(len(rows)):
-                    vals = np.array(rows[i], dtype=np.int64)
-                    rows[i] = vals[mask[vals]]
-                neighbors = rows
-            else:
-                neighbors = [np.array([], dtype=np.int64) for i in range(len(inds))]
-        return neighbors
-    elif am is not None:
-        if am.format != 'coo':
-            am = am.tocoo(copy=False)
-        if flatten is False:
-            raise Exception('flatten cannot be used with an adjacency matrix')
-        if isgtriu(network):
-            am = sprs.triu(am, k=1)
-        Ps = np.zeros(am.shape[0], dtype=bool)
-        Ps[inds] = True
-        conns = np.vstack((am.row, am.col)).T
-        if logic in ['or', 'union', 'any']:
-            neighbors = np.any(Ps[conns], axis=1)
-        elif logic in ['xor', 'exclusive_or']:
-            neighbors = np.sum(Ps[conns], axis=1) == 1
-        elif logic in ['xnor', 'shared']:
-            neighbors = np.all(Ps[conns], axis=1)
-        elif logic in ['and', 'all', 'intersection']:
-            raise Exception('Specified logic is not implemented')
-        else:
+    nodes = np.array(inds, ndmin=1, dtype=np.int64)
+    if flatten:
+        if logic in ['and', 'all', 'intersection']:
             raise Exception('Specified logic is not implemented')
-        neighbors = np.where(neighbors)[0]
-        return neighbors
+        # Each edge must be counted once per input node it touches
+        nodes = np.unique(nodes)
+    if len(nodes) == 0:
+        return np.array([], dtype=np.int64) if flatten else []
+    im = _get_im(network)
+    pos, counts = _gather_rows(im, nodes)
+    found = im.indices[pos].astype(np.int64)
+    if logic in ['or', 'union', 'any']:
+        neighbors = np.unique(found)
+    elif logic in ['xor', 'exclusive_or']:
+        neighbors = np.where(np.bincount(found) == 1)[0]
+    elif logic in ['xnor', 'shared']:
+        neighbors = np.where(np.bincount(found) > 1)[0]
+    elif logic in ['and', 'all', 'intersection']:
+        neighbors = np.where(np.bincount(found) == len(nodes))[0]
     else:
-        raise Exception('Either the incidence or the adjacency matrix must be specified')
+        raise Exception('Specified logic is not implemented')
+    if flatten is False:
+        mask = np.zeros(shape=im.shape[1], dtype=bool)
+        mask[neighbors] = True
+        rows = np.split(found, np.cumsum(counts)[:-1])
+        neighbors = [row[mask[row]] for row in rows]
+    return neighbors
 
 
 def find_neighbor_nodes(network, inds, flatten=True, include_input=False,
@@ -345,28 +312,23 @@ def find_neighbor_nodes(network, inds, flatten=True, include_input=False,
     nodes are considered.
 
     """
-    g = network
-    nodes = np.array(inds, ndmin=1)
+    nodes = np.array(inds, ndmin=1, dtype=np.int64)
     # Short-circuit the function if the input list is already empty
     if len(nodes) == 0:
         return []
-    am_coo = dict_to_am(g)
-    am = am_coo.tolil(copy=False)
-    rows = am.rows[nodes].tolist()
-    if len(rows) == 0:
-        return []
+    am = _get_am(network)
     n_nodes = am.shape[0]
-    neighbors = am_coo.col[np.in1d(am_coo.row, nodes)]
+    # Each neighbor must be counted once per distinct input node
+    unique = np.unique(nodes)
+    found = am.indices[_gather_rows(am, unique)[0]].astype(np.int64)
     if logic in ['or', 'union', 'any']:
-        neighbors = np.unique(neighbors)
+        neighbors = np.unique(found)
     elif logic in ['xor', 'exclusive_or']:
-        neighbors = np.unique(np.where(np.bincount(neighbors) == 1)[0])
+        neighbors = np.where(np.bincount(found) == 1)[0]
     elif logic in ['xnor', 'nxor']:
-        neighbors = np.unique(np.where(np.bincount(neighbors) > 1)[0])
+        neighbors = np.where(np.bincount(found) > 1)[0]
     elif logic in ['and', 'all', 'intersection']:
-        neighbors = set(neighbors)
-        [neighbors.intersection_update(i) for i in rows]
-        neighbors = np.array(list(neighbors), dtype=np.int64, ndmin=1)
+        neighbors = np.where(np.bincount(found) == len(unique))[0]
     else:
         raise Exception('Specified logic is not implemented')
     # Deal with removing inputs or not
@@ -378,13 +340,10 @@ def find_neighbor_nodes(network, inds, flatten=True, include_input=False,
     if flatten:
         neighbors = np.where(mask)[0]
     else:
-        if neighbors.size > 0:
-            for i in range(len(rows)):
-                vals = np.array(rows[i], dtype=np.int64)
-                rows[i] = vals[mask[vals]]
-            neighbors = rows
-        else:
-            neighbors = [np.array([], dtype=int) for i in range(len(nodes))]
+        pos, counts = _gather_rows(am, nodes)
+        rows = np.split(am.indices[pos].astype(np.int64),
+                        np.cumsum(counts)[:-1])
+        neighbors = [row[mask[row]] for row in rows]
     return neighbors
 
 
@@ -412,9 +371,11 @@ def find_connecting_edges(inds, network=None, am=None):
 
     Notes
     -----
-    The adjacency matrix is converted to the ``DOK`` format internally if
-    needed, so if this format is already available it should be provided to
-    save time.
+    When ``network`` is given the pairs are found by searching the rows of
+    its adjacency matrix in CSR format, which the network may keep cached.
+    A given ``am`` is converted to the ``DOK`` format internally if needed,
+    so if this format is already available it should be provided to save
+    time.
 
     """
     nodes = np.array(inds, ndmin=2)
@@ -422,14 +383,19 @@ def find_connecting_edges(inds, network=None, am=None):
     if nodes.size == 0:
         return []
     if network is not None:
-        edge_prefix = get_edge_prefix(network)
-        am = dict_to_am(
-            network,
-            weights=np.arange(network[edge_prefix+'.conns'].shape[0])
-        )
-    elif am is not None:
-        pass
-    else:
+        am = _get_am(network)
+        # Look for the second node of each pair in the row of the first
+        nodes = nodes.astype(np.int64)
+        pos, counts = _gather_rows(am, nodes[:, 0])
+        pairs = np.repeat(np.arange(nodes.shape[0]), counts)
+        hits = am.indices[pos] == nodes[pairs, 1]
+        if np.unique(pairs[hits]).size == nodes.shape[0]:
+            neighbors = np.zeros(nodes.shape[0], dtype=am.data.dtype)
+        else:
+            neighbors = np.full(nodes.shape[0], np.nan)
+        neighbors[pairs[hits]] = am.data[pos[hits]]
+        return neighbors
+    elif am is None:
         raise Exception('Either g or am must be provided')
     if am.format != 'dok':
         am = am.todok(copy=True)
@@ -514,8 +480,7 @@ def find_coordination(network, nodes=None):
     Supports directed and undirected graphs
 
     """
-    am = dict_to_am(network)
-    z = am.getnnz(axis=1)
+    z = np.diff(_get_am(network).indptr)
     if nodes is None:
         return z
     else:
@@ -581,3 +546,64 @@ def find_path(network, pairs, weights=None):
             nodes.append([])
             edges.append([])
     return {'node_paths': nodes, 'edge_paths': edges}
+
+
+def _get_am(network):
+    r"""
+    Returns the adjacency matrix in CSR format, with the edge indices as
+    values
+
+    Notes
+    -----
+    Networks that keep their adjacency matrix cached (i.e. those with a
+    ``get_adjacency_matrix`` method) are asked for it, so it is only built
+    once until their topology changes. Otherwise it is created from the
+    network dictionary.
+
+    """
+    if hasattr(network, 'get_adjacency_matrix'):
+        am = network.get_adjacency_matrix(fmt='csr')
+    else:
+        edge_prefix = get_edge_prefix(network)
+        weights = np.arange(network[edge_prefix+'.conns'].shape[0])
+        am = dict_to_am(network, weights=weights).tocsr()
+    am.sort_indices()
+    return am
+
+
+def _get_im(network):
+    r"""
+    Returns the incidence matrix in CSR format
+
+    Notes
+    -----
+    Networks that keep their incidence matrix cached (i.e. those with a
+    ``get_incidence_matrix`` method) are asked for it, so it is only built
+    once until their topology changes. Otherwise it is created from the
+    network dictionary. Unlike ``dict_to_im`` this works for directed
+    networks as well.
+
+    """
+    if hasattr(network, 'get_incidence_matrix'):
+        im = network.get_incidence_matrix(fmt='csr')
+    else:
+        conns = network[get_edge_prefix(network)+'.conns']
+        n_nodes = network[get_node_prefix(network)+'.coords'].shape[0]
+        n_edges = conns.shape[0]
+        im = sprs.coo_matrix((np.ones(2*n_edges, dtype=int),
+                              (conns.flatten(), np.repeat(np.arange(n_edges), 2))),
+                             shape=(n_nodes, n_edges)).tocsr()
+    im.sort_indices()
+    return im
+
+
+def _gather_rows(csr, rows):
+    r"""
+    Finds the locations in ``csr.indices`` and ``csr.data`` of the entries
+    in the given rows, concatenated in the order of ``rows``, along with
+    the number of entries in each row
+    """
+    starts = csr.indptr[rows]
+    counts = csr.indptr[rows + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return offsets + np.arange(counts.sum()), counts
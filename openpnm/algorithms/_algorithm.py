@@ -40,16 +40,36 @@ class Algorithm(ParserMixin, LabelMixin, Base2):
         self.settings._update(AlgorithmSettings())
         self['pore.all'] = np.ones([network.Np, ], dtype=bool)
         self['throat.all'] = np.ones([network.Nt, ], dtype=bool)
+        self._iterative_props = (None, [])
 
-    # @functools.cached_property
     @property
     def iterative_props(self):
         r"""
         Finds and returns properties that need to be iterated while
         running the algorithm.
+
+        Notes
+        -----
+        The result is cached and only recomputed when models are added to
+        or deleted from the phase, or when ``quantity`` or
+        ``variable_props`` are changed.
+
         """
-        import networkx as nx
         phase = self.project[self.settings.phase]
+        key = (id(phase.models), phase.models._version,
+               self.settings["quantity"],
+               frozenset(self.settings["variable_props"]))
+        if self._iterative_props[0] != key:
+            self._iterative_props = (key, self._find_iterative_props(phase))
+        return self._iterative_props[1].copy()
+
+    def _find_iterative_props(self, phase):
+        r"""
+        Finds the properties of the given phase that depend on
+        ``quantity`` or ``variable_props``, in the order in which they
+        should be regenerated.
+        """
+        import networkx as nx
         # Generate global dependency graph
         dg = nx.compose_all([x.models.dependency_graph(deep=True)
                              for x in [phase]])
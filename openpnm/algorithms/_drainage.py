@@ -1,13 +1,11 @@
 import numpy as np
+from numba import njit
 from tqdm.auto import tqdm
 from collections import namedtuple
 from openpnm.algorithms import Algorithm
 from openpnm.utils import Docorator, TypedSet
-from openpnm._skgraph.simulations import (
-    bond_percolation,
-    site_percolation,
-    find_connected_clusters,
-)
+from openpnm._skgraph.simulations import site_percolation
+from openpnm._skgraph.queries import qupc_initialize
 
 
 docstr = Docorator()
@@ -149,42 +147,62 @@ class Drainage(Algorithm):
         ----------
         pressures : int or ndarray
             The number of pressue steps to apply, or an array of specific
-            points
+            points. If ``None`` then every pressure at which a throat gets
+            invaded is used, which gives the exact invasion sequence.
+
+        Notes
+        -----
+        The pressure at which each pore and throat first becomes connected
+        to the inlets is found in a single pass, by adding throats in order
+        of increasing entry pressure and merging clusters using union-find.
+        Each pore and throat is then assigned the first of the given
+        ``pressures`` at which it is invaded, so the number of pressure
+        points has almost no effect on the cost.
 
         """
+        phase = self.project[self.settings.phase]
+        entry = phase[self.settings.throat_entry_pressure]
         if isinstance(pressures, int):
-            phase = self.project[self.settings.phase]
-            hi = 1.25*phase[self.settings.throat_entry_pressure].max()
-            low = 0.80*phase[self.settings.throat_entry_pressure].min()
+            hi = 1.25*entry.max()
+            low = 0.80*entry.min()
             pressures = np.logspace(np.log10(low), np.log10(hi), pressures)
-        pressures = np.array(pressures, ndmin=1)
-        msg = 'Performing drainage simulation'
-        for i, p in enumerate(tqdm(pressures, msg)):
-            self._run_special(p)
-            pmask = self['pore.invaded'] * (self['pore.invasion_pressure'] == np.inf)
-            self['pore.invasion_pressure'][pmask] = p
-            self['pore.invasion_sequence'][pmask] = i
-            tmask = self['throat.invaded'] * (self['throat.invasion_pressure'] == np.inf)
-            self['throat.invasion_pressure'][tmask] = p
-            self['throat.invasion_sequence'][tmask] = i
+        Pc_pores, Pc_throats = self._run_special()
+        if pressures is None:
+            pressures = np.hstack((Pc_pores, Pc_throats))
+            pressures = np.unique(pressures[np.isfinite(pressures)])
+        pressures = np.array(pressures, ndmin=1, dtype=float)
+        # Points with a nan pressure invade nothing so are skipped, but they
+        # still count towards the invasion sequence
+        points = np.flatnonzero(~np.isnan(pressures))
+        # A location is invaded at the first pressure point at or above the
+        # pressure at which it becomes connected to the inlets
+        pmax = np.maximum.accumulate(pressures[points])
+        for element, Pc in zip(['pore', 'throat'], [Pc_pores, Pc_throats]):
+            seq = np.searchsorted(pmax, Pc, side='left')
+            invaded = seq < points.size
+            seq[invaded] = points[seq[invaded]]
+            self[f'{element}.invaded'][invaded] = True
+            mask = invaded * (self[f'{element}.invasion_pressure'] == np.inf)
+            self[f'{element}.invasion_pressure'][mask] = pressures[seq[mask]]
+            self[f'{element}.invasion_sequence'][mask] = seq[mask]
         # If any outlets were specified, evaluate trapping
         if np.any(self['pore.bc.outlet']):
             self.apply_trapping()
 
-    def _run_special(self, pressure):
+    def _run_special(self):
+        r"""
+        Returns the lowest pressure at which each pore and throat is part
+        of a cluster of invadable throats that is connected to the inlets
+        """
         phase = self.project[self.settings.phase]
-        Tinv = phase[self.settings.throat_entry_pressure] <= pressure
-        # Tinv += self['throat.invaded']
-        # Remove trapped throats from this list, if any
-        # Tinv[self['throat.trapped']] = False
-        # Perform bond_percolation to label invaded clusters
-        s_labels, b_labels = bond_percolation(self.network.conns, Tinv)
-        # Remove label from any clusters not connected to the inlets
-        s_labels, b_labels = find_connected_clusters(
-            b_labels, s_labels, self['pore.bc.inlet'], asmask=False)
-        # Add result to existing invaded locations
-        self['pore.invaded'][s_labels >= 0] = True
-        self['throat.invaded'][b_labels >= 0] = True
+        entry = np.array(phase[self.settings.throat_entry_pressure],
+                         dtype=float)
+        Pc = _find_invasion_pressures(
+            conns=self.network.conns.astype(np.int_),
+            entry=entry,
+            order=np.argsort(entry, kind='stable'),
+            inlets=self['pore.bc.inlet'].astype(np.bool_))
+        return Pc[:self.Np], Pc[self.Np:]
 
     def apply_trapping(self):
         r"""
@@ -204,39 +222,42 @@ class Drainage(Algorithm):
         -----
         This search proceeds by the following 3 steps:
 
-        1. A site percolation is applied to *uninvaded* pores and they are set
-        to trapped if they belong to a cluster that is not connected to the
-        outlets.
-
-        2. All throats which were invaded at a pressure *higher* than either
+        1. All throats which were invaded at a pressure *higher* than either
         of its two neighboring pores are set to trapped, regardless of
         whether the pores themselves are trapped.
 
-        3. All throats which are connected to trapped pores are set to trapped
-        as these cannot be invaded since the fluid they contain cannot escape.
+        2. The invasion is reversed, by adding pores back to the defending
+        phase in order of decreasing invasion pressure and merging them into
+        clusters. Pores which are added at a given pressure and are not
+        part of a cluster that contains an outlet are trapped. This
+        requires a single pass, regardless of the number of invasion
+        pressures.
+
+        3. All throats which are connected to trapped pores are set to
+        trapped as these cannot be invaded since the fluid they contain
+        cannot escape. Specifically, a throat is trapped if the pore on
+        either end which was invaded last is trapped.
 
         """
         pseq = self['pore.invasion_pressure']
         tseq = self['throat.invasion_pressure']
+        conns = self.network.conns
         # Firstly, find any throats who were invaded at a pressure higher than
         # either of its two neighboring pores
-        temp = (pseq[self.network.conns].T > tseq).T
+        temp = (pseq[conns].T > tseq).T
         self['throat.trapped'][np.all(temp, axis=1)] = True
-        # Now scan through and use site percolation to find other trapped
-        # clusters of pores
-        for p in np.unique(pseq):
-            s, b = site_percolation(conns=self.network.conns,
-                                    occupied_sites=pseq > p)
-            # Identify cluster numbers connected to the outlets
-            clusters = np.unique(s[self['pore.bc.outlet']])
-            # Find ALL throats connected to any trapped site, since these
-            # throats must also be trapped, and update their cluster numbers
-            Ts = self.network.find_neighbor_throats(pores=s >= 0)
-            b[Ts] = np.amax(s[self.network.conns], axis=1)[Ts]
-            # Finally, mark pores and throats as trapped if their cluster
-            # numbers are NOT connected to the outlets
-            self['pore.trapped'] += np.isin(s, clusters, invert=True)*(s >= 0)
-            self['throat.trapped'] += np.isin(b, clusters, invert=True)*(b >= 0)
+        # Now perform the reverse invasion to find trapped clusters of pores
+        am = self.network.create_adjacency_matrix(fmt='csr')
+        Ptrap = _find_trapped_pores(
+            pseq=np.array(pseq, dtype=float),
+            order=np.argsort(-pseq, kind='stable'),
+            indices=am.indices,
+            indptr=am.indptr,
+            outlets=self['pore.bc.outlet'].astype(np.bool_))
+        self['pore.trapped'] += Ptrap
+        # Throats are trapped along with the pore on the end invaded last
+        last = conns[np.arange(conns.shape[0]), np.argmax(pseq[conns], axis=1)]
+        self['throat.trapped'] += Ptrap[last]
         # Use the identified trapped pores and throats to update the other
         # data on the object accordingly
         # self['pore.trapped'][self['pore.residual']] = False
@@ -271,6 +292,121 @@ class Drainage(Algorithm):
         return data
 
 
+@njit
+def _find_root(parent, i):  # pragma: no cover
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+@njit
+def _find_invasion_pressures(conns, entry, order, inlets):  # pragma: no cover
+    r"""
+    Finds the pressure at which each pore and throat becomes connected to
+    the inlets by throats with entry pressures at or below that pressure.
+    Returns an array of Np + Nt values, with pores first.
+
+    Throats are added in the given ``order``, which must sort ``entry``. A list of the
+    pores and throats in each cluster is kept, so when a cluster becomes
+    connected to the inlets its members are visited exactly once.
+    """
+    Np = inlets.size
+    Nt = conns.shape[0]
+    parent = qupc_initialize(Np)
+    size = np.ones(Np, dtype=np.int_)
+    connected = inlets.copy()
+    # Linked lists of the members of each cluster, with throats as Np + t
+    head = np.arange(Np)
+    tail = np.arange(Np)
+    nxt = -np.ones(Np + Nt, dtype=np.int_)
+    Pc = np.full(Np + Nt, np.inf)
+    for t in order:
+        e = entry[t]
+        if np.isnan(e):
+            break
+        P1, P2 = conns[t, 0], conns[t, 1]
+        r1, r2 = _find_root(parent, P1), _find_root(parent, P2)
+        if connected[r1] or connected[r2]:
+            # Invade the members of the cluster(s) not yet connected
+            for r in (r1, r2):
+                if not connected[r]:
+                    i = head[r]
+                    while i >= 0:
+                        if Pc[i] == np.inf:
+                            Pc[i] = e
+                        i = nxt[i]
+            if Pc[P1] == np.inf:
+                Pc[P1] = e
+            if Pc[P2] == np.inf:
+                Pc[P2] = e
+            Pc[Np + t] = e
+        if r1 != r2:
+            # Merge the smaller cluster into the larger
+            if size[r1] < size[r2]:
+                r1, r2 = r2, r1
+            parent[r2] = r1
+            size[r1] += size[r2]
+            connected[r1] = connected[r1] or connected[r2]
+            nxt[tail[r1]] = head[r2]
+            tail[r1] = tail[r2]
+        nxt[tail[r1]] = Np + t
+        tail[r1] = Np + t
+    return Pc
+
+
+@njit
+def _find_trapped_pores(pseq, order, indices, indptr, outlets):  # pragma: no cover
+    r"""
+    Finds the pores which are trapped by reversing the invasion, adding
+    pores back in the given ``order``, which must sort ``pseq`` in
+    decreasing order.
+
+    At each invasion pressure, the pores which were invaded at a higher
+    pressure are occupied by the defending phase. A pore is trapped if,
+    at the highest pressure at which it is occupied, it's not connected to
+    the outlets through other occupied pores. Since clusters only grow as
+    the pressure decreases, this needs only be checked once per pore.
+    """
+    Np = pseq.size
+    parent = qupc_initialize(Np)
+    size = np.ones(Np, dtype=np.int_)
+    escapes = outlets.copy()
+    occupied = np.zeros(Np, dtype=np.bool_)
+    trapped = np.zeros(Np, dtype=np.bool_)
+    pmin = np.nanmin(pseq)
+    i = 0
+    while i < Np:
+        val = pseq[order[i]]
+        # Pores invaded at the lowest pressure are never occupied, nor are
+        # pores with a nan pressure, which are sorted last
+        if (val == pmin) or np.isnan(val):
+            break
+        j = i + 1
+        while (j < Np) and (pseq[order[j]] == val):
+            j += 1
+        # Add all pores invaded at this pressure, merging with neighbors
+        for k in range(i, j):
+            pore = order[k]
+            occupied[pore] = True
+            for n in indices[indptr[pore]:indptr[pore+1]]:
+                if not occupied[n]:
+                    continue
+                r1, r2 = _find_root(parent, pore), _find_root(parent, n)
+                if r1 == r2:
+                    continue
+                if size[r1] < size[r2]:
+                    r1, r2 = r2, r1
+                parent[r2] = r1
+                size[r1] += size[r2]
+                escapes[r1] = escapes[r1] or escapes[r2]
+        for k in range(i, j):
+            pore = order[k]
+            trapped[pore] = not escapes[_find_root(parent, pore)]
+        i = j
+    return trapped
+
+
 # %%
 # def run_examples():
 if __name__ == '__main__':
@@ -1,5 +1,4 @@
 import logging
-import heapq as hq
 import numpy as np
 from numba import njit, jit
 from tqdm.auto import tqdm
@@ -79,6 +78,11 @@ class InvasionPercolation(Algorithm):
         self.reset()
 
     def reset(self):
+        r"""
+        Resets the algorithm's main results, so that the next call to
+        ``run`` starts from the beginning
+        """
+        self._state = None
         self['pore.invasion_sequence'] = -1
         self['throat.invasion_sequence'] = -1
         self['pore.trapped'] = False
@@ -187,43 +191,80 @@ class InvasionPercolation(Algorithm):
         """
         self.set_BC(pores=pores, bcvalues=True, bctype='outlet', mode=mode)
 
-    def run(self):
+    def run(self, n_steps=None, max_pressure=None, target_saturation=None):
         r"""
         Performs the algorithm for the given number of steps
 
-        """
-        # Setup arrays and info
-        # TODO: This should be called conditionally so that it doesn't
-        # overwrite existing data when doing a few steps at a time
-        self._run_setup()
-        n_steps = np.inf
+        Parameters
+        ----------
+        n_steps : int, optional
+            The number of throats to invade. If not given the invasion
+            proceeds until all accessible throats are invaded, or until
+            one of the other criteria is met.
+        max_pressure : float, optional
+            The invasion stops before invading a throat with an entry
+            pressure higher than this value.
+        target_saturation : float, optional
+            The invasion stops as soon as the saturation of the invading
+            phase, as computed by ``pc_curve``, reaches this value.
 
-        # Create incidence matrix for use in _run_accelerated which is jit
-        im = self.network.create_incidence_matrix(fmt='csr')
+        Notes
+        -----
+        Calling ``run`` again continues the invasion from where the
+        previous call stopped. The queue of accessible throats is kept
+        between calls, so this costs no more than invading in one go.
+        This is useful for coupling the invasion with other simulations,
+        such as finding the relative permeability at several saturations.
+        Use ``reset`` (or ``set_inlet_BC``) to start over, which is also
+        necessary if the entry pressures change.
 
-        # Perform initial analysis on input pores
-        Ts = self.project.network.find_neighbor_throats(pores=self['pore.bc.inlet'])
-        t_start = self['throat.order'][Ts]
-        t_inv, p_inv, p_inv_t = \
+        """
+        if self._state is None:
+            self._run_setup()
+        state = self._state
+        max_count = np.inf if n_steps is None else state['count'] + n_steps
+        max_pressure = np.inf if max_pressure is None else max_pressure
+        if target_saturation is None:
+            target_saturation = np.inf
+            t_vol, p_vol = np.zeros(self.Nt), np.zeros(self.Np)
+            snwp = 0.0
+        else:
+            t_vol, p_vol = self._get_normalized_volumes()
+            snwp = t_vol[self['throat.invasion_sequence'] >= 0].sum() \
+                + p_vol[self['pore.invasion_sequence'] >= 0].sum()
+        size, count, snwp = \
             _run_accelerated(
-                t_start=t_start,
-                t_sorted=self['throat.sorted'],
-                t_order=self['throat.order'],
+                heap=state['heap'],
+                size=state['size'],
+                queued=state['queued'],
+                t_sorted=state['sorted'],
+                t_order=state['order'],
                 t_inv=self['throat.invasion_sequence'],
                 p_inv=self['pore.invasion_sequence'],
-                p_inv_t=np.zeros_like(self['pore.invasion_sequence']),
+                p_inv_t=state['p_inv_t'],
                 conns=self.project.network['throat.conns'],
-                idx=im.indices,
-                indptr=im.indptr,
-                n_steps=n_steps)
-
-        # Transfer results onto algorithm object
-        self['throat.invasion_sequence'] = t_inv
-        self['pore.invasion_sequence'] = p_inv
-        self['throat.invasion_pressure'] = self['throat.entry_pressure']
-        self['pore.invasion_pressure'] = self['throat.entry_pressure'][p_inv_t]
+                idx=state['indices'],
+                indptr=state['indptr'],
+                n_steps=max_count,
+                count=state['count'],
+                t_entry=self['throat.entry_pressure'],
+                max_pressure=max_pressure,
+                t_vol=t_vol,
+                p_vol=p_vol,
+                snwp=snwp,
+                target_snwp=target_saturation)
+        state.update({'size': size, 'count': count})
+
+        # Transfer results onto algorithm object, the invasion sequences
+        # were updated in place
+        self['throat.invasion_pressure'] = self['throat.entry_pressure'].copy()
+        self['pore.invasion_pressure'] = \
+            self['throat.entry_pressure'][state['p_inv_t']]
         # Set invasion pressure of inlets to 0
         self['pore.invasion_pressure'][self['pore.invasion_sequence'] == 0] = 0.0
+        # Set invasion pressure of locations not invaded yet to inf
+        self['pore.invasion_pressure'][self['pore.invasion_sequence'] < 0] = np.inf
+        self['throat.invasion_pressure'][self['throat.invasion_sequence'] < 0] = np.inf
         # Set invasion sequence and pressure of any residual pores/throats to 0
         # self['throat.invasion_sequence'][self['throat.residual']] = 0
         # self['pore.invasion_sequence'][self['pore.residual']] = 0
@@ -237,12 +278,44 @@ class InvasionPercolation(Algorithm):
         self['throat.trapped'][Ts] = True
         # Get throat capillary pressures from phase and update
         phase = self.project[self.settings['phase']]
-        self['throat.entry_pressure'] = phase[self.settings['entry_pressure']]
+        self['throat.entry_pressure'] = phase[self.settings['entry_pressure']].copy()
         # self['throat.entry_pressure'][self['throat.residual']] = 0.0
-        # Generated indices into t_entry giving a sorted list
-        self['throat.sorted'] = np.argsort(self['throat.entry_pressure'], axis=0)
-        self['throat.order'] = 0
-        self['throat.order'][self['throat.sorted']] = np.arange(0, self.Nt)
+        # Generate indices into t_entry giving a sorted list, and the rank
+        # of each throat in that list, which is what the queue stores
+        t_sorted = np.argsort(self['throat.entry_pressure'], axis=0)
+        t_order = np.empty_like(t_sorted)
+        t_order[t_sorted] = np.arange(0, self.Nt)
+        # Create incidence matrix for use in _run_accelerated which is jit
+        im = self.network.create_incidence_matrix(fmt='csr')
+        # Start the queue with the throats connected to the inlets, a
+        # sorted array is already a valid heap
+        Ts = self.project.network.find_neighbor_throats(pores=self['pore.bc.inlet'])
+        heap = np.empty(self.Nt, dtype=t_order.dtype)
+        heap[:len(Ts)] = np.sort(t_order[Ts])
+        queued = np.zeros(self.Nt, dtype=bool)
+        queued[Ts] = True
+        # Store the information needed to continue the invasion later
+        self._state = {
+            'sorted': t_sorted,
+            'order': t_order,
+            'heap': heap,
+            'size': len(Ts),
+            'queued': queued,
+            'count': 1,
+            'p_inv_t': np.zeros_like(self['pore.invasion_sequence']),
+            'indices': im.indices,
+            'indptr': im.indptr,
+        }
+
+    def _get_normalized_volumes(self):
+        r"""
+        Returns the throat and pore volumes divided by the total volume
+        """
+        net = self.project.network
+        pvols = net[self.settings['pore_volume']]
+        tvols = net[self.settings['throat_volume']]
+        tot_vol = np.sum(pvols) + np.sum(tvols)
+        return tvols/tot_vol, pvols/tot_vol
 
     def pc_curve(self):
         r"""
@@ -250,13 +323,7 @@ class InvasionPercolation(Algorithm):
         capillary pressure.
 
         """
-        net = self.project.network
-        pvols = net[self.settings['pore_volume']]
-        tvols = net[self.settings['throat_volume']]
-        tot_vol = np.sum(pvols) + np.sum(tvols)
-        # Normalize
-        pvols /= tot_vol
-        tvols /= tot_vol
+        tvols, pvols = self._get_normalized_volumes()
         # Remove trapped volume
         pmask = self['pore.invasion_sequence'] >= 0
         tmask = self['throat.invasion_sequence'] >= 0
@@ -266,15 +333,13 @@ class InvasionPercolation(Algorithm):
         tseq = self['throat.invasion_sequence'][tmask]
         pPc = self['pore.invasion_pressure'][pmask]
         tPc = self['throat.invasion_pressure'][tmask]
-        vols = np.concatenate((pvols, tvols))
-        seqs = np.concatenate((pseq, tseq))
-        Pcs = np.concatenate((pPc, tPc))
-        data = np.rec.fromarrays([seqs, vols, Pcs],
-                                 formats=['i', 'f', 'f'],
-                                 names=['seq', 'vol', 'Pc'])
-        data.sort(axis=0, order='seq')
+        vols = np.concatenate((pvols, tvols)).astype(np.float32)
+        seqs = np.concatenate((pseq, tseq)).astype(np.int32)
+        Pcs = np.concatenate((pPc, tPc)).astype(np.float32)
+        # Sort by sequence, breaking ties by volume then pressure
+        inds = np.lexsort((Pcs, vols, seqs))
         pc_curve = namedtuple('pc_curve', ('pc', 'snwp'))
-        data = pc_curve(data.Pc, np.cumsum(data.vol))
+        data = pc_curve(Pcs[inds], np.cumsum(vols[inds]))
         return data
 
     def apply_trapping(self):
@@ -415,8 +480,52 @@ def _find_trapped_pores(inv_seq, indices, indptr, outlets):  # pragma: no cover
 
 
 @njit
-def _run_accelerated(t_start, t_sorted, t_order, t_inv, p_inv, p_inv_t,
-                     conns, idx, indptr, n_steps):  # pragma: no cover
+def _heap_push(heap, size, item):  # pragma: no cover
+    r"""
+    Adds ``item`` to the binary min-heap stored in ``heap[:size]`` and
+    returns the new size of the heap
+    """
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 1
+        if heap[parent] <= item:
+            break
+        heap[i] = heap[parent]
+        i = parent
+    heap[i] = item
+    return size + 1
+
+
+@njit
+def _heap_pop(heap, size):  # pragma: no cover
+    r"""
+    Removes the smallest item from the binary min-heap stored in
+    ``heap[:size]`` and returns it along with the new size of the heap
+    """
+    top = heap[0]
+    size -= 1
+    item = heap[size]
+    i = 0
+    while True:
+        child = 2*i + 1
+        if child >= size:
+            break
+        if (child + 1 < size) and (heap[child + 1] < heap[child]):
+            child += 1
+        if heap[child] >= item:
+            break
+        heap[i] = heap[child]
+        i = child
+    if size > 0:
+        heap[i] = item
+    return top, size
+
+
+@njit
+def _run_accelerated(heap, size, queued, t_sorted, t_order, t_inv, p_inv,
+                     p_inv_t, conns, idx, indptr, n_steps, count, t_entry,
+                     max_pressure, t_vol, p_vol, snwp,
+                     target_snwp):  # pragma: no cover
     r"""
     Numba-jitted run method for InvasionPercolation class.
 
@@ -428,45 +537,48 @@ def _run_accelerated(t_start, t_sorted, t_order, t_inv, p_inv, p_inv_t,
     Numba doesn't like foreign data types (i.e. Network), and so
     ``find_neighbor_throats`` method cannot be called in a jitted method.
 
-    Nested wrapper is for performance issues (reduced OpenPNM import)
-    time due to local numba import
+    The queue is a binary min-heap stored in ``heap[:size]`` and holds the
+    rank of each accessible throat in the sorted list of entry pressures,
+    so the heap works on integers only. ``queued`` flags the throats that
+    have been added to the heap, so each throat enters it at most once
+    and ``heap`` never needs more than ``Nt`` entries.
+
+    The invasion continues from the state given by the heap, ``count``
+    (the next invasion sequence number) and ``snwp`` (the current
+    saturation), and stops once ``count`` reaches ``n_steps``, the next
+    throat's entry pressure exceeds ``max_pressure``, or ``snwp`` reaches
+    ``target_snwp``. The arrays are updated in place and the new ``size``,
+    ``count`` and ``snwp`` are returned so the invasion can be continued
+    later.
 
     """
-    # TODO: The following line is supposed to be numba's new list, but the
-    # heap does not work with this
-    # queue = List(t_start)
-    queue = list(t_start)
-    hq.heapify(queue)
-    count = 1
-    while count < (n_steps + 1):
-        # Find throat at the top of the queue
-        t = hq.heappop(queue)
-        # Extract actual throat number
+    while (count < n_steps) and (size > 0):
+        # Stop if the next throat can't be invaded yet
+        if t_entry[t_sorted[heap[0]]] > max_pressure:
+            break
+        if snwp >= target_snwp:
+            break
+        # Find throat at the top of the queue and extract its number
+        t, size = _heap_pop(heap, size)
         t_next = t_sorted[t]
         t_inv[t_next] = count
-        # If throat is duplicated
-        while len(queue) > 0 and queue[0] == t:
-            _ = hq.heappop(queue)
-        # Find pores connected to newly invaded throat from am in coo format
-        Ps = conns[t_next]
-        # Remove already invaded pores from Ps
-        Ps = Ps[p_inv[Ps] < 0]
-        # If either of the neighboring pores are uninvaded (-1), set it to
-        # invaded and add its neighboring throats to the queue
-        if len(Ps) > 0:
-            p_inv[Ps] = count
-            p_inv_t[Ps] = t_next
-            for i in Ps:
-                # Get neighboring throat numbers from im in csr format
-                Ts = idx[indptr[i]:indptr[i+1]]
-                # Keep only throats which are uninvaded
-                Ts = Ts[t_inv[Ts] < 0]
-            for i in Ts:  # Add throat to the queue
-                hq.heappush(queue, t_order[i])
+        snwp += t_vol[t_next]
+        # Invade either of the neighboring pores that is uninvaded (-1)
+        # and add its uninvaded neighboring throats to the queue
+        for k in range(2):
+            i = conns[t_next, k]
+            if p_inv[i] >= 0:
+                continue
+            p_inv[i] = count
+            p_inv_t[i] = t_next
+            snwp += p_vol[i]
+            # Get neighboring throat numbers from im in csr format
+            for j in idx[indptr[i]:indptr[i+1]]:
+                if (t_inv[j] < 0) and not queued[j]:
+                    queued[j] = True
+                    size = _heap_push(heap, size, t_order[j])
         count += 1
-        if len(queue) == 0:
-            break
-    return t_inv, p_inv, p_inv_t
+    return size, count, snwp
 
 
 # %%
@@ -2,6 +2,7 @@ import logging
 import sys
 
 import numpy as np
+from numba import njit
 from numpy.linalg import norm
 from scipy.optimize.nonlin import TerminationCondition
 from tqdm.auto import tqdm
@@ -38,12 +39,27 @@ class ReactiveTransportSettings:
         Relative tolerance for the solution residual
     x_rtol : float
         Relative tolerance for the solution vector
+    nonlinear_solver : str
+        The method used to solve the nonlinear system. Options are:
+
+        ===========  =====================================================
+        method       meaning
+        ===========  =====================================================
+        'picard'     (default) Successive substitution, i.e. the system
+                     is repeatedly relinearized and solved, with the
+                     solution under-relaxed by ``relaxation_factor``.
+        'newton'     Newton's method with a backtracking line search. The
+                     Jacobian is assembled from the linearized source
+                     terms and the derivatives of the conductance, so
+                     ``relaxation_factor`` is not used.
+        ===========  =====================================================
 
     """
     relaxation_factor = 1.0
     newton_maxiter = 5000
     f_rtol = 1e-6
     x_rtol = 1e-6
+    nonlinear_solver = 'picard'
 
 
 @docstr.get_sections(base="ReactiveTransport", sections=["Parameters"])
@@ -174,6 +190,8 @@ class ReactiveTransport(Transport):
             Initial guess of the unknown variable
 
         """
+        if self.settings["nonlinear_solver"] == "newton":
+            return self._run_newton(solver=solver, verbose=verbose)
         w = self.settings["relaxation_factor"]
         maxiter = self.settings["newton_maxiter"]
         f_rtol = self.settings["f_rtol"]
@@ -212,6 +230,174 @@ class ReactiveTransport(Transport):
         self.soln.is_converged = False
         logger.warning(f"{self.name} didn't converge after {maxiter} iterations")
 
+    def _run_newton(self, solver, verbose=None, max_backtracks=10):
+        r"""
+        Solves the nonlinear system using Newton's method with a
+        backtracking line search on the norm of the residual.
+
+        Parameters
+        ----------
+        solver : BaseSolver
+            The solver used for the linear system in each Newton step.
+            Since the Jacobian has the same sparsity pattern in every
+            iteration, solvers that cache their preconditioner reuse it.
+        max_backtracks : int
+            Maximum number of times the step size is halved in each
+            iteration in search of a reduction in the residual. If none of
+            the step sizes reduce the residual the smallest one is taken
+            and a warning is logged.
+
+        Notes
+        -----
+        The same stopping criteria as the default Picard iterations are
+        used (see ``_run_special``).
+
+        """
+        maxiter = self.settings["newton_maxiter"]
+        f_rtol = self.settings["f_rtol"]
+        x_rtol = self.settings["x_rtol"]
+        quantity = self.settings["quantity"]
+        # Impose value BCs on the initial guess so that the residual in BC
+        # rows, which is scaled arbitrarily, doesn't bias the line search
+        locs = self._get_BC_locations()
+        if 'value' in locs.keys():
+            x = self.x.copy()
+            x[locs['value']] = self['pore.bc.value'][locs['value']]
+            self.x = x
+            self._update_A_and_b()
+        xold = self.x
+        dx = np.zeros_like(xold)
+        condition = TerminationCondition(
+            f_tol=np.inf, f_rtol=f_rtol, x_rtol=x_rtol, norm=norm
+        )
+
+        tqdm_settings = {
+            "total": 100,
+            "desc": f"{self.name} : Newton iterations",
+            "disable": not verbose,
+            "file": sys.stdout,
+            "leave": False,
+        }
+
+        with tqdm(**tqdm_settings) as pbar:
+            for i in range(maxiter):
+                res = self._get_residual()
+                progress = self._get_progress(res)
+                pbar.update(progress - pbar.n)
+                is_converged = bool(condition.check(f=res, x=xold, dx=dx))
+                if is_converged:
+                    pbar.update(100 - pbar.n)
+                    self.soln.is_converged = is_converged
+                    logger.info(f"Solution converged, residual norm: {norm(res):.4e}")
+                    return
+                J = self._get_jacobian()
+                step, _ = solver.solve(A=J, b=-res, x0=np.zeros_like(res))
+                # Backtrack until the residual is sufficiently reduced
+                res_norm = norm(res)
+                alpha = 1.0
+                for _ in range(max_backtracks):
+                    self.x = xold + alpha * step
+                    self._update_A_and_b()
+                    if norm(self._get_residual()) < (1 - 1e-4*alpha) * res_norm:
+                        break
+                    alpha /= 2
+                else:
+                    alpha *= 2
+                    logger.warning(f"{self.name}: line search failed to reduce"
+                                   f" the residual in iteration #{i}, taking"
+                                   f" a step of size {alpha:.4g}")
+                dx = self.x - xold
+                xold = self.x
+                self.soln[quantity][:] = self.x
+                logger.info(f"Iteration #{i:<4d} | Residual norm: {res_norm:.4e}"
+                            f" | Step size: {alpha:.4g}")
+                self.soln.num_iter = i + 1
+
+        self.soln.is_converged = False
+        logger.warning(f"{self.name} didn't converge after {maxiter} iterations")
+
+    def _get_jacobian(self):
+        r"""
+        Returns the Jacobian of the residual, ``R = A*x - b``, with respect
+        to ``x``.
+
+        Notes
+        -----
+        The derivatives of the source terms are already included in ``A``
+        since the linearized source terms contribute ``-S1`` to its
+        diagonal. If the conductance depends on ``quantity``, its
+        derivatives are found by finite differences. Pores are colored such
+        that no two neighbors share a color, so that perturbing all pores
+        of one color at once gives the derivative of each throat with
+        respect to each of its pores. This costs one evaluation of the
+        iterative properties per color. The resulting Jacobian has the same
+        sparsity pattern as ``A``.
+
+        """
+        J = self.A.copy()
+        if self.settings["conductance"] not in self.iterative_props:
+            return J
+        x = self.x
+        conns = self.network.conns
+        dg = self._get_conductance_derivatives()
+        # d(A*x)/dx due to dg/dx: u[:, k] affects column conns[:, k]
+        u = dg[:, 1, :] * x[conns[:, [0]]] - dg[:, 0, :] * x[conns[:, [1]]]
+        vals = np.hstack((u[:, 1], -u[:, 0], u[:, 0], -u[:, 1]))
+        pattern = self.network.get_laplacian_pattern()
+        data = np.bincount(pattern['tmap'], weights=vals,
+                           minlength=J.data.size)
+        # The rows of value BCs are not affected
+        locs = self._get_BC_locations()
+        if 'value' in locs.keys():
+            isbc = np.zeros(self.Np, dtype=bool)
+            isbc[locs['value']] = True
+            data[isbc[pattern['row']]] = 0
+        J.data += data
+        return J
+
+    def _get_conductance_derivatives(self):
+        r"""
+        Returns an Nt-by-2-by-2 array of the derivatives of the conductance
+        values in the upper/lower triangle (axis 1) with respect to
+        ``quantity`` in the head/tail pore (axis 2) of each throat.
+        """
+        phase = self.project[self.settings.phase]
+        gvals = self.settings["conductance"]
+        x = self.x.copy()
+        conns = self.network.conns
+        colors = self._get_pore_colors()
+        g0 = np.array(phase[gvals], dtype=float)
+        g0 = np.tile(g0, (2, 1)).T if g0.ndim == 1 else g0
+        h = np.sqrt(np.finfo(float).eps) * (np.abs(x) + np.abs(x).max())
+        h[h == 0] = np.sqrt(np.finfo(float).eps)
+        dg = np.zeros((self.Nt, 2, 2), dtype=float)
+        try:
+            for c in range(colors.max() + 1):
+                Ps = colors == c
+                self.x = x + h * Ps
+                self._update_iterative_props()
+                g = np.array(phase[gvals], dtype=float)
+                g = np.tile(g, (2, 1)).T if g.ndim == 1 else g
+                for k in range(2):
+                    Ts = Ps[conns[:, k]]
+                    dg[Ts, :, k] = (g[Ts] - g0[Ts]) / h[conns[Ts, k], None]
+        finally:
+            self.x = x
+            self._update_iterative_props()
+        return dg
+
+    def _get_pore_colors(self):
+        r"""
+        Returns a coloring of the pores such that no two neighboring pores
+        have the same color.
+        """
+        colors = getattr(self, "_pore_colors", None)
+        if (colors is None) or (colors.size != self.Np):
+            pattern = self.network.get_laplacian_pattern()
+            colors = _greedy_coloring(pattern['indptr'], pattern['indices'])
+            self._pore_colors = colors
+        return colors
+
     def _get_progress(self, res):
         """
         Returns an approximate value for completion percent of Newton iterations.
@@ -254,3 +440,25 @@ class ReactiveTransport(Transport):
             pass
         # Assign BCs if above check passes
         super().set_BC(pores=pores, bctype=bctype, bcvalues=bcvalues, mode=mode)
+
+
+@njit
+def _greedy_coloring(indptr, indices):
+    r"""
+    Colors the nodes of a graph given in CSR format such that no two
+    neighbors have the same color, by visiting the nodes in order and
+    assigning each the smallest color not used by its neighbors.
+    """
+    N = indptr.size - 1
+    colors = -np.ones(N, dtype=np.int64)
+    marker = -np.ones(N + 1, dtype=np.int64)
+    for i in range(N):
+        for k in range(indptr[i], indptr[i + 1]):
+            c = colors[indices[k]]
+            if c >= 0:
+                marker[c] = i
+        c = 0
+        while marker[c] == i:
+            c += 1
+        colors[i] = c
+    return colors
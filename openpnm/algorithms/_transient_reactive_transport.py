@@ -1,9 +1,12 @@
 import logging
+import hashlib
+from collections import OrderedDict
 import numpy as np
+import scipy.sparse as sprs
 from openpnm.algorithms import ReactiveTransport
 from openpnm.utils import Docorator
 from openpnm.integrators import ScipyRK45
-from openpnm.algorithms._solution import SolutionContainer
+from openpnm.algorithms._solution import SolutionContainer, TransientSolution
 
 
 __all__ = ['TransientReactiveTransport']
@@ -47,8 +50,9 @@ class TransientReactiveTransport(ReactiveTransport):
         self.settings._update(TransientReactiveTransportSettings())
         self.settings['phase'] = phase.name
         self["pore.ic"] = np.nan
+        self._Ab_cache = None
 
-    def run(self, x0, tspan, saveat=None, integrator=None):
+    def run(self, x0, tspan, saveat=None, integrator=None, writer=None):
         """
         Runs the transient algorithm and returns the solution.
 
@@ -65,6 +69,13 @@ class TransientReactiveTransport(ReactiveTransport):
         integrator : Integrator, optional
             Integrator object which will be used to to the time stepping.
             Can be instantiated using openpnm.integrators module.
+        writer : XdmfWriter, optional
+            An object with an ``append(t, x)`` method, such as
+            ``openpnm.io.XdmfWriter``, to which the solution at each of
+            the ``saveat`` times is passed as soon as it has been computed.
+            Since the integrator is restarted at each of these times, the
+            results differ slightly from those of a run without a writer,
+            within the tolerances of the integrator. See Notes.
 
         Returns
         -------
@@ -74,6 +85,17 @@ class TransientReactiveTransport(ReactiveTransport):
             solution at intermediate times (i.e., those not stored in the
             solution object).
 
+        Notes
+        -----
+        When a ``writer`` is given the time span is integrated piecewise,
+        stopping at each of the ``saveat`` times, so that only the current
+        solution is held in memory. The solution stored on the algorithm
+        then contains the last two of the ``saveat`` times only (or the
+        last one if there is only one), so that it can be interpolated
+        over the final interval, and the full time series is found
+        wherever the ``writer`` put it. Restarting the integrator at each
+        of the ``saveat`` times may take a few more steps in total.
+
         """
         logger.info('Running TransientTransport')
         if np.isscalar(saveat):
@@ -90,14 +112,39 @@ class TransientReactiveTransport(ReactiveTransport):
         # Write x0 to algorithm the obj (needed by _update_iterative_props)
         self['pore.ic'] = x0 = np.ones(self.Np, dtype=float) * x0
         self._merge_inital_and_boundary_values()
+        self._reset_A_and_b_cache()
         # Build RHS (dx/dt = RHS), then integrate the system of ODEs
         rhs = self._build_rhs()
+        jac = self._build_jac()
         # Integrate RHS using the given solver
-        soln = integrator.solve(rhs, x0, tspan, saveat)
+        if writer is None:
+            soln = integrator.solve(rhs, x0, tspan, saveat, jac=jac)
+        else:
+            soln = self._run_streaming(integrator, rhs, jac, x0, tspan,
+                                       saveat, writer)
         # Return solution as dictionary
         self.soln = SolutionContainer()
         self.soln[self.settings['quantity']] = soln
 
+    def _run_streaming(self, integrator, rhs, jac, x0, tspan, saveat, writer):
+        r"""
+        Integrates between consecutive saveat times, passing the solution
+        at each one to the writer instead of storing it
+        """
+        saveat = np.array(tspan if saveat is None else saveat, ndmin=1)
+        t, x = tspan[0], x0
+        # The last two time steps are kept so the solution can be
+        # interpolated over the final interval
+        ts, xs = [], []
+        for ti in saveat:
+            if ti > t:
+                soln = integrator.solve(rhs, x, (t, ti), [ti], jac=jac)
+                t, x = ti, np.asarray(soln)[:, -1]
+            writer.append(t, x)
+            ts, xs = (ts + [t])[-2:], (xs + [x])[-2:]
+        self.x = x
+        return TransientSolution(ts, np.vstack(xs).T)
+
     def _run_special(self, x0):
         pass
 
@@ -111,17 +158,90 @@ class TransientReactiveTransport(ReactiveTransport):
         ``TransientFickianDiffusion``, it would be concentration.
 
         """
+        V = self.network[self.settings["pore_volume"]]
+
         def ode_func(t, y):
-            # TODO: add a cache mechanism
-            self.x = y
-            self._update_A_and_b()
-            A = self.A.tocsc()
-            b = self.b
-            V = self.network[self.settings["pore_volume"]]
-            return (-A.dot(y) + b) / V  # much faster than A*y
+            self._update_A_and_b_cached(y)
+            return (-self.A.dot(y) + self.b) / V
 
         return ode_func
 
+    def _build_jac(self):
+        """
+        Returns a function handle, which calculates the Jacobian of the
+        RHS, i.e. d(rhs)/dy = jac(t, y), as a sparse matrix.
+
+        Notes
+        -----
+        This is used by the implicit integrators. It is ``-J/V``, where
+        ``J`` is the Jacobian of the residual returned by
+        ``_get_jacobian``, which is simply ``A`` when nothing depends on
+        ``quantity``.
+
+        """
+        V = self.network[self.settings["pore_volume"]]
+
+        def jac_func(t, y):
+            self._update_A_and_b_cached(y)
+            J = self._get_jacobian()
+            return -sprs.diags(1 / V).dot(J).tocsr()
+
+        return jac_func
+
+    def _reset_A_and_b_cache(self, maxsize=8):
+        r"""
+        Clears the cache used by ``_update_A_and_b_cached``. This must be
+        called before integrating since BCs, sources or properties may
+        have changed since the last run.
+        """
+        self._Ab_cache = {
+            'linear': len(self.iterative_props) == 0,
+            'maxsize': maxsize,
+            'items': OrderedDict(),
+            'props': None,
+        }
+
+    def _update_A_and_b_cached(self, y):
+        r"""
+        Sets ``x`` to ``y`` and updates A and b, reusing previously built
+        ones where possible.
+
+        Notes
+        -----
+        If nothing depends on ``quantity`` then A and b are only built
+        once. Otherwise the most recently used A and b are kept, keyed on
+        a hash of ``y``, so that the integrator asking for the RHS and the
+        Jacobian at the same point doesn't cause A and b to be rebuilt.
+        Time is not part of the key since A and b don't depend on it.
+
+        The iterative properties on the phase are still updated when A and
+        b are taken from the cache but were last computed for a different
+        ``y``, since the Jacobian is found by perturbing them.
+
+        """
+        if self._Ab_cache is None:
+            self._reset_A_and_b_cache()
+        cache = self._Ab_cache
+        items = cache['items']
+        self.x = y
+        if cache['linear']:
+            key = None
+        else:
+            y = np.ascontiguousarray(y, dtype=float)
+            key = hashlib.blake2b(y.view(np.uint8), digest_size=16).digest()
+        if key in items:
+            items.move_to_end(key)
+            self.A, self.b = items[key]
+            if cache['props'] != key:
+                self._update_iterative_props()
+                cache['props'] = key
+            return
+        self._update_A_and_b()
+        cache['props'] = key
+        items[key] = (self.A, self.b)
+        if len(items) > cache['maxsize']:
+            items.popitem(last=False)
+
     def _merge_inital_and_boundary_values(self):
         x0 = self['pore.ic']
         bc_pores = ~np.isnan(self['pore.bc.value'])
@@ -1,9 +1,9 @@
 import logging
 import numpy as np
-import scipy.sparse.csgraph as spgr
+import scipy.sparse as sprs
 from openpnm.topotools import is_fully_connected
 from openpnm.algorithms import Algorithm
-from openpnm.utils import Docorator, TypedSet, Workspace
+from openpnm.utils import Docorator, TypedSet, Workspace, segmented_reduce
 from openpnm.utils import check_data_health
 from openpnm import solvers
 from ._solution import SteadyStateSolution, SolutionContainer
@@ -71,6 +71,7 @@ class Transport(Algorithm):
         self._b = None
         self._pure_A = None
         self._pure_b = None
+        self._BC_locs = None
         self.soln = {}
 
     def __getitem__(self, key):
@@ -101,18 +102,23 @@ class Transport(Algorithm):
         The conductance to use is specified in stored in the algorithm's
         settings under ``alg.settings['conductance']``.
 
+        The sparsity pattern of the matrix is fetched from the network,
+        so when the conductance is an iterative property only the non-zero
+        values are refreshed on each call.
+
         """
         gvals = self.settings['conductance']
         if gvals in self.iterative_props:
             self.settings.cache = False
-        if not self.settings['cache']:
-            self._pure_A = None
-        if self._pure_A is None:
+        if (self._pure_A is None) or (not self.settings['cache']):
             phase = self.project[self.settings.phase]
             g = phase[gvals]
-            am = self.network.create_adjacency_matrix(weights=g, fmt='coo')
-            self._pure_A = spgr.laplacian(am).astype(float)
-        self.A = self._pure_A.copy()
+            self._pure_A = self.network.create_laplacian_matrix(
+                weights=g, out=self._pure_A)
+        A = self._pure_A
+        # Share the sparsity pattern with pure_A, only copy the values
+        self.A = sprs.csr_matrix((A.data.copy(), A.indices, A.indptr),
+                                 shape=A.shape)
 
     def _build_b(self):
         """Initializes the RHS vector, b, with zeros."""
@@ -142,31 +148,72 @@ class Transport(Algorithm):
     def b(self, value):
         self._b = value
 
+    def _get_BC_locations(self):
+        """
+        Returns the pores with rate and value BCs, and the non-zero
+        entries of ``A`` affected by the value BCs.
+
+        Notes
+        -----
+        The entries of ``A`` affected by the value BCs are found once for
+        each set of BC locations and stored for future use. The pores with
+        BCs are found on every call, which is cheap, so that the stored
+        entries are never used after the ``'pore.bc'`` arrays are changed,
+        including in place. They are also discarded by ``set_BC`` and when
+        the sparsity pattern of ``A`` changes.
+
+        """
+        masks = {}
+        for bctype in ['rate', 'value']:
+            if f'pore.bc.{bctype}' in self.keys():
+                masks[bctype] = np.isfinite(self[f'pore.bc.{bctype}'])
+        locs = self._BC_locs
+        if (locs is not None) and (locs['nnz'] == self.A.nnz) \
+                and (locs['masks'].keys() == masks.keys()) \
+                and all(np.array_equal(locs['masks'][k], v)
+                        for k, v in masks.items()):
+            return locs
+        pattern = self.network.get_laplacian_pattern()
+        row, col = pattern['row'], self.A.indices
+        locs = {'nnz': self.A.nnz, 'masks': masks}
+        if 'rate' in masks.keys():
+            locs['rate'] = np.where(masks['rate'])[0]
+        if 'value' in masks.keys():
+            ind = masks['value']
+            locs['value'] = np.where(ind)[0]
+            # Entries in the rows and/or columns of the BC pores
+            locs['rowcol'] = np.where(ind[row] | ind[col])[0]
+            # Entries in the columns of the BC pores, excluding BC rows
+            locs['col'] = np.where(~ind[row] & ind[col])[0]
+            locs['diag'] = pattern['diag'][locs['value']]
+        self._BC_locs = locs
+        return locs
+
     def _apply_BCs(self):
         """Applies specified boundary conditions by modifying A and b."""
-        if 'pore.bc.rate' in self.keys():
+        locs = self._get_BC_locations()
+        if 'rate' in locs.keys():
             # Update b
-            ind = np.isfinite(self['pore.bc.rate'])
-            self.b[ind] = self['pore.bc.rate'][ind]
-        if 'pore.bc.value' in self.keys():
-            f = self.A.diagonal().mean()
+            Ps = locs['rate']
+            self.b[Ps] = self['pore.bc.rate'][Ps]
+        if 'value' in locs.keys():
+            pattern = self.network.get_laplacian_pattern()
+            f = self.A.data[pattern['diag']].mean()
             # Update b (impose bc values)
-            ind = np.isfinite(self['pore.bc.value'])
-            self.b[ind] = self['pore.bc.value'][ind] * f
+            Ps = locs['value']
+            x_BC = self['pore.bc.value'][Ps]
+            self.b[Ps] = x_BC * f
             # Update b (subtract quantities from b to keep A symmetric)
-            x_BC = np.zeros_like(self.b)
-            x_BC[ind] = self['pore.bc.value'][ind]
-            self.b[~ind] -= (self.A * x_BC)[~ind]
-            # Update A
-            P_bc = self.to_indices(ind)
-            mask = np.isin(self.A.row, P_bc) | np.isin(self.A.col, P_bc)
+            x = np.zeros(self.Np, dtype=float)
+            x[Ps] = x_BC
+            inds = locs['col']
+            rows = pattern['row'][inds]
+            vals = self.A.data[inds] * x[self.A.indices[inds]]
+            self.b -= np.bincount(rows, weights=vals, minlength=self.Np)
             # Remove entries from A for all BC rows/cols
-            self.A.data[mask] = 0
+            self.A.data[locs['rowcol']] = 0
             # Add diagonal entries back into A
-            datadiag = self.A.diagonal()
-            datadiag[P_bc] = np.ones_like(P_bc, dtype=float) * f
-            self.A.setdiag(datadiag)
-            self.A.eliminate_zeros()
+            self.A.data[locs['diag']] = f
 
     def run(self, solver=None, x0=None, verbose=False):
         """
@@ -220,6 +267,129 @@ class Transport(Algorithm):
         self.soln[self.settings['quantity']][:] = self.x
         self.soln.is_converged = not bool(exit_code)
 
+    def run_batch(self, values=None, rates=None, b=None, solver=None):
+        """
+        Solves the system for a stack of boundary conditions (or right-hand
+        side vectors) at once, reusing the coefficient matrix and its
+        factorization/preconditioner.
+
+        Parameters
+        ----------
+        values : ndarray, optional
+            An n-by-Np array of value BCs, one row per member of the batch,
+            with ``nan`` in pores that have no value BC. If not given, the
+            value BCs currently set on the algorithm are used for all
+            members.
+        rates : ndarray, optional
+            An n-by-Np array of rate BCs, formatted like ``values``. If not
+            given, the rate BCs currently set on the algorithm are used for
+            all members.
+        b : ndarray, optional
+            An Np-by-n array of right-hand-side vectors to use directly
+            with the ``A`` matrix built from the BCs set on the algorithm,
+            one column per member of the batch. A single vector of length
+            Np is treated as a batch of one. Cannot be combined with
+            ``values`` or ``rates``.
+        solver : BaseSolver, optional
+            The solver to use. If not given, the default solver specified
+            in the Workspace settings is used.
+
+        Notes
+        -----
+        Members of the batch are grouped by the locations of their BCs,
+        since those of the value BCs determine ``A``. Each group is
+        validated and solved once, with all its right-hand sides passed to
+        the solver as a block if it is a direct solver, and the BC
+        locations are only found once per group. This only applies to linear
+        problems, i.e. algorithms without iterative properties.
+
+        The solution is stored in the algorithm's ``soln`` attribute as an
+        Np-by-n array, one column per member of the batch, and ``rate``
+        returns one value per member.
+
+        """
+        logger.info('Running Transport for a batch of BCs')
+        if solver is None:
+            solver = getattr(solvers, ws.settings.default_solver)()
+        self._validate_settings()
+        if self.iterative_props:
+            raise Exception('Batched runs are only possible for linear systems')
+        if (b is not None) and ((values is not None) or (rates is not None)):
+            raise Exception('Must specify either BCs or b, not both')
+        if b is not None:
+            B = np.array(b, dtype=float)
+            if B.ndim == 1:
+                B = B[:, None]
+            if (B.ndim != 2) or (B.shape[0] != self.Np):
+                raise Exception('b must be an Np-by-n array')
+            self._validate_topology_health()
+            self._update_A_and_b()
+            X, exit_code = self._solve_batch(solver, B)
+        else:
+            X, exit_code = self._run_batch_BCs(values, rates, solver)
+        self.x = X
+        self.soln = SolutionContainer()
+        self.soln[self.settings['quantity']] = SteadyStateSolution(X)
+        self.soln.is_converged = not bool(exit_code)
+
+    def _run_batch_BCs(self, values, rates, solver):
+        """Assembles and solves the batch, grouped by value BC locations."""
+        bcs = {'value': values, 'rate': rates}
+        for bctype, vals in bcs.items():
+            if vals is None:
+                vals = self[f'pore.bc.{bctype}'][None, :]
+            bcs[bctype] = np.array(vals, dtype=float, ndmin=2)
+        n = max(bcs['value'].shape[0], bcs['rate'].shape[0])
+        for bctype, vals in bcs.items():
+            if vals.shape[0] == 1:
+                bcs[bctype] = np.repeat(vals, n, axis=0)
+            if bcs[bctype].shape != (n, self.Np):
+                raise Exception(f'{bctype} BCs must be an n-by-Np array')
+        if np.any(np.isfinite(bcs['value']) & np.isfinite(bcs['rate'])):
+            raise Exception('Some of the given locations have both BC types')
+        # Group the members by the locations of their BCs
+        locs = np.hstack([np.isfinite(bcs['value']), np.isfinite(bcs['rate'])])
+        _, groups = np.unique(locs, axis=0, return_inverse=True)
+        groups = groups.ravel()
+        X = np.zeros((self.Np, n), dtype=float)
+        exit_code = 0
+        original = {k: self[f'pore.bc.{k}'].copy() for k in bcs.keys()}
+        try:
+            for group in np.unique(groups):
+                members = np.where(groups == group)[0]
+                B = np.zeros((self.Np, members.size), dtype=float)
+                for j, i in enumerate(members):
+                    if j == 0:
+                        for bctype, vals in bcs.items():
+                            self[f'pore.bc.{bctype}'] = vals[i]
+                        self._validate_topology_health()
+                    else:
+                        # Writing in place keeps the BC locations found for
+                        # the first member, which are the same for the group
+                        for bctype, vals in bcs.items():
+                            self[f'pore.bc.{bctype}'][:] = vals[i]
+                    self._update_A_and_b()
+                    self._validate_linear_system()
+                    B[:, j] = self.b
+                X[:, members], code = self._solve_batch(solver, B)
+                exit_code = exit_code or code
+        finally:
+            for bctype, vals in original.items():
+                self[f'pore.bc.{bctype}'] = vals
+        return X, exit_code
+
+    def _solve_batch(self, solver, B):
+        """Solves A X = B, passing B as a block to direct solvers."""
+        if isinstance(solver, solvers.DirectSolver):
+            X, exit_code = solver.solve(A=self.A, b=B)
+            return np.reshape(X, B.shape), exit_code
+        X = np.zeros_like(B, dtype=float)
+        exit_code = 0
+        for j in range(B.shape[1]):
+            X[:, j], code = solver.solve(A=self.A, b=B[:, j])
+            exit_code = exit_code or code
+        return X, exit_code
+
     def _update_A_and_b(self):
         """Builds A and b, and applies specified boundary conditions."""
         self._build_A()
@@ -293,6 +463,10 @@ class Transport(Algorithm):
         'group' then the individual rates are summed and returned as a
         scalar.
 
+        If the solution is a batch (see ``run_batch``), the above applies
+        to each member of the batch, so an extra dimension of size n is
+        added to the returned array.
+
         """
         pores = self._parse_indices(pores)
         throats = self._parse_indices(throats)
@@ -307,27 +481,37 @@ class Transport(Algorithm):
         g = phase[self.settings['conductance']]
 
         P12 = network['throat.conns']
-        X12 = self.x[P12]
+        X1, X2 = self.x[P12[:, 0]], self.x[P12[:, 1]]
         if g.size == self.Nt:
             g = np.tile(g, (2, 1)).T    # Make conductance an Nt by 2 matrix
-        # The next line is critical for rates to be correct
-        g = np.flip(g, axis=1)
-        Qt = np.diff(g*X12, axis=1).squeeze()
+        # Broadcast conductance over the columns of batched solutions
+        g1, g2 = np.reshape(g.T, (2, self.Nt) + (1, )*(X1.ndim - 1))
+        # The order of conductances is critical for rates to be correct
+        Qt = g1*X2 - g2*X1
 
         if throats.size:
             R = np.absolute(Qt[throats])
             if mode == 'group':
-                R = np.sum(R)
+                R = np.sum(R, axis=0)
         elif pores.size:
-            Qp = np.zeros((self.Np, ))
-            np.add.at(Qp, P12[:, 0], -Qt)
-            np.add.at(Qp, P12[:, 1], Qt)
+            im = network.get_incidence_matrix(fmt='csr')
+            # Material leaves the first pore of each throat, enters the second
+            Ps = np.repeat(np.arange(self.Np), np.diff(im.indptr))
+            sign = np.where(P12[im.indices, 0] == Ps, -1.0, 1.0)
+            sign = np.reshape(sign, (-1, ) + (1, )*(Qt.ndim - 1))
+            Qp = segmented_reduce(Qt[im.indices]*sign, im.indptr, mode='sum')
             R = Qp[pores]
             if mode == 'group':
-                R = np.sum(R)
+                R = np.sum(R, axis=0)
 
         return np.array(R, ndmin=1)
 
+    def set_BC(self, pores=None, bctype=[], bcvalues=[], mode='add'):
+        # Changing the BCs invalidates the cached locations
+        self._BC_locs = None
+        super().set_BC(pores=pores, bctype=bctype, bcvalues=bcvalues,
+                       mode=mode)
+
     def clear_value_BCs(self):
         """Clears all value BCs."""
         self.set_BC(pores=None, bctype='value', mode='remove')
@@ -125,9 +125,10 @@ class TransientMultiPhysics(Algorithm):
                 x = self._get_x0(y, i)  # again use helper function
                 # Store x onto algorithm,
                 alg.x = x
-                # Build A and b
+                # Build A and b. These are not cached since they can depend
+                # on the quantities of the other algorithms too.
                 alg._update_A_and_b()
-                A = alg.A.tocsc()
+                A = alg.A
                 b = alg.b
                 # Retrieve volume
                 V = alg.network[alg.settings["pore_volume"]]
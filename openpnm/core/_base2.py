@@ -1,4 +1,5 @@
 import numpy as np
+import bisect
 import logging
 import uuid
 from copy import deepcopy
@@ -15,6 +16,7 @@ from openpnm.utils import (
     Docorator,
     get_printable_props,
     get_printable_labels,
+    LazyArray,
 )
 
 
@@ -78,6 +80,13 @@ class Base2(dict):
         project.append(self)
         self.name = name
 
+    def __getstate__(self):
+        # Cached indices are quick to rebuild so are not kept
+        state = self.__dict__.copy()
+        state.pop('_key_index', None)
+        state.pop('_domains', None)
+        return state
+
     def __eq__(self, other):
         return hex(id(self)) == hex(id(other))
 
@@ -101,7 +110,8 @@ class Base2(dict):
         if '@' in key:
             element, prop = key.split('@')[0].split('.', 1)
             domain = key.split('@')[1]
-            locs = super().__getitem__(f'{element}.{domain}')
+            _ = super().__getitem__(f'{element}.{domain}')
+            locs = self._get_domain_index(f'{element}.{domain}')
             try:
                 vals = self[f'{element}.{prop}']
                 vals[locs] = value
@@ -128,19 +138,27 @@ class Base2(dict):
             value = np.array(value, ndmin=1)
         # Skip checks for coords and conns
         if key in ['pore.coords', 'throat.conns']:
-            self.update({key: value})
+            self._write(key, value)
             return
         # Finally write data
         if self._count(element) is None:
-            self.update({key: value})  # If length not defined, do it
+            self._write(key, value)  # If length not defined, do it
         elif value.shape[0] == 1:  # If value is scalar
             value = np.ones((self._count(element), ), dtype=value.dtype)*value
-            self.update({key: value})
+            self._write(key, value)
         elif np.shape(value)[0] == self._count(element):
-            self.update({key: value})
+            self._write(key, value)
         else:
             raise Exception('Provided array is wrong length for ' + key)
 
+    def _write(self, key, value):
+        # Only a new key changes the sorted list of keys, and writing a
+        # label drops the cached indices of its domain
+        if not super().__contains__(key):
+            self._key_index = None
+        self.__dict__.get('_domains', {}).pop(key, None)
+        super().__setitem__(key, value)
+
     def __getitem__(self, key):
         # If key is a just a numerical value, then kick it directly back.
         # This allows one to do either value='pore.blah' or value=1.0 in
@@ -162,29 +180,38 @@ class Base2(dict):
             domain = key.split('@')[1]
             if f'{element}.{domain}' not in self.keys():
                 raise KeyError(key)
-            locs = self[f'{element}.{domain}']
+            locs = self._get_domain_index(f'{element}.{domain}')
             vals = self[f'{element}.{prop}']
+            if isinstance(locs, slice):  # Return a copy, as indexing would
+                return vals.copy()
             return vals[locs]
 
         try:
-            return super().__getitem__(key)
+            vals = super().__getitem__(key)
         except KeyError:
-            # If key is object's name or all, return ones
+            # If key is object's name or all, return ones. This is a
+            # read-only view of a single value so takes no memory.
             if key.split('.', 1)[-1] in [self.name, 'all']:
                 element, prop = key.split('.', 1)
-                vals = np.ones(self._count(element), dtype=bool)
+                vals = np.broadcast_to(True, (self._count(element), ))
                 return vals
             else:
                 vals = {}  # Gather any arrays into a dict
-                for k in self.keys():
-                    if k.startswith(f'{key}.'):
-                        vals.update({k.replace(f'{key}.', ''): self[k]})
+                for k in self._get_nested_keys(key):
+                    vals[k[len(key)+1:]] = self[k]
                 if len(vals) > 0:
                     return vals
                 else:
                     raise KeyError(key)
+        if isinstance(vals, LazyArray):
+            # Data from a file opened lazily is read on first access
+            vals = vals.load()
+            super().__setitem__(key, vals)
+        return vals
 
     def __delitem__(self, key):
+        self._key_index = None
+        self.__dict__.pop('_domains', None)
         try:
             super().__delitem__(key)
         except KeyError:
@@ -193,6 +220,8 @@ class Base2(dict):
                 super().__delitem__(f'{key}.{item}')
 
     def pop(self, *args):
+        self._key_index = None
+        self.__dict__.pop('_domains', None)
         v = super().pop(*args)
         if v is None:
             try:
@@ -205,7 +234,32 @@ class Base2(dict):
                 pass
         return v
 
+    def update(self, *args, **kwargs):
+        self._key_index = None
+        self.__dict__.pop('_domains', None)
+        super().update(*args, **kwargs)
+
+    def items(self):
+        self._load_lazy()
+        return super().items()
+
+    def values(self):
+        self._load_lazy()
+        return super().values()
+
+    def _load_lazy(self):
+        r"""
+        Replaces the placeholders of data from a file opened lazily with
+        the data, as ``__getitem__`` does, so that the arrays returned by
+        ``items`` and ``values`` are usable
+        """
+        for k, v in super().items():
+            if isinstance(v, LazyArray):
+                super().__setitem__(k, v.load())
+
     def clear(self, mode=None):
+        self._key_index = None
+        self.__dict__.pop('_domains', None)
         if mode is None:
             super().clear()
         else:
@@ -223,6 +277,74 @@ class Base2(dict):
                 for item in self.models.keys():
                     _ = self.pop(item.split('@')[0], None)
 
+    def _get_nested_keys(self, key):
+        r"""
+        Returns the keys nested under the given key, such as
+        'pore.bc.rate' and 'pore.bc.value' for 'pore.bc'
+
+        Notes
+        -----
+        The keys are found by bisecting a sorted list of all keys, which is
+        kept until keys are added or removed.
+        """
+        index = self.__dict__.get('_key_index', None)
+        if (index is None) or (len(index) != len(self)):
+            index = sorted(super().keys())
+            self._key_index = index
+        # All keys starting with 'key.' sort between 'key.' and 'key/'
+        start = bisect.bisect_left(index, key + '.')
+        stop = bisect.bisect_left(index, key + '/')
+        return index[start:stop]
+
+    def _get_domain_index(self, domain, mask=None):
+        r"""
+        Returns an index to the locations in the given domain
+
+        Parameters
+        ----------
+        domain : str
+            The label defining the domain, such as 'pore.left'
+        mask : ndarray, optional
+            The boolean mask of the domain. If not given it is fetched with
+            ``self[domain]``.
+
+        Returns
+        -------
+        locs : slice or ndarray
+            ``slice(None)`` if the domain covers all locations, otherwise
+            the indices of the locations in the domain
+
+        Notes
+        -----
+        Indexing with the returned value avoids a fancy-index copy of the
+        whole array when the domain covers every location, and finding
+        the indices with ``flatnonzero`` each time otherwise. The indices
+        are cached, and dropped when the label is written with
+        ``__setitem__`` or any key is removed. Since labels are often
+        edited in place (e.g. ``net['pore.left'][Ps] = True``), which
+        cannot be intercepted, the cached indices are also checked
+        against the mask on each call by counting its ``True`` values and
+        reading it at the cached indices. This check costs an O(N)
+        ``count_nonzero``, which reads the mask without allocating and is
+        much cheaper than ``flatnonzero``, plus an O(n) read for a domain
+        of n locations.
+        """
+        if mask is None:
+            mask = self[domain]
+        if mask.dtype != bool:
+            return mask
+        n = np.count_nonzero(mask)
+        if n == mask.shape[0]:
+            return slice(None)
+        cache = self.__dict__.setdefault('_domains', {})
+        locs = cache.get(domain, None)
+        if (locs is None) or (locs.size != n) or \
+                ((n > 0) and ((locs[-1] >= mask.shape[0]) or
+                              not np.all(mask[locs]))):
+            locs = np.flatnonzero(mask)
+            cache[domain] = locs
+        return locs
+
     def keys(self, mode=None):
         r"""
         An overloaded version of ``keys`` that optionally accepts a ``mode``
@@ -320,14 +442,14 @@ class Base2(dict):
             try:
                 return self['pore.coords'].shape[0]
             except KeyError:
-                for k, v in self.items():
+                for k, v in super().items():
                     if k.startswith('pore.'):
                         return v.shape[0]
         elif element == 'throat':
             try:
                 return self['throat.conns'].shape[0]
             except KeyError:
-                for k, v in self.items():
+                for k, v in super().items():
                     if k.startswith('throat.'):
                         return v.shape[0]
 
@@ -429,7 +551,8 @@ class Base2(dict):
         if isinstance(element, str):
             element = [element]
         props = []
-        for k, v in self.items():
+        # Only the dtype is needed so data from lazily opened files is not read
+        for k, v in super().items():
             el, prop = k.split('.', 1)
             if (el in element) and (v.dtype != bool) and not prop.startswith('_'):
                 props.append(k)
@@ -182,6 +182,19 @@ class ParserMixin:
         return element + '.' + propname
 
 
+def _count_labels(arrays, n):
+    r"""
+    Counts how many of the given boolean arrays are ``True`` at each location
+
+    The counts are accumulated in place in the smallest unsigned integer
+    type that can hold them, so no temporary arrays are created.
+    """
+    count = np.zeros(n, dtype=np.min_scalar_type(len(arrays)))
+    for arr in arrays:
+        np.add(count, arr, out=count, casting='unsafe')
+    return count
+
+
 class LabelMixin:
     """r
     This mixin adds functionality to the Base2 class so that boolean arrays
@@ -200,9 +213,9 @@ class LabelMixin:
         labels = [i for i in self.keys(mode='labels') if i.split('.', 1)[0] in element]
         labels.sort()
         labels = np.array(labels)  # Convert to ndarray for following checks
-        # Make an 2D array with locations in rows and labels in cols
-        arr = np.vstack([self[item][locations] for item in labels]).T
-        num_hits = np.sum(arr, axis=0)  # Number of locations with each label
+        # Number of locations with each label
+        num_hits = np.array([np.count_nonzero(self[item][locations])
+                             for item in labels], dtype=int)
         if mode in ['or', 'union', 'any']:
             temp = labels[num_hits > 0]
         elif mode in ['and', 'intersection']:
@@ -280,7 +293,9 @@ class LabelMixin:
             if isinstance(element, str):
                 element = [element]
             labels = PrintableList()
-            for k, v in self.items():
+            # Only the dtype is needed so data from lazily opened files is
+            # not read
+            for k, v in dict.items(self):
                 el, prop = k.split('.', 1)
                 if (el in element) and (v.dtype == bool) and not prop.startswith('_'):
                     labels.append(k)
@@ -375,46 +390,33 @@ class LabelMixin:
         element = self._parse_element(element, single=True)
         labels = self._parse_labels(labels=labels, element=element)
 
-        # Begin computing label array
+        # Fetch each label array once, these are the stored arrays, not copies
+        arrs = [self[element+'.'+item.split('.', 1)[-1]] for item in labels]
+        n = self._count(element)
         if mode in ['or', 'any', 'union']:
-            union = np.zeros([self._count(element), ], dtype=bool)
-            for item in labels:  # Iterate over labels and collect all indices
-                union = union + self[element+'.'+item.split('.', 1)[-1]]
-            ind = union
+            if len(arrs) == 1:
+                ind = arrs[0]
+            else:
+                ind = np.zeros(n, dtype=bool)
+                for arr in arrs:
+                    np.logical_or(ind, arr, out=ind)
         elif mode in ['and', 'all', 'intersection']:
-            intersect = np.ones([self._count(element), ], dtype=bool)
-            for item in labels:  # Iterate over labels and collect all indices
-                intersect = intersect*self[element+'.'+item.split('.', 1)[-1]]
-            ind = intersect
+            ind = np.ones(n, dtype=bool)
+            for arr in arrs:
+                np.logical_and(ind, arr, out=ind)
         elif mode in ['xor', 'exclusive_or']:
-            xor = np.zeros([self._count(element), ], dtype=int)
-            for item in labels:  # Iterate over labels and collect all indices
-                info = self[element+'.'+item.split('.', 1)[-1]]
-                xor = xor + np.int8(info)
-            ind = (xor == 1)
+            ind = _count_labels(arrs, n) == 1
         elif mode in ['nor', 'not', 'none']:
-            nor = np.zeros([self._count(element), ], dtype=int)
-            for item in labels:  # Iterate over labels and collect all indices
-                info = self[element+'.'+item.split('.', 1)[-1]]
-                nor = nor + np.int8(info)
-            ind = (nor == 0)
+            ind = _count_labels(arrs, n) == 0
         elif mode in ['nand']:
-            nand = np.zeros([self._count(element), ], dtype=int)
-            for item in labels:  # Iterate over labels and collect all indices
-                info = self[element+'.'+item.split('.', 1)[-1]]
-                nand = nand + np.int8(info)
-            ind = (nand < len(labels)) * (nand > 0)
+            count = _count_labels(arrs, n)
+            ind = (count < len(labels)) * (count > 0)
         elif mode in ['xnor', 'nxor']:
-            xnor = np.zeros([self._count(element), ], dtype=int)
-            for item in labels:  # Iterate over labels and collect all indices
-                info = self[element+'.'+item.split('.', 1)[-1]]
-                xnor = xnor + np.int8(info)
-            ind = (xnor > 1)
+            ind = _count_labels(arrs, n) > 1
         else:
             raise Exception('Unsupported mode: '+mode)
         # Extract indices from boolean mask
-        ind = np.where(ind)[0]
-        ind = ind.astype(dtype=int)
+        ind = np.flatnonzero(ind)
         return ind
 
     def pores(self, labels=None, mode='or', asmask=False):
@@ -1,5 +1,6 @@
 import logging
 import inspect
+import weakref
 import openpnm as op
 import numpy as np
 from copy import deepcopy
@@ -35,15 +36,35 @@ class ModelsDict(PrintableDict):
 
     """
 
+    # Incremented whenever a model is added, deleted or has its arguments
+    # changed, so that objects depending on the models (e.g.
+    # ``Algorithm.iterative_props``) can tell when to refresh
+    _version = 0
+    # Weak reference to the object to which this dict is attached
+    _owner = None
+    # The result of dependency_list along with the version it applies to
+    _dependency_list = (None, None)
+
+    def __getstate__(self):
+        # Weak references can be neither pickled nor meaningfully copied
+        state = self.__dict__.copy()
+        state.pop('_owner', None)
+        return state
+
     def _find_target(self):
         """
         Finds and returns the target object to which this ModelsDict is
         associated.
         """
+        owner = self._owner() if self._owner is not None else None
+        if (owner is not None) and (getattr(owner, 'models', None) is self):
+            return owner
+        # Fall back to searching the workspace, e.g. after unpickling
         for proj in ws.values():
             for obj in proj:
                 if hasattr(obj, "models"):
                     if obj.models is self:
+                        self._owner = weakref.ref(obj)
                         return obj
         raise Exception("No target object found!")
 
@@ -68,12 +89,15 @@ class ModelsDict(PrintableDict):
         """
         import networkx as nx
 
+        if self._dependency_list[0] == self._version:
+            return list(self._dependency_list[1])
         dtree = self.dependency_graph()
         cycles = list(nx.simple_cycles(dtree))
         if cycles:
             msg = 'Cyclic dependency: ' + ' -> '.join(cycles[0] + [cycles[0][0]])
             raise Exception(msg)
-        d = nx.algorithms.dag.lexicographical_topological_sort(dtree, sorted)
+        d = list(nx.algorithms.dag.lexicographical_topological_sort(dtree, sorted))
+        self._dependency_list = (self._version, d)
         return list(d)
 
     def dependency_graph(self, deep=False):
@@ -210,6 +234,13 @@ class ModelsDict(PrintableDict):
             lines.append(horizontal_rule)
         return '\n'.join(lines)
 
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if isinstance(value, ModelWrapper):
+            value._models = weakref.ref(self)
+            value._name = key
+        self._version += 1
+
     def __delitem__(self, key):
         if '@' in key:
             super().__delitem__(key)
@@ -217,6 +248,7 @@ class ModelsDict(PrintableDict):
             for item in list(self.keys()):
                 if item.startswith(key):
                     super().__delitem__(item)
+        self._version += 1
 
     def __getitem__(self, key):
         try:
@@ -244,7 +276,68 @@ class ModelWrapper(dict):
     """
     This class is used to hold individual models and provide some extra
     functionality, such as pretty-printing and the ability to run itself.
+
+    Notes
+    -----
+    The ``ModelsDict`` holding the wrapper sets a weak reference to itself
+    and the key under which the wrapper is stored, so ``name`` and
+    ``target`` can be found without searching the workspace.
     """
+    # Weak reference to the ModelsDict holding this wrapper, and its key
+    _models = None
+    _name = None
+    _plan = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_models', None)
+        state.pop('_name', None)
+        state.pop('_plan', None)
+        return state
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._plan = None
+        models = self._models() if self._models is not None else None
+        if models is not None:
+            models._version += 1
+
+    def _get_plan(self):
+        r"""
+        Returns the information needed by ``run_model`` which only depends
+        on the model function and the names of its arguments, namely
+        whether the model accepts a ``domain`` argument and which items
+        should be passed to it.
+        """
+        plan = self._plan
+        if (plan is None) or (plan['model'] is not self['model']) \
+                or (plan['size'] != len(self)):
+            model = self['model']
+            self._plan = {
+                'model': model,
+                'size': len(self),
+                'domain': 'domain' in inspect.getfullargspec(model).args,
+                'args': tuple(k for k in self.keys()
+                              if k not in ['model', 'regen_mode']),
+            }
+        return self._plan
+
+    def _get_models_dict(self):
+        r"""
+        Returns the ``ModelsDict`` holding this wrapper, or ``None`` if the
+        back-reference is missing or no longer valid.
+        """
+        models = self._models() if self._models is not None else None
+        if (models is not None) and (dict.get(models, self._name) is self):
+            return models
+        for proj in ws.values():
+            for obj in proj:
+                if hasattr(obj, 'models'):
+                    for key, mod in obj.models.items():
+                        if mod is self:
+                            self._models = weakref.ref(obj.models)
+                            self._name = key
+                            return obj.models
 
     def __call__(self):
         model = self['model']
@@ -256,12 +349,8 @@ class ModelWrapper(dict):
 
     @property
     def name(self):
-        for proj in ws.values():
-            for obj in proj:
-                if hasattr(obj, 'models'):
-                    for key, mod in obj.models.items():
-                        if mod is self:
-                            return key
+        if self._get_models_dict() is not None:
+            return self._name
 
     @property
     def propname(self):
@@ -294,13 +383,10 @@ class ModelWrapper(dict):
         """
         Finds and returns the object to which this model is assigned
         """
-        for proj in ws.values():
-            for obj in proj:
-                if hasattr(obj, "models"):
-                    for mod in obj.models.values():
-                        if mod is self:
-                            return obj
-        raise Exception("No target object found!")
+        models = self._get_models_dict()
+        if models is None:
+            raise Exception("No target object found!")
+        return models._find_target()
 
 
 class ModelsMixin2:
@@ -313,6 +399,7 @@ class ModelsMixin2:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.models = ModelsDict()
+        self.models._owner = weakref.ref(self)
 
     def add_model(self, propname, model, domain='all', regen_mode='normal',
                   **kwargs):
@@ -399,7 +486,8 @@ class ModelsMixin2:
         kwargs.update({'model': model, 'regen_mode': regen_mode})
         # Insepct model to extract arguments and default values
         kwargs.update(self._inspect_model(model, kwargs))
-        self.models[propname+'@'+domain] = ModelWrapper(**kwargs)
+        self.models[propname+'@'+domain] = mod = ModelWrapper(**kwargs)
+        mod._get_plan()
         if regen_mode != 'deferred':
             self.run_model(propname+'@'+domain)
 
@@ -510,36 +598,37 @@ class ModelsMixin2:
             element, prop = propname.split('@')[0].split('.', 1)
             propname = f'{element}.{prop}'
             mod_dict = self.models[propname+'@'+domain]
+            plan = mod_dict._get_plan()
+            locs = self._get_domain_index(f'{element}.{domain}')
             # Collect kwargs
             kwargs = {'domain': f'{element}.{domain}'}
-            for item in mod_dict.keys():
-                if item not in ['model', 'regen_mode']:
-                    kwargs[item] = mod_dict[item]
+            for item in plan['args']:
+                kwargs[item] = mod_dict[item]
             # Deal with models that don't have domain argument yet
-            if 'domain' not in inspect.getfullargspec(mod_dict['model']).args:
+            if not plan['domain']:
                 _ = kwargs.pop('domain', None)
-                vals = mod_dict['model'](self, **kwargs)
+                vals = plan['model'](self, **kwargs)
                 if isinstance(vals, dict):  # Handle models that return a dict
                     for k, v in vals.items():
                         v = np.atleast_1d(v)
                         if v.shape[0] == 1:  # Returned item was a scalar
                             v = np.tile(v, self._count(element))
-                        vals[k] = v[self[f'{element}.{domain}']]
+                        vals[k] = v[locs]
                 elif isinstance(vals, (int, float)):  # Handle models that return a float
                     vals = np.atleast_1d(vals)
                 else:  # Index into full domain result for use below
-                    vals = vals[self[f'{element}.{domain}']]
+                    vals = vals[locs]
             else:  # Model that accepts domain arg
-                vals = mod_dict['model'](self, **kwargs)
+                vals = plan['model'](self, **kwargs)
             # Finally add model results to self
             if isinstance(vals, np.ndarray):  # If model returns single array
                 if propname not in self.keys():
                     temp = self._initialize_empty_array_like(vals, element)
                     self[f'{element}.{prop}'] = temp
-                self[propname][self[f'{element}.{domain}']] = vals
+                self[propname][locs] = vals
             elif isinstance(vals, dict):  # If model returns a dict of arrays
                 for k, v in vals.items():
                     if f'{propname}.{k}' not in self.keys():
                         temp = self._initialize_empty_array_like(v, element)
                         self[f'{propname}.{k}'] = temp
-                    self[f'{propname}.{k}'][self[f'{element}.{domain}']] = v
+                    self[f'{propname}.{k}'][locs] = v
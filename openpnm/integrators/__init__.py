@@ -8,3 +8,4 @@ The ``integrators`` module contains wrapper classes for ode solvers.
 
 from ._base import *
 from ._scipy import *
+from ._theta import *
@@ -2,11 +2,12 @@ from scipy.integrate import solve_ivp
 from openpnm.integrators import Integrator
 from openpnm.algorithms._solution import TransientSolution
 
-__all__ = ['ScipyRK45']
+__all__ = ['ScipyRK45', 'ScipyBDF', 'ScipyRadau']
 
 
 class ScipyRK45(Integrator):
     """Brief description of 'ScipyRK45'"""
+    method = "RK45"
 
     def __init__(self, atol=1e-6, rtol=1e-6, verbose=False, linsolver=None):
         self.atol = atol
@@ -49,7 +50,51 @@ class ScipyRK45(Integrator):
             # FIXME: uncomment next line when/if scipy#11815 is merged
             # "verbose": self.verbose,
         }
-        sol = solve_ivp(rhs, tspan, x0, method="RK45", **options)
+        options.update(self._get_jac_options(**kwargs))
+        sol = solve_ivp(rhs, tspan, x0, method=self.method, **options)
         if sol.success:
             return TransientSolution(sol.t, sol.y)
         raise Exception(sol.message)
+
+    def _get_jac_options(self, **kwargs):
+        # Explicit methods don't make use of the Jacobian
+        return {}
+
+
+class ScipyBDF(ScipyRK45):
+    """
+    Integrates using the implicit, variable order backward differentiation
+    formula of ``scipy.integrate.solve_ivp``, which is suited for stiff
+    problems.
+
+    Notes
+    -----
+    If the transient algorithm supplies the Jacobian of the RHS (as a
+    sparse matrix), it is passed on to ``solve_ivp`` so that the linear
+    systems are solved with a sparse LU factorization. Otherwise the
+    Jacobian is estimated by finite differences, using its sparsity
+    pattern if given.
+
+    """
+    method = "BDF"
+
+    def _get_jac_options(self, jac=None, jac_sparsity=None, **kwargs):
+        if jac is not None:
+            return {"jac": jac}
+        if jac_sparsity is not None:
+            return {"jac_sparsity": jac_sparsity}
+        return {}
+
+
+class ScipyRadau(ScipyBDF):
+    """
+    Integrates using the implicit Runge-Kutta method of the Radau IIA
+    family of ``scipy.integrate.solve_ivp``, which is suited for stiff
+    problems.
+
+    Notes
+    -----
+    The Jacobian is handled as described in ``ScipyBDF``.
+
+    """
+    method = "Radau"
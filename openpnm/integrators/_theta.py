@@ -0,0 +1,225 @@
+import logging
+import numpy as np
+from numpy.linalg import norm
+from scipy.sparse import identity
+from openpnm.integrators import Integrator
+from openpnm.algorithms._solution import TransientSolution
+
+__all__ = ['BackwardEuler', 'CrankNicolson']
+logger = logging.getLogger(__name__)
+
+
+class BackwardEuler(Integrator):
+    r"""
+    Integrates using the implicit (backward) Euler method.
+
+    Parameters
+    ----------
+    dt : float
+        The time step. If ``adaptive`` is ``True`` this is the initial
+        time step.
+    adaptive : bool
+        If ``True`` the time step is halved or doubled based on an
+        estimate of the local truncation error, using ``atol`` and
+        ``rtol``. Default is ``False``.
+    atol, rtol : float
+        Absolute and relative tolerances for the error estimate when
+        ``adaptive`` is ``True``, and for the Newton iterations in each
+        time step.
+    solver : BaseSolver, optional
+        The solver used for the linear systems in each time step. The
+        default is ``ScipySpsolve``.
+    maxiter : int
+        Maximum number of Newton iterations per time step.
+
+    Notes
+    -----
+    Each time step solves ``y1 - y0 = dt*f(y1)`` using Newton's method,
+    with the Jacobian of ``f`` evaluated once at the beginning of the step.
+    The Jacobian must be supplied by the transient algorithm. The matrix
+    ``I - dt*J`` only changes when the step size or the Jacobian change,
+    so for linear problems a single factorization is used for as long as
+    the step size remains the same. The adaptive mode only ever halves or
+    doubles the step size for this reason. If the Newton iterations of a
+    step don't converge within ``maxiter`` iterations, the step is halved
+    in the adaptive mode, otherwise a warning is logged.
+
+    Both the Newton updates and the error estimate are measured with the
+    root mean square of their entries divided by ``atol + rtol*|y|``, and
+    are accepted when this is at most 1.
+
+    The solution at the requested ``saveat`` times is found by linear
+    interpolation between time steps.
+
+    """
+    theta = 1.0
+    order = 1
+
+    def __init__(self, dt, adaptive=False, atol=1e-6, rtol=1e-6, solver=None,
+                 maxiter=10):
+        self.dt = dt
+        self.adaptive = adaptive
+        self.atol = atol
+        self.rtol = rtol
+        self.solver = solver
+        self.maxiter = maxiter
+
+    def solve(self, rhs, x0, tspan, saveat, jac=None, **kwargs):
+        """
+        Solves the system of ODEs defined by dy/dt = rhs(t, y).
+
+        Parameters
+        ----------
+        rhs : function handle
+            RHS vector in the system of ODEs defined by dy/dt = rhs(t, y)
+        x0 : array_like
+            Initial value for the system of ODEs
+        tspan : array_like
+            2-element tuple (or array) representing the timespan for the
+            system of ODEs
+        saveat : float or array_like
+            If float, defines the time interval at which the solution is
+            to be stored. If array_like, defines the time points at which
+            the solution is to be stored. If ``None``, the solution is
+            stored at every time step.
+        jac : function handle
+            Returns the Jacobian of ``rhs`` as a sparse matrix, called as
+            ``jac(t, y)``.
+        **kwargs : keyword arguments
+            Other keyword arguments that might get used by the integrator
+
+        Returns
+        -------
+        TransientSolution
+            Solution of the system of ODEs stored in a subclass of numpy's
+            ndarray with some added functionalities (ex. you can get the
+            solution at intermediate time points via: y = soln(t_i)).
+
+        """
+        from openpnm.solvers import ScipySpsolve
+        if jac is None:
+            raise Exception(f'{self.__class__.__name__} requires the Jacobian')
+        solver = ScipySpsolve() if self.solver is None else self.solver
+        t, tend = tspan
+        y = np.array(x0, dtype=float)
+        dt = self.dt
+        ts, ys = [t], [y]
+        f = rhs(t, y)
+        prev = None  # The size of the previous step and the RHS before it
+        while t < tend:
+            h = min(dt, tend - t)
+            y1, f1, converged = self._step(rhs, jac, solver, t, y, f, h)
+            if not converged:
+                if self.adaptive and (h > np.spacing(t)*1e3):
+                    dt = h / 2
+                    continue
+                logger.warning(f'Newton iterations did not converge within'
+                               f' {self.maxiter} iterations in the step to'
+                               f' t={t + h:.4g}')
+            if self.adaptive:
+                err = self._norm(self._error(h, f, f1, prev), y, y1)
+                if (err > 1) and (h > np.spacing(t)*1e3):
+                    dt = h / 2
+                    continue
+                # Doubling the step multiplies the error by 2**(order+1)
+                if err < 0.5**(self.order + 1):
+                    dt = 2 * h
+            prev = (h, f)
+            t, y, f = t + h, y1, f1
+            ts.append(t)
+            ys.append(y)
+        ts, ys = np.array(ts), np.vstack(ys).T
+        if saveat is None:
+            return TransientSolution(ts, ys)
+        saveat = np.array(saveat, ndmin=1)
+        idx = np.clip(np.searchsorted(ts, saveat), 1, ts.size - 1)
+        w = ((saveat - ts[idx-1]) / (ts[idx] - ts[idx-1]))
+        y = ys[:, idx-1] * (1 - w) + ys[:, idx] * w
+        return TransientSolution(saveat, y)
+
+    def _step(self, rhs, jac, solver, t, y0, f0, h):
+        r"""
+        Advances the solution by one step of size h, returning the new
+        solution, the RHS evaluated there and whether the Newton iterations
+        converged.
+        """
+        theta = self.theta
+        J = jac(t, y0).tocsr()
+        M = (identity(y0.size, format='csr') - (h * theta) * J).tocsr()
+        M.sort_indices()
+        y1, f1 = y0.copy(), f0
+        for _ in range(self.maxiter):
+            G = y1 - y0 - h * (theta * f1 + (1 - theta) * f0)
+            dy, _ = solver.solve(A=M, b=-G)
+            y1 = y1 + dy
+            f1 = rhs(t + h, y1)
+            if self._norm(dy, y0, y1) <= 1:
+                return y1, f1, True
+        return y1, f1, False
+
+    def _norm(self, v, y0, y1):
+        r"""
+        Returns the root mean square of v scaled by the tolerances, using
+        the larger of the solutions at the start and end of the step
+        """
+        scale = self.atol + self.rtol * np.maximum(np.abs(y0), np.abs(y1))
+        return norm(v / scale) / np.sqrt(v.size)
+
+    def _error(self, h, f0, f1, prev):
+        r"""
+        Returns an estimate of the local truncation error of a step of size
+        h, given the RHS at the start and end of the step, and the size of
+        the previous step and the RHS at its start (``None`` for the first
+        step).
+        """
+        # The error of backward Euler is h**2/2 times the second derivative
+        return 0.5 * h * (f1 - f0)
+
+
+class CrankNicolson(BackwardEuler):
+    r"""
+    Integrates using the Crank-Nicolson (trapezoidal) method.
+
+    Parameters
+    ----------
+    dt : float
+        The time step. If ``adaptive`` is ``True`` this is the initial
+        time step.
+    adaptive : bool
+        If ``True`` the time step is halved or doubled based on an
+        estimate of the local truncation error, using ``atol`` and
+        ``rtol``. Default is ``False``.
+    atol, rtol : float
+        Absolute and relative tolerances for the error estimate when
+        ``adaptive`` is ``True``, and for the Newton iterations in each
+        time step.
+    solver : BaseSolver, optional
+        The solver used for the linear systems in each time step. The
+        default is ``ScipySpsolve``.
+    maxiter : int
+        Maximum number of Newton iterations per time step.
+
+    Notes
+    -----
+    This is second order accurate but, unlike ``BackwardEuler``, does not
+    damp the fast modes of very stiff problems, which may appear as
+    oscillations when the time step is large. Otherwise it works the same
+    way as ``BackwardEuler``.
+
+    In the adaptive mode the local truncation error, ``h**3/12`` times the
+    third derivative of the solution, is estimated by differencing the RHS
+    over the current and previous steps. The first step has no previous
+    step, so it uses the larger first order estimate of ``BackwardEuler``
+    instead.
+
+    """
+    theta = 0.5
+    order = 2
+
+    def _error(self, h, f0, f1, prev):
+        if prev is None:
+            return super()._error(h, f0, f1, prev)
+        hp, fp = prev
+        # Second derivative of the RHS from its values at three times
+        d2f = 2 * ((f1 - f0) / h - (f0 - fp) / hp) / (h + hp)
+        return h**3 / 12 * d2f
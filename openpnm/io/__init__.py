@@ -9,11 +9,12 @@ between OpenPNM and other formats.
 
 from ._utils import *
 from ._dict import project_to_dict
-from ._vtk import project_to_vtk
+from ._vtk import project_to_vtk, network_from_vtk
 from ._pandas import project_to_pandas, network_to_pandas
 from ._csv import project_to_csv, network_to_csv, network_from_csv
-from ._hdf5 import project_to_hdf5, print_hdf5
-from ._xdmf import project_to_xdmf
+from ._hdf5 import project_to_hdf5, project_from_hdf5, print_hdf5
+from ._pnm import project_to_pnm, project_from_pnm
+from ._xdmf import project_to_xdmf, XdmfWriter
 from ._marock import network_from_marock
 from ._porespy import network_from_porespy
 from ._paraview import project_to_paraview
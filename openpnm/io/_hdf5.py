@@ -1,53 +1,211 @@
+import json
 import logging
-from openpnm.io import project_to_dict, _parse_filename
+import functools
+import numpy as np
+from openpnm.io import _parse_filename
+from openpnm.io._state import (
+    _StateEncoder,
+    _StateDecoder,
+    _get_state,
+    _path,
+    _import,
+)
+from openpnm.utils import Workspace, LazyArray
 from h5py import File as hdfFile
-import pandas as pd
 
 
 logger = logging.getLogger(__name__)
+ws = Workspace()
 
 
-def project_to_hdf5(project, filename=''):
+def project_to_hdf5(project, filename='', compression='gzip',
+                    compression_opts=4):
     r"""
     Creates an HDF5 file containing data from the specified objects
 
     Parameters
     ----------
-    network : Network
-        The network containing the desired data
-
-    phases : list[Phase]s (optional, default is none)
-        A list of phase objects whose data are to be included
+    project : Project
+        The project containing the desired data
+    filename : str or path object, optional
+        The name of the file to create. If not given the project name is
+        used.
+    compression : str, optional
+        The compression filter to apply to the arrays, which are stored in
+        chunks so they can be read back piecewise. The default is 'gzip'.
+        Use ``None`` to store the arrays uncompressed.
+    compression_opts : int, optional
+        The options passed to the compression filter, which for 'gzip' is
+        the compression level between 0 and 9. The default is 4.
 
     Returns
     -------
     f : hdf5 file handle
         A handle to an hdf5 file.  This must be closed when done (i.e.
         ``f.close()``.
+
+    Notes
+    -----
+    Each object in the project is stored as a group named after it,
+    containing one dataset per array (e.g. 'net_01/pore/coords'). The
+    class, settings, parameters and pore-scale models of each object are
+    described in json in its '_state/spec' dataset, in the same way as in
+    a ``pnm`` file (see ``project_to_pnm``), so that ``project_from_hdf5``
+    can recreate it exactly. Any arrays this refers to are stored in the
+    same '_state' group. No part of the file is pickled. Arrays of dtype
+    object cannot be stored and are skipped with a warning.
+
     """
     if filename == '':
         filename = project.name
     filename = _parse_filename(filename, ext='hdf')
 
-    dct = project_to_dict(project=project)
-    d = pd.json_normalize(dct, sep='.').to_dict(orient='records')[0]
-    for k in list(d.keys()):
-        d[k.replace('.', '/')] = d.pop(k)
     f = hdfFile(filename, "w")
-    for item in list(d.keys()):
-        tempname = '_'.join(item.split('.'))
-        arr = d[item]
-        if d[item].dtype == 'O':
-            logger.warning(item + ' has dtype object, will not write to file')
-            del d[item]
-        elif 'U' in str(arr[0].dtype):
-            pass
-        else:
-            f.create_dataset(name='/'+tempname, shape=arr.shape,
-                             dtype=arr.dtype, data=arr)
+    f.attrs['project'] = project.name
+    f.attrs['objects'] = [obj.name for obj in project]
+    encoder = _HDF5Encoder(f, project)
+    for obj in project:
+        group = f.create_group(obj.name)
+        group.attrs['class'] = _path(obj.__class__)
+        state = encoder.encode(_get_state(obj), f'{obj.name}/_state')
+        # The description may exceed the size limit of attributes
+        group.create_dataset('_state/spec', data=json.dumps(state, indent=1))
+        for key in obj.keys():
+            arr = obj[key]
+            if arr.dtype == 'O':
+                logger.warning(key + ' has dtype object, will not write to file')
+                continue
+            kwargs = {}
+            if (np.ndim(arr) > 0) and (np.size(arr) > 0):
+                kwargs.update({'chunks': True,
+                               'compression': compression,
+                               'compression_opts': compression_opts,
+                               'shuffle': compression is not None})
+                if compression is None:
+                    kwargs.pop('compression_opts')
+            _write_dataset(group, key.replace('.', '/'), arr, **kwargs)
     return f
 
 
+def project_from_hdf5(filename, lazy=True):
+    r"""
+    Loads a Project from an HDF5 file written by ``project_to_hdf5``
+
+    Parameters
+    ----------
+    filename : str or path object
+        The name of the file to open
+    lazy : bool, optional
+        If ``True`` (default) the arrays are not read until they are first
+        accessed, so opening a file takes the same time regardless of its
+        size. If ``False`` all the arrays are read immediately.
+
+    Returns
+    -------
+    project : Project
+        A new Project containing the objects stored in the file. It is
+        added to the Workspace, and renamed if necessary.
+
+    Notes
+    -----
+    When ``lazy`` is ``True`` each array is fetched from the file by its
+    object on the first call to ``__getitem__``, after which it is held in
+    memory like any other array. The file must therefore remain in place
+    until all the needed arrays have been accessed. The number of pores and
+    throats, and the list of labels, are known without reading any data.
+
+    """
+    filename = _parse_filename(filename, ext='hdf')
+    with hdfFile(filename, "r") as f:
+        names = list(f.attrs['objects'])
+        if any('_state/spec' not in f[name] for name in names):
+            raise Exception('The file does not contain the information needed'
+                            ' to recreate the project')
+        decoder = _HDF5Decoder(f)
+        proj = ws.new_project(name=ws._validate_name(f.attrs['project']))
+        # Create all the objects first so they can refer to each other
+        for name in names:
+            cls = _import(f[name].attrs['class'])
+            obj = cls.__new__(cls)
+            decoder.objects[name] = obj
+            proj.append(obj)
+        for name in names:
+            obj = decoder.objects[name]
+            group = f[name]
+            state = json.loads(group['_state/spec'][()])
+            obj.__dict__.update(decoder.decode(state))
+            data = {}
+
+            def visit(path, item):
+                if hasattr(item, 'shape') and path.split('/')[0] in ['pore', 'throat']:
+                    data[path.replace('/', '.')] = item
+            group.visititems(visit)
+            for key, dset in data.items():
+                dtype = np.dtype(dset.attrs['dtype'])
+                loader = functools.partial(
+                    _read_dataset, str(filename), dset.name, dtype)
+                if lazy:
+                    value = LazyArray(loader, shape=dset.shape, dtype=dtype)
+                else:
+                    value = loader()
+                dict.__setitem__(obj, key, value)
+    return proj
+
+
+class _HDF5Encoder(_StateEncoder):
+    r"""
+    Describes objects in json, writing the arrays they contain to the
+    given hdf5 file
+    """
+
+    def __init__(self, f, project):
+        super().__init__(project)
+        self.f = f
+
+    def write_array(self, arr, path):
+        self.count += 1
+        name = f'{path}/{self.count}'
+        _write_dataset(self.f, name, np.asanyarray(arr).view(np.ndarray))
+        return name
+
+
+class _HDF5Decoder(_StateDecoder):
+    r"""
+    Recreates objects from the descriptions written by ``_HDF5Encoder``,
+    reading the arrays from the given hdf5 file
+    """
+
+    def __init__(self, f):
+        super().__init__()
+        self.f = f
+
+    def read_array(self, name):
+        dset = self.f[name]
+        return _decode(dset[()], np.dtype(dset.attrs['dtype']))
+
+
+def _write_dataset(group, name, arr, **kwargs):
+    dtype = arr.dtype.str
+    if arr.dtype.kind == 'U':
+        # Store strings as bytes, the original dtype is recorded below
+        arr = np.char.encode(arr, 'utf-8')
+    dset = group.create_dataset(name=name, data=arr, **kwargs)
+    dset.attrs['dtype'] = dtype
+    return dset
+
+
+def _read_dataset(filename, path, dtype):
+    with hdfFile(filename, "r") as f:
+        arr = f[path][()]
+    return _decode(arr, dtype)
+
+
+def _decode(arr, dtype):
+    if dtype.kind == 'U':
+        arr = np.char.decode(arr, 'utf-8')
+    return np.asarray(arr, dtype=dtype)
+
+
 def print_hdf5(f, flat=False):
     r"""
     Given an hdf5 file handle, prints to console in a human readable manner
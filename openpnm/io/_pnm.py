@@ -0,0 +1,195 @@
+import json
+import struct
+import logging
+import zipfile
+import numpy as np
+from openpnm.io import _parse_filename
+from openpnm.io._state import (
+    _StateEncoder,
+    _StateDecoder,
+    _get_state,
+    _path,
+    _import,
+)
+from openpnm.utils import Workspace
+
+
+logger = logging.getLogger(__name__)
+ws = Workspace()
+_SPEC = 'project.json'
+_ALIGN = 64
+
+
+def project_to_pnm(project, filename=''):
+    r"""
+    Saves a Project to a ``pnm`` file
+
+    Parameters
+    ----------
+    project : Project
+        The project to save
+    filename : str or path object, optional
+        The name of the file to create. If not given the project name is
+        used.
+
+    Returns
+    -------
+    filename : path object
+        The full path of the file that was written
+
+    Notes
+    -----
+    The file is an uncompressed zip archive. Each array is stored as a
+    separate ``npy`` member, placed so that its data can be memory mapped
+    directly from the archive (see ``project_from_pnm``). Everything else,
+    including the class, settings, parameters and pore-scale models of
+    each object, is described in the ``project.json`` member, where
+    functions and classes are referred to by their import path. No part of
+    the file is pickled.
+
+    Arrays of dtype object, and attributes of a type that cannot be
+    described in this way, are skipped with a warning.
+
+    """
+    if filename == '':
+        filename = project.name
+    filename = _parse_filename(filename, ext='pnm')
+    with zipfile.ZipFile(filename, 'w', compression=zipfile.ZIP_STORED) as zf:
+        encoder = _Encoder(zf, project)
+        spec = {
+            'format': 'openpnm',
+            'version': 1,
+            'project': project.name,
+            'objects': [encoder.encode_object(obj) for obj in project],
+        }
+        zf.writestr(_SPEC, json.dumps(spec, indent=1))
+    return filename
+
+
+def project_from_pnm(filename, mmap_mode=None):
+    r"""
+    Loads a Project from a ``pnm`` file written by ``project_to_pnm``
+
+    Parameters
+    ----------
+    filename : str or path object
+        The name of the file to open
+    mmap_mode : str, optional
+        If given the arrays are memory mapped from the file rather than
+        read into memory, using the given mode. Options are 'r' for
+        read-only access and 'c' for copy-on-write, meaning changes are
+        kept in memory only. The default is ``None`` which reads all the
+        arrays into memory.
+
+    Returns
+    -------
+    project : Project
+        A new Project containing the objects stored in the file. It is
+        added to the Workspace, and renamed if necessary.
+
+    Notes
+    -----
+    Memory mapping makes opening a file nearly instant regardless of its
+    size, and several processes mapping the same file share its pages
+    through the operating system's cache instead of each holding a copy.
+    With ``mmap_mode='r'`` writing to any of the arrays raises an error,
+    which makes it suited to read-only post-processing.
+
+    """
+    if mmap_mode not in [None, 'r', 'c']:
+        raise Exception(f"Unsupported mmap_mode: {mmap_mode}")
+    filename = _parse_filename(filename, ext='pnm')
+    with zipfile.ZipFile(filename, 'r') as zf:
+        spec = json.loads(zf.read(_SPEC))
+        decoder = _Decoder(zf, filename, mmap_mode)
+        proj = ws.new_project(name=ws._validate_name(spec['project']))
+        # Create all the objects first so they can refer to each other
+        for item in spec['objects']:
+            obj = _import(item['class']).__new__(_import(item['class']))
+            decoder.objects[item['name']] = obj
+            proj.append(obj)
+        for item in spec['objects']:
+            obj = decoder.objects[item['name']]
+            obj.__dict__.update(decoder.decode(item['state']))
+            for key, value in item['data'].items():
+                dict.__setitem__(obj, key, decoder.decode(value))
+    return proj
+
+
+class _Encoder(_StateEncoder):
+    r"""
+    Converts objects into json-compatible descriptions, writing any arrays
+    they contain to the archive as they are found
+    """
+
+    def __init__(self, zf, project):
+        super().__init__(project)
+        self.zf = zf
+
+    def encode_object(self, obj):
+        data = {}
+        for key in obj.keys():
+            value = obj[key]
+            if isinstance(value, np.ndarray) and (value.dtype == 'O'):
+                logger.warning(f'{key} has dtype object, will not write to file')
+                continue
+            data[key] = self.encode(value, f'{obj.name}/{key}')
+        return {
+            'name': obj.name,
+            'class': _path(obj.__class__),
+            'state': self.encode(_get_state(obj), f'{obj.name}/_'),
+            'data': data,
+        }
+
+    def write_array(self, arr, path):
+        self.count += 1
+        name = f'{path}.{self.count}.npy'
+        zinfo = zipfile.ZipInfo(name)
+        zinfo.compress_type = zipfile.ZIP_STORED
+        zip64 = arr.nbytes > 2**31 - 2**16
+        # Pad the local header with an extra field so that the array data,
+        # which starts a multiple of 64 bytes after the npy header, is
+        # aligned in the file
+        start = self.zf.fp.tell() + 30 + len(name.encode()) + 4 + 20*zip64
+        pad = (-start) % _ALIGN
+        zinfo.extra = struct.pack('<HH', 0xD935, pad) + b'\x00'*pad
+        with self.zf.open(zinfo, 'w', force_zip64=zip64) as f:
+            np.lib.format.write_array(f, np.asanyarray(arr).view(np.ndarray),
+                                      allow_pickle=False)
+        return name
+
+
+class _Decoder(_StateDecoder):
+    r"""
+    Recreates objects from the json-compatible descriptions written by
+    ``_Encoder``, reading or memory mapping the arrays from the archive
+    """
+
+    def __init__(self, zf, filename, mmap_mode):
+        super().__init__()
+        self.zf = zf
+        self.filename = filename
+        self.mmap_mode = mmap_mode
+
+    def read_array(self, name):
+        if self.mmap_mode is None:
+            with self.zf.open(name) as f:
+                return np.lib.format.read_array(f, allow_pickle=False)
+        info = self.zf.getinfo(name)
+        with open(self.filename, 'rb') as f:
+            # Skip the zip member's local header, then read the npy header
+            f.seek(info.header_offset + 26)
+            n, m = struct.unpack('<HH', f.read(4))
+            f.seek(info.header_offset + 30 + n + m)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                header = np.lib.format.read_array_header_1_0(f)
+            else:
+                header = np.lib.format.read_array_header_2_0(f)
+            shape, fortran_order, dtype = header
+            offset = f.tell()
+        if int(np.prod(shape)) == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(self.filename, dtype=dtype, mode=self.mmap_mode,
+                         offset=offset, shape=shape,
+                         order='F' if fortran_order else 'C')
@@ -0,0 +1,177 @@
+import types
+import weakref
+import logging
+import importlib
+import numpy as np
+import scipy.sparse as sprs
+
+
+logger = logging.getLogger(__name__)
+
+
+class _StateEncoder:
+    r"""
+    Converts objects into json-compatible descriptions, passing any arrays
+    they contain to ``write_array``, which file formats must implement
+    """
+
+    def __init__(self, project):
+        self.objects = [obj for obj in project]
+        self.count = 0
+
+    def encode(self, value, path):
+        if (value is None) or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            if value.dtype == 'O':
+                raise _Unsupported(value)
+            d = {'__array__': self.write_array(value, path)}
+            if type(value) is not np.ndarray:
+                d['__class__'] = _path(type(value))
+                state = _get_state(value)
+                if len(state) > 0:
+                    d['__state__'] = self.encode(state, path)
+            return d
+        if sprs.issparse(value):
+            csr = value.tocsr()
+            return {'__sparse__': value.format,
+                    'shape': list(value.shape),
+                    'data': self.encode(csr.data, path),
+                    'indices': self.encode(csr.indices, path),
+                    'indptr': self.encode(csr.indptr, path)}
+        if isinstance(value, list):
+            return [self.encode(v, path) for v in value]
+        if isinstance(value, tuple):
+            return {'__tuple__': [self.encode(v, path) for v in value]}
+        if isinstance(value, (set, frozenset)):
+            return {'__set__': [self.encode(v, path) for v in value],
+                    '__class__': _path(type(value))}
+        if isinstance(value, (types.FunctionType, types.BuiltinFunctionType,
+                              type)):
+            return {'__callable__': _path(value)}
+        if any(value is obj for obj in self.objects):
+            return {'__object__': value.name}
+        if isinstance(value, weakref.ref) or not (
+                isinstance(value, dict) or hasattr(value, '__dict__')):
+            raise _Unsupported(value)
+        d = {'__class__': _path(type(value))}
+        if isinstance(value, dict):
+            items = []
+            for k, v in value.items():
+                try:
+                    items.append([self.encode(k, path), self.encode(v, path)])
+                except _Unsupported as e:
+                    logger.warning(f'{k} in {path} has type {e}, will not'
+                                   ' write to file')
+            d['__items__'] = items
+        state = _get_state(value)
+        if len(state) > 0:
+            d['__state__'] = self.encode(state, path)
+        return d
+
+    def write_array(self, arr, path):
+        r"""
+        Stores the given array and returns the name it can be read back by
+        """
+        raise NotImplementedError
+
+
+class _StateDecoder:
+    r"""
+    Recreates objects from the json-compatible descriptions written by
+    ``_StateEncoder``, reading arrays with ``read_array``, which file
+    formats must implement
+    """
+
+    def __init__(self):
+        self.objects = {}
+
+    def decode(self, value):
+        if isinstance(value, list):
+            return [self.decode(v) for v in value]
+        if not isinstance(value, dict):
+            return value
+        if '__array__' in value:
+            arr = self.read_array(value['__array__'])
+            if '__class__' in value:
+                arr = arr.view(_import(value['__class__']))
+                if '__state__' in value:
+                    arr.__dict__.update(self.decode(value['__state__']))
+            return arr
+        if '__sparse__' in value:
+            csr = sprs.csr_matrix((self.decode(value['data']),
+                                   self.decode(value['indices']),
+                                   self.decode(value['indptr'])),
+                                  shape=value['shape'])
+            return csr.asformat(value['__sparse__'])
+        if '__tuple__' in value:
+            return tuple(self.decode(v) for v in value['__tuple__'])
+        if '__set__' in value:
+            cls = _import(value['__class__'])
+            return cls(self.decode(v) for v in value['__set__'])
+        if '__callable__' in value:
+            return _import(value['__callable__'])
+        if '__object__' in value:
+            return self.objects[value['__object__']]
+        cls = _import(value['__class__'])
+        obj = cls.__new__(cls)
+        if '__items__' in value:
+            for k, v in value['__items__']:
+                dict.__setitem__(obj, self.decode(k), self.decode(v))
+        if '__state__' in value:
+            obj.__dict__.update(self.decode(value['__state__']))
+        return obj
+
+    def read_array(self, name):
+        r"""
+        Returns the array stored under the given name by ``write_array``
+        """
+        raise NotImplementedError
+
+
+class _Unsupported(Exception):
+    def __str__(self):
+        return type(self.args[0]).__name__
+
+
+def _get_state(obj):
+    r"""
+    Returns the attributes of the given object that can be saved, leaving
+    out weak references since the objects they point to are not saved
+    """
+    # Only use __getstate__ where a class defines it to drop attributes
+    if any('__getstate__' in vars(c) for c in type(obj).__mro__[:-1]):
+        state = obj.__getstate__()
+    else:
+        state = getattr(obj, '__dict__', {})
+    if not isinstance(state, dict):
+        state = {}
+    return {k: v for k, v in state.items() if not isinstance(v, weakref.ref)}
+
+
+def _path(obj):
+    r"""
+    Returns the import path of the given function or class, checking that
+    it leads back to the same object so that the file can be loaded
+    """
+    path = f'{obj.__module__}:{obj.__qualname__}'
+    try:
+        found = _import(path)
+    except (ImportError, AttributeError, ValueError):
+        found = None
+    if found is not obj:
+        raise Exception(f'{path} cannot be saved since it cannot be imported'
+                        ' by name, functions and classes (e.g. pore-scale'
+                        ' models) must be defined at the top level of a'
+                        ' module')
+    return path
+
+
+def _import(path):
+    module, qualname = path.split(':')
+    obj = importlib.import_module(module)
+    for name in qualname.split('.'):
+        obj = getattr(obj, name)
+    return obj
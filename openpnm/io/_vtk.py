@@ -1,49 +1,49 @@
+import base64
 import logging
+import mmap
+import shutil
+import tempfile
+import zlib
 import numpy as np
 import pandas as pd
 from xml.etree import ElementTree as ET
+from xml.sax.saxutils import quoteattr
 from openpnm.io import project_to_dict, _parse_filename
+from openpnm.network import Network
 from openpnm.utils import Workspace
 from openpnm.utils._misc import is_transient
 logger = logging.getLogger(__name__)
 ws = Workspace()
 
 
-_TEMPLATE = """
-<?xml version="1.0" ?>
-<VTKFile byte_order="LittleEndian" type="PolyData" version="0.1">
-    <PolyData>
-        <Piece NumberOfLines="0" NumberOfPoints="0">
-            <Points>
-            </Points>
-            <Lines>
-            </Lines>
-            <PointData>
-            </PointData>
-            <CellData>
-            </CellData>
-        </Piece>
-    </PolyData>
-</VTKFile>
-""".strip()
-
-
-def project_to_vtk(project, filename="",
-                   fill_nans=None, fill_infs=None):
+_DTYPES = {
+    "int8": "Int8",
+    "int16": "Int16",
+    "int32": "Int32",
+    "int64": "Int64",
+    "uint8": "UInt8",
+    "uint16": "UInt16",
+    "uint32": "UInt32",
+    "uint64": "UInt64",
+    "float32": "Float32",
+    "float64": "Float64",
+}
+_BLOCK_SIZE = 2**20
+
+
+def project_to_vtk(project, filename="", fill_nans=None, fill_infs=None,
+                   encoding="raw", compress=False):
     r"""
     Save network and phase data to a single vtp file for visualizing in
     Paraview.
 
     Parameters
     ----------
-    network : Network
-        The Network containing the data to be written
-    phases : list, optional
-        A list containing Phase(s) containing data to be
-        written
+    project : Project
+        The Project containing the data to be written
     filename : str, optional
         Filename to write data.  If no name is given the file is named
-        after the network
+        after the project
     fill_nans : scalar
         The value to use to replace NaNs with.  The VTK file format does
         not work with NaNs, so they must be dealt with.  The default is
@@ -55,8 +55,34 @@ def project_to_vtk(project, filename="",
         which means that property arrays containing ``None`` will *not*
         be written to the file, and a warning will be issued.  A useful
         value is
+    encoding : str, optional
+        How the arrays are stored in the file. Options are:
+
+        =========== ==========================================================
+        encoding    meaning
+        =========== ==========================================================
+        'raw'       (default) The arrays are written as raw binary data
+                    in a single block appended to the end of the file.
+                    This is the smallest and fastest option.
+        'base64'    The arrays are written as base64 encoded binary data
+                    inside each ``DataArray`` tag.
+        'ascii'     The arrays are written as human readable text. This is
+                    slow and produces large files.
+        =========== ==========================================================
+
+    compress : bool, optional
+        If ``True`` the binary arrays are compressed with zlib. This is
+        ignored when ``encoding`` is 'ascii'. The default is ``False``.
+
+    Notes
+    -----
+    The file is written one array at a time, so the memory needed does not
+    grow with the number of properties. Files written with any of the
+    encodings can be read back with ``network_from_vtk``.
 
     """
+    if encoding not in ["raw", "base64", "ascii"]:
+        raise Exception(f"Unrecognized encoding: {encoding}")
     network = project.network
     algs = project.algorithms
     # Check if any of the phases has time series
@@ -81,86 +107,252 @@ def project_to_vtk(project, filename="",
     num_points = np.shape(points)[0]
     num_throats = np.shape(pairs)[0]
 
-    root = ET.fromstring(_TEMPLATE)
-    piece_node = root.find("PolyData").find("Piece")
-    piece_node.set("NumberOfPoints", str(num_points))
-    piece_node.set("NumberOfLines", str(num_throats))
-    points_node = piece_node.find("Points")
-    coords = _array_to_element("coords", points.T.ravel("F"), n=3)
-    points_node.append(coords)
-    lines_node = piece_node.find("Lines")
-    connectivity = _array_to_element("connectivity", pairs)
-    lines_node.append(connectivity)
-    offsets = _array_to_element("offsets", 2 * np.arange(len(pairs)) + 2)
-    lines_node.append(offsets)
-
-    point_data_node = piece_node.find("PointData")
-    cell_data_node = piece_node.find("CellData")
+    point_data = []
+    cell_data = []
     for key in key_list:
         array = am[key]
-        if array.dtype == "O":
-            logger.warning(key + " has dtype object," + " will not write to file")
-        else:
-            if array.dtype == np.bool:
-                array = array.astype(int)
+        if array.dtype == bool:
+            array = array.astype(np.uint8)
+        if str(array.dtype) not in _DTYPES.keys():
+            logger.warning(key + " has dtype " + str(array.dtype)
+                           + ", will not write to file")
+            continue
+        if array.dtype.kind == "f":
             if np.any(np.isnan(array)):
                 if fill_nans is None:
                     logger.warning(key + " has nans," + " will not write to file")
                     continue
                 else:
-                    array[np.isnan(array)] = fill_nans
+                    array = np.where(np.isnan(array), fill_nans, array)
             if np.any(np.isinf(array)):
                 if fill_infs is None:
                     logger.warning(key + " has infs," + " will not write to file")
                     continue
                 else:
-                    array[np.isinf(array)] = fill_infs
-            element = _array_to_element(key, array)
-            if array.size == num_points:
-                point_data_node.append(element)
-            elif array.size == num_throats:
-                cell_data_node.append(element)
-
-    tree = ET.ElementTree(root)
-    tree.write(filename)
-
-    with open(filename, "r+") as f:
-        string = f.read()
-        string = string.replace("</DataArray>", "</DataArray>\n\t\t\t")
-        f.seek(0)
-        # consider adding header: '<?xml version="1.0"?>\n'+
-        f.write(string)
-
-
-def _array_to_element(name, array, n=1):
-    dtype_map = {
-        "int8": "Int8",
-        "int16": "Int16",
-        "int32": "Int32",
-        "int64": "Int64",
-        "uint8": "UInt8",
-        "uint16": "UInt16",
-        "uint32": "UInt32",
-        "uint64": "UInt64",
-        "float32": "Float32",
-        "float64": "Float64",
-        "str": "String",
-    }
-    element = None
-    if str(array.dtype) in dtype_map.keys():
-        element = ET.Element("DataArray")
-        element.set("Name", name)
-        element.set("NumberOfComponents", str(n))
-        element.set("type", dtype_map[str(array.dtype)])
-        element.text = "\t".join(map(str, array.ravel()))
-    return element
-
-
-def _element_to_array(element, n=1):
-    string = element.text
-    dtype = element.get("type")
-    array = np.fromstring(string, sep="\t")
-    array = array.astype(dtype.lower())
+                    array = np.where(np.isinf(array), fill_infs, array)
+        if array.size == num_points:
+            point_data.append((key, array))
+        elif array.size == num_throats:
+            cell_data.append((key, array))
+
+    compressor = ' compressor="vtkZLibDataCompressor"' \
+        if (compress and encoding != "ascii") else ''
+    with open(filename, "wb") as f, tempfile.TemporaryFile() as appended:
+        writer = _DataArrayWriter(f=f, appended=appended, encoding=encoding,
+                                  compress=compress)
+        f.write(b'<?xml version="1.0" ?>\n')
+        f.write(('<VTKFile byte_order="LittleEndian" type="PolyData" '
+                 f'version="1.0" header_type="UInt64"{compressor}>\n'
+                 '  <PolyData>\n'
+                 f'    <Piece NumberOfLines="{num_throats}" '
+                 f'NumberOfPoints="{num_points}">\n').encode())
+        f.write(b'      <Points>\n')
+        writer.write("coords", points, n=3)
+        f.write(b'      </Points>\n      <Lines>\n')
+        writer.write("connectivity", pairs)
+        writer.write("offsets", 2 * np.arange(len(pairs)) + 2)
+        f.write(b'      </Lines>\n      <PointData>\n')
+        for key, array in point_data:
+            writer.write(key, array)
+        f.write(b'      </PointData>\n      <CellData>\n')
+        for key, array in cell_data:
+            writer.write(key, array)
+        f.write(b'      </CellData>\n    </Piece>\n  </PolyData>\n')
+        if encoding == "raw":
+            f.write(b'  <AppendedData encoding="raw">\n   _')
+            appended.seek(0)
+            shutil.copyfileobj(appended, f, length=_BLOCK_SIZE)
+            f.write(b'\n  </AppendedData>\n')
+        f.write(b'</VTKFile>\n')
+
+
+def network_from_vtk(filename):
+    r"""
+    Creates a Network from the data in a vtp file written by
+    ``project_to_vtk``
+
+    Parameters
+    ----------
+    filename : str or path object
+        The name of the file to read
+
+    Returns
+    -------
+    network : Network
+        A Network with the coordinates, connections and any other pore and
+        throat data that belonged to the network when the file was written
+
+    Notes
+    -----
+    The data that belonged to phases or algorithms is not read since the
+    file does not record which object it came from. Binary arrays are
+    read straight from a memory map of the file, so they are not parsed
+    as text and the file is not loaded into memory all at once.
+
+    """
+    filename = _parse_filename(filename=filename, ext="vtp")
+    arrays = _vtp_to_dict(filename)
+    net = {}
+    net['pore.coords'] = arrays.pop('coords')
+    net['throat.conns'] = arrays.pop('connectivity').reshape(-1, 2)
+    for key, array in arrays.items():
+        parts = key.split(' | ', 2)
+        if (len(parts) < 3) or (parts[0] != 'network'):
+            continue
+        propname = parts[2].replace(' | ', '.')
+        if parts[1] == 'labels':
+            array = array.astype(bool)
+        net[propname] = array
+    network = Network()
+    network.update(net)
+    return network
+
+
+class _DataArrayWriter:
+    r"""
+    Writes ``DataArray`` tags to an open vtp file, and their data either
+    inline or to a separate file that is appended at the end
+    """
+
+    def __init__(self, f, appended, encoding, compress):
+        self.f = f
+        self.appended = appended
+        self.encoding = encoding
+        self.compress = compress
+
+    def write(self, name, array, n=1):
+        array = np.ascontiguousarray(array)
+        array = array.astype(array.dtype.newbyteorder('<'), copy=False)
+        tag = (f'        <DataArray Name={quoteattr(name)} '
+               f'NumberOfComponents="{n}" type="{_DTYPES[str(array.dtype)]}"')
+        if self.encoding == "ascii":
+            self.f.write(f'{tag} format="ascii">\n'.encode())
+            flat = array.ravel()
+            for i in range(0, flat.size, _BLOCK_SIZE):
+                if i > 0:
+                    self.f.write(b'\t')
+                self.f.write("\t".join(map(str, flat[i:i+_BLOCK_SIZE])).encode())
+            self.f.write(b'\n        </DataArray>\n')
+            return
+        header, blocks = _encode(array, self.compress)
+        if self.encoding == "base64":
+            self.f.write(f'{tag} format="binary">\n'.encode())
+            self.f.write(base64.b64encode(header))
+            self.f.write(base64.b64encode(b''.join(blocks)))
+            self.f.write(b'\n        </DataArray>\n')
+        else:
+            offset = self.appended.tell()
+            self.f.write(f'{tag} format="appended" offset="{offset}"/>\n'.encode())
+            self.appended.write(header)
+            for block in blocks:
+                self.appended.write(block)
+
+
+def _encode(array, compress):
+    r"""
+    Returns the VTK header and the data blocks for the given array, using
+    UInt64 for the header entries
+    """
+    raw = memoryview(array.reshape(-1)).cast('B')
+    if not compress:
+        return np.array([raw.nbytes], dtype='<u8').tobytes(), [raw]
+    # The fastest level compresses floating point data nearly as well
+    blocks = [zlib.compress(raw[i:i+_BLOCK_SIZE], 1)
+              for i in range(0, raw.nbytes, _BLOCK_SIZE)]
+    # VTK expects the size of the last block to be 0 if it is full
+    last = raw.nbytes % _BLOCK_SIZE
+    header = [len(blocks), _BLOCK_SIZE, last] + [len(b) for b in blocks]
+    return np.array(header, dtype='<u8').tobytes(), blocks
+
+
+def _vtp_to_dict(filename):
+    r"""
+    Reads all the ``DataArray`` tags in a vtp file into a dictionary of
+    arrays, keyed by the ``Name`` of each tag
+    """
+    with open(filename, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            i = mm.find(b'<AppendedData')
+            if i >= 0:
+                # Only the xml header is parsed, the binary data are sliced
+                # directly from the file
+                root = ET.fromstring(mm[:i] + b'</VTKFile>')
+                start = mm.find(b'_', mm.find(b'>', i)) + 1
+                if mm.find(b'encoding="raw"', i, start) < 0:
+                    raise Exception('Only raw appended data is supported')
+                appended = memoryview(mm)[start:]
+            else:
+                root = ET.fromstring(mm[:])
+                appended = None
+            header_type = np.dtype(root.get('header_type', 'UInt32').lower())
+            compressed = root.get('compressor') is not None
+            arrays = {}
+            try:
+                for element in root.iter('DataArray'):
+                    arrays[element.get('Name')] = _element_to_array(
+                        element, appended=appended,
+                        header_type=header_type, compressed=compressed)
+            finally:
+                if appended is not None:
+                    appended.release()
+    return arrays
+
+
+def _element_to_array(element, appended=None, header_type=np.uint32,
+                      compressed=False):
+    dtype = np.dtype(element.get("type").lower()).newbyteorder('<')
+    n = int(element.get("NumberOfComponents", 1))
+    fmt = element.get("format", "ascii")
+    if fmt == "ascii":
+        array = np.array(element.text.split(), dtype=dtype)
+    elif fmt == "binary":
+        data = _decode_base64(element.text.strip(), header_type, compressed)
+        array = np.frombuffer(data, dtype=dtype).copy()
+    elif fmt == "appended":
+        offset = int(element.get("offset"))
+        data = _read_appended(appended, offset, header_type, compressed)
+        array = np.frombuffer(data, dtype=dtype).copy()
+    else:
+        raise Exception(f"Unrecognized format: {fmt}")
+    array = array.astype(dtype.newbyteorder('='), copy=False)
     if n != 1:
         array = array.reshape(array.size // n, n)
     return array
+
+
+def _read_appended(buf, offset, header_type, compressed):
+    h = header_type.itemsize
+    if not compressed:
+        nbytes = int(np.frombuffer(buf, header_type, 1, offset)[0])
+        return buf[offset+h:offset+h+nbytes]
+    nblocks = int(np.frombuffer(buf, header_type, 1, offset)[0])
+    header = np.frombuffer(buf, header_type, 3 + nblocks, offset)
+    start = offset + h*(3 + nblocks)
+    blocks = []
+    for size in header[3:].astype(int):
+        blocks.append(zlib.decompress(buf[start:start+size]))
+        start += size
+    return b''.join(blocks)
+
+
+def _decode_base64(text, header_type, compressed):
+    h = header_type.itemsize
+    if not compressed:
+        n = 4*(-(-h//3))
+        if text[n-1] != '=':
+            # The header and data were encoded together
+            data = base64.b64decode(text)
+            nbytes = int(np.frombuffer(data, header_type, 1)[0])
+            return data[h:h+nbytes]
+        nbytes = int(np.frombuffer(base64.b64decode(text[:n]), header_type)[0])
+        return base64.b64decode(text[n:])[:nbytes]
+    nblocks = int(np.frombuffer(base64.b64decode(text[:4*h]), header_type)[0])
+    n = 4*(-(-(h*(3 + nblocks))//3))
+    header = np.frombuffer(base64.b64decode(text[:n]), header_type)
+    data = memoryview(base64.b64decode(text[n:]))
+    blocks = []
+    start = 0
+    for size in header[3:].astype(int):
+        blocks.append(zlib.decompress(data[start:start+size]))
+        start += size
+    return b''.join(blocks)
@@ -1,4 +1,5 @@
 import logging
+import numpy as np
 import pandas as pd
 import xml.etree.cElementTree as ET
 from openpnm.io import project_to_dict, _parse_filename
@@ -157,6 +158,197 @@ def project_to_xdmf(project, filename=''):
         file.write(ET.tostring(root).decode("utf-8"))
 
 
+class XdmfWriter:
+    r"""
+    Writes the solution of a transient algorithm to an XDMF/HDF5 file pair
+    one time step at a time
+
+    Parameters
+    ----------
+    algorithm : TransientReactiveTransport
+        The transient algorithm whose solution is to be written
+    filename : str or path object, optional
+        The name of the files to create, with the extensions 'xmf' and
+        'hdf' added. If not given the project name is used.
+    compression : str, optional
+        The compression filter applied to the time series, which are stored
+        in chunks of one time step each. The default is 'gzip'. Use ``None``
+        to store the data uncompressed.
+    compression_opts : int, optional
+        The options passed to the compression filter, which for 'gzip' is
+        the compression level between 0 and 9. The default is 4.
+
+    Notes
+    -----
+    The pore coordinates, throat connections and the other numerical pore
+    and throat properties of the network are written once when the writer
+    is created. Each call to ``append`` then adds one row to a single
+    extensible dataset holding the algorithm's quantity (e.g.
+    'trans_01/pore/concentration', of shape (number of steps, Np)) and
+    adds a grid referring to that row to the 'xmf' file. Both files are
+    flushed after every step, so they can be opened in ParaView while the
+    simulation is still running.
+
+    The writer can be passed to ``TransientReactiveTransport.run`` as
+    ``writer``, in which case each saved time step is written as soon as
+    it is computed rather than being collected in memory:
+
+    .. code-block:: python
+
+        with op.io.XdmfWriter(alg, filename='run') as writer:
+            alg.run(x0=0, tspan=(0, 100), saveat=1, writer=writer)
+
+    """
+
+    def __init__(self, algorithm, filename='', compression='gzip',
+                 compression_opts=4):
+        network = algorithm.network
+        if filename == '':
+            filename = algorithm.project.name
+        path = _parse_filename(filename=filename, ext='xmf')
+        self.path = path
+        self.fname_hdf = path.stem + '.hdf'
+        quantity = algorithm.settings['quantity']
+        self.name = algorithm.name + '/' + quantity.replace('.', '/')
+        self.algorithm = algorithm
+        self.n_steps = 0
+        self.f = h5py.File(path.parent.joinpath(self.fname_hdf), "w")
+        self.f["coordinates"] = network["pore.coords"]
+        self.f["connections"] = network["throat.conns"]
+        self.f.create_dataset('time', shape=(0, ), maxshape=(None, ),
+                              dtype=float)
+        kwargs = {}
+        if compression is not None:
+            kwargs = {'compression': compression,
+                      'compression_opts': compression_opts,
+                      'shuffle': True}
+        self.f.create_dataset(self.name, shape=(0, network.Np),
+                              maxshape=(None, network.Np), dtype=float,
+                              chunks=(1, network.Np), **kwargs)
+        # The network's data does not change so is written only once
+        self._static = []
+        for key in network.keys():
+            arr = network[key]
+            if (arr.ndim != 1) or (arr.dtype.kind not in 'biuf'):
+                continue
+            name = network.name + '/' + key.replace('.', '/')
+            if arr.dtype == bool:
+                arr = arr.astype(np.int8)
+            self.f.create_dataset(name, data=arr, **kwargs)
+            self._static.append(name)
+        self.f.flush()
+        # Write everything up to the time steps, then the closing tags,
+        # which are overwritten by each new time step
+        root = create_root('Xdmf')
+        domain = create_domain()
+        t_grid = create_grid(Name="TimeSeries", GridType="Collection",
+                             CollectionType="Temporal")
+        t_grid.text = '{grids}'
+        domain.append(t_grid)
+        root.append(domain)
+        head, self._footer = ET.tostring(root).decode("utf-8").split('{grids}')
+        self.xmf = open(path, 'w')
+        self.xmf.write(_header + head)
+        self._start = self._pos = self.xmf.tell()
+        self.xmf.write(self._footer)
+        self.xmf.flush()
+
+    def append(self, t, x):
+        r"""
+        Writes the solution at the given time to the files
+
+        Parameters
+        ----------
+        t : float
+            The time of the solution
+        x : ndarray
+            The value of the algorithm's quantity in each pore at time ``t``
+
+        """
+        i = self.n_steps
+        self.f['time'].resize((i + 1, ))
+        self.f['time'][i] = t
+        dset = self.f[self.name]
+        dset.resize((i + 1, dset.shape[1]))
+        dset[i, :] = x
+        self.f.flush()
+        self.n_steps += 1
+        self.xmf.seek(self._pos)
+        self.xmf.write(ET.tostring(self._make_grid(i, t)).decode("utf-8"))
+        self._pos = self.xmf.tell()
+        self.xmf.write(self._footer)
+        self.xmf.truncate()
+        self.xmf.flush()
+
+    def close(self):
+        r"""
+        Closes the files
+        """
+        # The grids written so far give the size of the time series when
+        # each was written, so are rewritten with the final size
+        self.xmf.seek(self._start)
+        for i, t in enumerate(self.f['time'][:]):
+            self.xmf.write(ET.tostring(self._make_grid(i, t)).decode("utf-8"))
+        self.xmf.write(self._footer)
+        self.xmf.truncate()
+        self.f.close()
+        self.xmf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _make_grid(self, i, t):
+        Np = self.f['coordinates'].shape[0]
+        Nt = self.f['connections'].shape[0]
+        grid = create_grid(Name=str(i), GridType="Uniform")
+        grid.append(create_time(mode='Single', Value=str(t)))
+        # Refer to row i of the time series using a hyperslab
+        slab = ET.Element('DataItem')
+        slab.attrib.update({'ItemType': 'HyperSlab', 'Dimensions': str(Np),
+                            'Type': 'HyperSlab'})
+        slab.append(create_data_item(value=f"{i} 0 1 1 1 {Np}",
+                                     Dimensions="3 2", Format="XML",
+                                     DataType="Int"))
+        slab.append(create_data_item(
+            value=self.fname_hdf + ":/" + self.name,
+            Dimensions=f"{self.n_steps} {Np}", Format="HDF",
+            Precision="8", Rank="2"))
+        attr = create_attribute(Name=self.name.replace('/', ' | '),
+                                Center="Node", AttributeType="Scalar")
+        attr.append(slab)
+        grid.append(attr)
+        for name in self._static:
+            dtype = self.f[name].dtype
+            attr = create_attribute(
+                Name=name.replace('/', ' | '),
+                Center="Cell" if '/throat/' in name else "Node",
+                AttributeType="Scalar")
+            attr.append(create_data_item(
+                value=self.fname_hdf + ":/" + name,
+                Dimensions=str(self.f[name].shape[0]), Format="HDF",
+                DataType={'i': 'Int', 'u': 'UInt'}.get(dtype.kind, 'Float'),
+                Precision=str(dtype.itemsize)))
+            grid.append(attr)
+        topo = create_topology(TopologyType="Polyline",
+                               NodesPerElement=str(2),
+                               NumberOfElements=str(Nt))
+        topo.append(create_data_item(
+            value=self.fname_hdf + ":/connections", Dimensions=f"{Nt} 2",
+            Format="HDF", DataType="Int", Rank="2",
+            Precision=str(self.f['connections'].dtype.itemsize)))
+        grid.append(topo)
+        geo = create_geometry(GeometryType="XYZ")
+        geo.append(create_data_item(value=self.fname_hdf + ":/coordinates",
+                                    Dimensions=f"{Np} 3", Format='HDF',
+                                    DataType="Float", Precision="8",
+                                    Rank="2"))
+        grid.append(geo)
+        return grid
+
+
 def create_root(Name):
     return ET.Element(Name)
 
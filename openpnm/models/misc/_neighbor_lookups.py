@@ -5,6 +5,7 @@ Neighbor Lookups
 """
 import logging
 import numpy as np
+from openpnm.utils import segmented_reduce
 logger = logging.getLogger(__name__)
 
 
@@ -46,29 +47,24 @@ def from_neighbor_throats(target, prop, mode='min', ignore_nans=True):
 
     """
     network = target.network
-    data = target[prop]
+    im = network.get_incidence_matrix(fmt='csr')
+    # Throat values listed pore by pore, this is a copy so can be changed
+    data = target[prop][im.indices]
     nans = np.isnan(data)
-    im = network.create_incidence_matrix()
     if mode == 'min':
         if ignore_nans:
             data[nans] = np.inf
-        values = np.ones((network.Np, ))*np.inf
-        np.minimum.at(values, im.row, data[im.col])
+        values = segmented_reduce(data, im.indptr, mode='min')
     if mode == 'max':
         if ignore_nans:
             data[nans] = -np.inf
-        values = np.ones((network.Np, ))*-np.inf
-        np.maximum.at(values, im.row, data[im.col])
+        values = segmented_reduce(data, im.indptr, mode='max')
     if mode == 'mean':
+        counts = np.diff(im.indptr)
         if ignore_nans:
             data[nans] = 0
-        values = np.zeros((network.Np, ))
-        np.add.at(values, im.row, data[im.col])
-        counts = np.zeros((network.Np, ))
-        np.add.at(counts, im.row, np.ones((network.Nt, ))[im.col])
-        if ignore_nans:
-            np.subtract.at(counts, im.row, nans[im.col])
-        values = values/counts
+            counts = counts - segmented_reduce(nans, im.indptr, mode='sum')
+        values = segmented_reduce(data, im.indptr, mode='sum')/counts
     return values
 
 
@@ -112,16 +108,18 @@ def from_neighbor_pores(target, prop, mode='min', ignore_nans=True):
     network = target.network
     throats = target.Ts
     P12 = network.find_connected_pores(throats)
-    pvalues = target[prop][P12]
-    if ignore_nans:
-        pvalues = np.ma.MaskedArray(data=pvalues, mask=np.isnan(pvalues))
-    try:  # If pvalues is not empty
-        if mode == 'min':
-            value = np.amin(pvalues, axis=1)
-        if mode == 'max':
-            value = np.amax(pvalues, axis=1)
-        if mode == 'mean':
-            value = np.mean(pvalues, axis=1)
-    except np.AxisError:  # Handle case of empty pvalues
-        value = []
+    P1, P2 = target[prop][P12].T
+    # fmin and fmax only return nan if both values are nan
+    if mode == 'min':
+        value = np.fmin(P1, P2) if ignore_nans else np.minimum(P1, P2)
+    if mode == 'max':
+        value = np.fmax(P1, P2) if ignore_nans else np.maximum(P1, P2)
+    if mode == 'mean':
+        if ignore_nans:
+            valid = ~np.isnan(P1), ~np.isnan(P2)
+            total = np.where(valid[0], P1, 0) + np.where(valid[1], P2, 0)
+            with np.errstate(invalid='ignore'):
+                value = total/(valid[0].astype(int) + valid[1])
+        else:
+            value = (P1 + P2)/2
     return np.array(value)
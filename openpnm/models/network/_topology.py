@@ -69,9 +69,7 @@ def distance_to_nearest_pore(network):
     Find distance to and index of nearest pore even if not topologically
     connected
     """
-    import scipy.spatial as sptl
-    coords = network.coords
-    tree = sptl.KDTree(coords)
-    ds, ids = tree.query(coords, k=2)
+    tree = network.get_kdtree()
+    ds, ids = tree.query(network.coords, k=2)
     values = ds[:, 1]
     return values
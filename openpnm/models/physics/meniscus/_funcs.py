@@ -1,4 +1,5 @@
 import logging
+import functools
 import numpy as np
 
 
@@ -18,7 +19,9 @@ def general_toroidal(
     throat_diameter='throat.diameter',
     touch_length='throat.touch_length',
     surface_tension='throat.surface_tension',
-    contact_angle='throat.contact_angle'
+    contact_angle='throat.contact_angle',
+    max_method='sample',
+    chunk_size=None,
 ):
     r"""
     The general model for meniscus properties inside a toroidal throat
@@ -64,6 +67,25 @@ def general_toroidal(
     contact_angle : str
         %(dict_blurb)s contact angle values to be used. If a pore property
         is given, it is interpolated to a throat list.
+    max_method : str
+        How the maximum capillary pressure is found when mode is 'max'.
+        Options are:
+
+            ========= ========================================================
+            Method    Description
+            ========= ========================================================
+            'sample'  (default) The largest value found at the ``num_points``
+                      positions along the throat
+            'bracket' The maximum is bracketed using the ``num_points``
+                      positions, then refined using a golden section search.
+                      This is more accurate, even with far fewer points.
+            ========= ========================================================
+
+    chunk_size : int, optional
+        The number of throats for which the profile is evaluated at once.
+        This bounds the memory used by the ``num_points`` by ``Nt`` arrays
+        of intermediate values. If not given, it is chosen such that each
+        of these arrays holds about 2 million values.
 
     Returns
     -------
@@ -86,85 +108,96 @@ def general_toroidal(
         ============ =========================================================
 
     """
-    from sympy import symbols, lambdify
-    from sympy import atan as sym_atan
-    from sympy import cos as sym_cos
-    from sympy import sin as sym_sin
-    from sympy import sqrt as sym_sqrt
-    from sympy import pi as sym_pi
+    if profile_equation not in ['elliptical', 'sinusoidal']:
+        logger.error('Profile equation is not valid, default to elliptical')
+        profile_equation = 'elliptical'
+    funcs = _get_toroidal_funcs(profile_equation)
+    rx = funcs['rx']
+    fill_angle = funcs['fill_angle']
+    rad_curve = funcs['rad_curve']
+    c2x = funcs['c2x']
+    cap_angle = funcs['cap_angle']
+    Pc = funcs['Pc']
+    if mode not in ['max', 'touch', 'men']:
+        raise Exception('Unrecognized mode')
+    if mode == 'men':
+        if target_Pc is None:
+            logger.error(msg='Please supply a target capillary pressure'
+                         + ' when mode is "men", defaulting to 1.0e-6')
+            target_Pc = 1.0e-6
+        if np.abs(target_Pc) < 1.0e-6:
+            logger.error(msg='Please supply a target capillary pressure'
+                         + ' with absolute value greater than 1.0e-6,'
+                         + ' default to 1.0e-6')
+            target_Pc = 1.0e-6
 
     # Get data from dictionary keys
     network = phase.network
-    surface_tension = phase[surface_tension]
-    contact = phase[contact_angle]
-    # Contact Angle in radians
-    contact = np.deg2rad(contact)
+    Nt = network.Nt
     # Network properties
     throatRad = network[throat_diameter]/2
-    # Scaling parameters for throat profile
-    fa = phase[throat_scale_a]
-    fb = phase[throat_scale_b]
-    # Governing equations
-    x, a, b, rt, sigma, theta = symbols('x, a, b, rt, sigma, theta')
-    if profile_equation == 'elliptical':
-        y = sym_sqrt(1 - (x/a)**2)*b
-    elif profile_equation == 'sinusoidal':
-        y = (sym_cos((sym_pi/2)*(x/a)))*b
-    else:
-        logger.error('Profile equation is not valid, default to elliptical')
-        y = sym_sqrt(1 - (x/a)**2)*b
-    # Throat radius profile
-    r = rt + (b-y)
-    # Derivative of profile
-    rprime = r.diff(x)
-    # Filling angle
-    alpha = sym_atan(rprime)
-    # Angle between y axis and contact point to meniscus center
-    eta = sym_pi - alpha - theta
-    gamma = sym_pi/2 - eta
-    # Radius of curvature of meniscus
-    rm = r/sym_cos(eta)
-    # distance from center of curvature to meniscus contact point (Pythagoras)
-    d = rm*sym_sin(eta)
-    # angle between throat axis, meniscus center and meniscus contact point
-    # Capillary Pressure
-    p = 2*sigma/rm
-    # Callable functions
-    rx = lambdify((x, a, b, rt), r, 'numpy')
-    fill_angle = lambdify((x, a, b, rt), alpha, 'numpy')
-    rad_curve = lambdify((x, a, b, rt, theta), rm, 'numpy')
-    c2x = lambdify((x, a, b, rt, theta), d, 'numpy')
-    cap_angle = lambdify((x, a, b, rt, theta), gamma, 'numpy')
-    Pc = lambdify((x, a, b, rt, theta, sigma), p, 'numpy')
+    # Contact Angle in radians, and scaling parameters for throat profile
+    surface_tension, contact, fa, fb = [
+        np.broadcast_to(np.asarray(item, dtype=float), (Nt, ))
+        for item in [phase[surface_tension], np.deg2rad(phase[contact_angle]),
+                     phase[throat_scale_a], phase[throat_scale_b]]]
+    if mode == 'touch':
+        touch_len = np.broadcast_to(network[touch_length], (Nt, ))
     # All relative positions along throat
     hp = int(num_points/2)
     log_pos = np.logspace(-4, -1, hp+1)[:-1]
     lin_pos = np.arange(0.1, 1.0, 1/hp)
     half_pos = np.concatenate((log_pos, lin_pos))
     pos = np.concatenate((-half_pos[::-1], half_pos))
-    # Now find the positions of the menisci along each throat axis
-    Y, X = np.meshgrid(throatRad, pos)
-    X *= fa
-    # throat Capillary Pressure
-    t_Pc = Pc(X, fa, fb, Y, contact, surface_tension)
-    # Values of minima and maxima
-    Pc_min = np.min(t_Pc, axis=0)
-    Pc_max = np.max(t_Pc, axis=0)
-    # Arguments of minima and maxima
-    a_min = np.argmin(t_Pc, axis=0)
-    a_max = np.argmax(t_Pc, axis=0)
+    inds = np.arange(len(pos))[:, np.newaxis]
+    if chunk_size is None:
+        chunk_size = max(1, 2**21 // len(pos))
+    # Values and arguments of minima and maxima
+    Pc_min, Pc_max = np.zeros(Nt), np.zeros(Nt)
+    a_min, a_max = np.zeros(Nt, dtype=int), np.zeros(Nt, dtype=int)
+    arg_touch, arg_x = np.zeros(Nt, dtype=int), np.zeros(Nt, dtype=int)
+    # Find the positions of the menisci along each throat axis, a chunk of
+    # throats at a time
+    for start in range(0, Nt, chunk_size):
+        s = slice(start, start + chunk_size)
+        X = pos[:, np.newaxis]*fa[s]
+        # throat Capillary Pressure
+        t_Pc = Pc(X, fa[s], fb[s], throatRad[s], contact[s],
+                  surface_tension[s])
+        Pc_min[s] = np.min(t_Pc, axis=0)
+        Pc_max[s] = np.max(t_Pc, axis=0)
+        a_min[s] = np.argmin(t_Pc, axis=0)
+        a_max[s] = np.argmax(t_Pc, axis=0)
+        if mode == 'touch':
+            all_rad = rad_curve(X, fa[s], fb[s], throatRad[s], contact[s])
+            all_c2x = c2x(X, fa[s], fb[s], throatRad[s], contact[s])
+            all_cen = X - all_c2x
+            dist = all_cen + all_rad
+            # Only count lengths where meniscus bulges into pore
+            dist[all_rad < 0] = 0.0
+            mask = dist > touch_len[s]
+            arg_touch[s] = np.argmax(mask, axis=0)
+        elif mode == 'men':
+            # Change values outside the range between minima and maxima to
+            # be those values
+            t_Pc = np.where(inds < a_min[s], Pc_min[s], t_Pc)
+            t_Pc = np.where(inds > a_max[s], Pc_max[s], t_Pc)
+            # Find the argument at or above the target Pressure
+            mask = t_Pc >= target_Pc
+            arg_x[s] = np.argmax(mask, axis=0)
     if mode == 'max':
+        if max_method == 'bracket':
+            lo = pos[np.maximum(a_max - 1, 0)]*fa
+            hi = pos[np.minimum(a_max + 1, len(pos) - 1)]*fa
+
+            def f(x):
+                return Pc(x, fa, fb, throatRad, contact, surface_tension)
+
+            Pc_max = np.fmax(Pc_max, _golden_section_max(f, lo, hi))
+        elif max_method != 'sample':
+            raise Exception(f'Unrecognized max_method: {max_method}')
         return Pc_max
     elif mode == 'touch':
-        all_rad = rad_curve(X, fa, fb, Y, contact)
-        all_c2x = c2x(X, fa, fb, Y, contact)
-        all_cen = X - all_c2x
-        dist = all_cen + all_rad
-        # Only count lengths where meniscus bulges into pore
-        dist[all_rad < 0] = 0.0
-        touch_len = network[touch_length]
-        mask = dist > touch_len
-        arg_touch = np.argmax(mask, axis=0)
         # Make sure we only count ones that happen before max pressure
         # And above min pressure (which will be erroneous)
         arg_in_range = (arg_touch < a_max) * (arg_touch > a_min)
@@ -173,30 +206,6 @@ def general_toroidal(
         # Return the pressure at which a touch happens
         Pc_touch = Pc(x_touch, fa, fb, throatRad, contact, surface_tension)
         return Pc_touch
-    elif (mode == 'men'):
-        if target_Pc is None:
-            logger.error(msg='Please supply a target capillary pressure'
-                         + ' when mode is "men", defaulting to 1.0e-6')
-            target_Pc = 1.0e-6
-    else:
-        raise Exception('Unrecognized mode')
-    if np.abs(target_Pc) < 1.0e-6:
-        logger.error(msg='Please supply a target capillary pressure'
-                     + ' with absolute value greater than 1.0e-6,'
-                     + ' default to 1.0e-6')
-        target_Pc = 1.0e-6
-    # Find the position in-between the minima and maxima corresponding to
-    # the target pressure
-    inds = np.indices(np.shape(t_Pc))
-    # Change values outside the range between minima and maxima to be those
-    # Values
-    mask = inds[0] < np.ones(len(pos))[:, np.newaxis]*a_min
-    t_Pc[mask] = (np.ones(len(pos))[:, np.newaxis]*Pc_min)[mask]
-    mask = inds[0] > np.ones(len(pos))[:, np.newaxis]*a_max
-    t_Pc[mask] = (np.ones(len(pos))[:, np.newaxis]*Pc_max)[mask]
-    # Find the argument at or above the target Pressure
-    mask = t_Pc >= target_Pc
-    arg_x = np.argmax(mask, axis=0)
     # If outside range change to minima or maxima accordingly
     arg_x[target_Pc < Pc_min] = a_min[target_Pc < Pc_min]
     arg_x[target_Pc > Pc_max] = a_max[target_Pc > Pc_max]
@@ -221,6 +230,73 @@ def general_toroidal(
     return men_data
 
 
+@functools.lru_cache(maxsize=None)
+def _get_toroidal_funcs(profile_equation):
+    r"""
+    Returns the lambdified functions describing the meniscus in a throat
+    with the given profile. These are cached since building them with
+    sympy is slow.
+    """
+    from sympy import symbols, lambdify
+    from sympy import atan as sym_atan
+    from sympy import cos as sym_cos
+    from sympy import sin as sym_sin
+    from sympy import sqrt as sym_sqrt
+    from sympy import pi as sym_pi
+
+    # Governing equations
+    x, a, b, rt, sigma, theta = symbols('x, a, b, rt, sigma, theta')
+    if profile_equation == 'elliptical':
+        y = sym_sqrt(1 - (x/a)**2)*b
+    elif profile_equation == 'sinusoidal':
+        y = (sym_cos((sym_pi/2)*(x/a)))*b
+    # Throat radius profile
+    r = rt + (b-y)
+    # Derivative of profile
+    rprime = r.diff(x)
+    # Filling angle
+    alpha = sym_atan(rprime)
+    # Angle between y axis and contact point to meniscus center
+    eta = sym_pi - alpha - theta
+    gamma = sym_pi/2 - eta
+    # Radius of curvature of meniscus
+    rm = r/sym_cos(eta)
+    # distance from center of curvature to meniscus contact point (Pythagoras)
+    d = rm*sym_sin(eta)
+    # angle between throat axis, meniscus center and meniscus contact point
+    # Capillary Pressure
+    p = 2*sigma/rm
+    # Callable functions
+    funcs = {
+        'rx': lambdify((x, a, b, rt), r, 'numpy'),
+        'fill_angle': lambdify((x, a, b, rt), alpha, 'numpy'),
+        'rad_curve': lambdify((x, a, b, rt, theta), rm, 'numpy'),
+        'c2x': lambdify((x, a, b, rt, theta), d, 'numpy'),
+        'cap_angle': lambdify((x, a, b, rt, theta), gamma, 'numpy'),
+        'Pc': lambdify((x, a, b, rt, theta, sigma), p, 'numpy'),
+    }
+    return funcs
+
+
+def _golden_section_max(f, lo, hi, iters=50):
+    r"""
+    Finds the maximum of the vectorized function ``f`` in each of the
+    intervals [lo, hi] by golden section search
+    """
+    g = (np.sqrt(5) - 1)/2
+    c, d = hi - g*(hi - lo), lo + g*(hi - lo)
+    fc, fd = f(c), f(d)
+    for _ in range(iters):
+        left = fc >= fd
+        lo = np.where(left, lo, c)
+        hi = np.where(left, d, hi)
+        new = np.where(left, hi - g*(hi - lo), lo + g*(hi - lo))
+        fnew = f(new)
+        c, d, fc, fd = (np.where(left, new, d), np.where(left, c, new),
+                        np.where(left, fnew, fd), np.where(left, fc, fnew))
+    return np.fmax(fc, fd)
+
+
 def sinusoidal(
     phase,
     mode='max',
@@ -387,7 +387,12 @@ def natural_logarithm(phase, X, A1=0.0, A2=1.0, A3=1.0, A4=0.0, A5=0.0):
     return values
 
 
-def _build_func(eq, **args):
+# Compiled (EQ, S1, S2) callables, keyed on the equation, the names of the
+# arguments and the backend, shared by all calls to ``general_symbolic``
+_symbolic_cache = {}
+
+
+def _build_func(eq, backend='numpy', **args):
     r"""
     Take a symbolic equation and return the lambdified version plus the
     linearization of form S1 * x + S2
@@ -396,14 +401,44 @@ def _build_func(eq, **args):
     eq_prime = eq.diff(args['x'])
     s1 = eq_prime
     s2 = eq - eq_prime*args['x']
-    EQ = lambdify(args.values(), expr=eq, modules='numpy')
-    S1 = lambdify(args.values(), expr=s1, modules='numpy')
-    S2 = lambdify(args.values(), expr=s2, modules='numpy')
-    return EQ, S1, S2
+    if backend == 'numexpr':
+        try:
+            import numexpr  # noqa: F401
+        except ModuleNotFoundError:
+            raise Exception('numexpr must be installed to use this backend')
+    modules = 'numexpr' if backend == 'numexpr' else 'numpy'
+    funcs = [lambdify(args.values(), expr=item, modules=modules)
+             for item in [eq, s1, s2]]
+    if backend == 'numba':
+        from numba import njit
+        funcs = [njit(f) for f in funcs]
+    elif backend not in ['numpy', 'numexpr']:
+        raise Exception(f'Unrecognized backend: {backend}')
+    return tuple(funcs)
+
+
+def _get_func(eqn, keys, backend):
+    r"""
+    Returns the (EQ, S1, S2) callables for the given equation and argument
+    names, building them only if they're not already in the cache
+    """
+    from sympy import symbols, sympify
+    key = (eqn, tuple(keys), backend)
+    try:
+        return _symbolic_cache[key]
+    except KeyError:
+        pass
+    except TypeError:  # eqn is not hashable, so skip the cache
+        key = None
+    args = {k: symbols(k) for k in keys}
+    funcs = _build_func(sympify(eqn), backend=backend, **args)
+    if key is not None:
+        _symbolic_cache[key] = funcs
+    return funcs
 
 
 @_doctxt
-def general_symbolic(phase, eqn, x, **kwargs):
+def general_symbolic(phase, eqn, x, backend='numpy', **kwargs):
     r"""
     A general function to interpret a sympy equation and evaluate the linear
     components of the source term.
@@ -416,6 +451,19 @@ def general_symbolic(phase, eqn, x, **kwargs):
         passed to sympy's ``sympify`` function to make a *live* sympy object.
     x : str
         The dictionary key of the independent variable
+    backend : str
+        How the equation and its linearization are evaluated. Options are:
+
+        ============ =====================================================
+        backend      description
+        ============ =====================================================
+        'numpy'      (default) Uses numpy functions
+        'numexpr'    Uses ``numexpr``, which must be installed
+        'numba'      Compiles the numpy version with ``numba.njit``. The
+                     first call is slow, so this is only worthwhile when
+                     the model is run many times on large networks.
+        ============ =====================================================
+
     kwargs
         All additional keyword arguments are converted to sympy variables
         using the ``symbols`` function.  Note that IF the arguments are
@@ -424,6 +472,12 @@ def general_symbolic(phase, eqn, x, **kwargs):
         used 'as is'.  Numpy arrays are not accepted.  These must be stored
         in the ``phase`` dictionary and referenced by key.
 
+    Notes
+    -----
+    The sympy equation is only compiled the first time a given equation
+    is used with a given set of arguments. The compiled functions are
+    then reused by all subsequent calls, including from other models.
+
     Examples
     --------
     >>> import openpnm as op
@@ -443,18 +497,14 @@ def general_symbolic(phase, eqn, x, **kwargs):
     ...                 eqn=y, x='pore.x', **arg_map)
 
     """
-    from sympy import symbols, sympify
-    eqn = sympify(eqn)
     # Get the data
     data = {'x': phase[x]}
-    args = {'x': symbols('x')}
     for key in kwargs.keys():
         if isinstance(kwargs[key], str):
             data[key] = phase[kwargs[key]]
         else:
             data[key] = kwargs[key]
-        args[key] = symbols(key)
-    r, s1, s2 = _build_func(eqn, **args)
+    r, s1, s2 = _get_func(eqn, data.keys(), backend)
     r_val = r(*data.values())
     s1_val = s1(*data.values())
     s2_val = s2(*data.values())
@@ -86,7 +86,11 @@ class Network(Domain):
 
     All of the topological queries are accomplished by inspecting the
     adjacency and incidence matrices. They are created on demand, and are
-    stored for future use to save construction time.
+    stored for future use to save construction time. The stored matrices
+    are discarded whenever 'throat.conns' or 'pore.coords' is written.
+    Neighbor queries slice the rows of these matrices in CSR format
+    directly, so each one costs only as much as the number of neighbors
+    found.
 
     """
 
@@ -95,6 +99,8 @@ class Network(Domain):
         self.settings._update(NetworkSettings())
         self._am = {}
         self._im = {}
+        self._lm = {}
+        self._kd = {}
 
         if coords is not None:
             coords = np.array(coords)
@@ -113,11 +119,25 @@ class Network(Domain):
                        regen_mode='deferred',
                        domain='all')
 
+    def __getstate__(self):
+        # The topological matrices and the spatial index are large and quick
+        # to rebuild so are not kept
+        state = super().__getstate__()
+        state.update({'_am': {}, '_im': {}, '_lm': {}, '_kd': {}})
+        return state
+
     def __setitem__(self, key, value):
         if key == 'throat.conns':
             if np.any(value[:, 0] > value[:, 1]):
                 logger.warning('Converting throat.conns to be upper triangular')
                 value = np.sort(value, axis=1)
+        if key in ['throat.conns', 'pore.coords']:
+            # Cached topological matrices are out of date now
+            self._am.clear()
+            self._im.clear()
+            self._lm.clear()
+        if key == 'pore.coords':
+            self._kd.clear()
         super().__setitem__(key, value)
 
     def get_adjacency_matrix(self, fmt='coo'):
@@ -193,6 +213,29 @@ class Network(Domain):
             self._im[fmt] = im
         return im
 
+    def get_kdtree(self):
+        r"""
+        A ``scipy.spatial.cKDTree`` of the pore coordinates, for finding
+        pores by their location
+
+        Notes
+        -----
+        The tree is created on the first call and stored for future use.
+        It is discarded when 'pore.coords' is written, and is rebuilt if
+        the coordinates no longer match those it was built from, which
+        catches changes made in place (i.e. ``pn['pore.coords'][0] = 0``).
+        This check is a single comparison of the coordinates, which is far
+        quicker than building a new tree.
+
+        """
+        coords = self['pore.coords']
+        tree = self._kd.get('tree', None)
+        if (tree is None) or (tree.data.shape != coords.shape) \
+                or not np.array_equal(tree.data, coords):
+            tree = sptl.cKDTree(coords)
+            self._kd['tree'] = tree
+        return tree
+
     im = property(fget=get_incidence_matrix)
 
     am = property(fget=get_adjacency_matrix)
@@ -379,6 +422,113 @@ class Network(Domain):
 
         return temp
 
+    def get_laplacian_pattern(self):
+        r"""
+        Sparsity pattern of the Laplacian matrix in CSR format, along with
+        the map for scattering throat values into its non-zero entries
+
+        Returns
+        -------
+        pattern : dict
+            A dictionary with the following entries:
+
+            ========== ====================================================
+            key        description
+            ========== ====================================================
+            indptr     The CSR row pointer array
+            indices    The CSR column indices array
+            row        The row index of each non-zero entry
+            diag       The location in ``data`` of each pore's diagonal
+            tmap       The location in ``data`` into which each throat
+                       contributes, as a 4*Nt long array ordered as
+                       [upper, lower, diagonal of head, diagonal of tail]
+            ========== ====================================================
+
+        Notes
+        -----
+        The pattern only depends on the topology so it is computed once
+        and stored for future use. The diagonal entry of every pore is
+        included, even for isolated pores, so that it can be modified in
+        place. Use ``create_laplacian_matrix`` to obtain the Laplacian
+        for a given set of weights.
+
+        """
+        pattern = self._lm.get('pattern', None)
+        if (pattern is not None) and (pattern['tmap'].size == 4*self.Nt) \
+                and (pattern['diag'].size == self.Np):
+            return pattern
+        conns = self['throat.conns']
+        Ps = np.arange(self.Np, dtype=np.int64)
+        row = np.hstack((conns[:, 0], conns[:, 1], conns[:, 0], conns[:, 1]))
+        col = np.hstack((conns[:, 1], conns[:, 0], conns[:, 0], conns[:, 1]))
+        row = np.hstack((row, Ps)).astype(np.int64)
+        col = np.hstack((col, Ps)).astype(np.int64)
+        # Sorting by (row, col) gives the CSR ordering of the non-zeros
+        keys, inv = np.unique(row*self.Np + col, return_inverse=True)
+        rows, cols = np.divmod(keys, self.Np)
+        indptr = np.zeros(self.Np + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(rows, minlength=self.Np))
+        inv = inv.ravel()
+        pattern = {
+            'indptr': indptr,
+            'indices': cols,
+            'row': rows,
+            'diag': inv[4*self.Nt:],
+            'tmap': inv[:4*self.Nt],
+        }
+        self._lm['pattern'] = pattern
+        return pattern
+
+    def create_laplacian_matrix(self, weights=None, out=None):
+        r"""
+        Generates the weighted Laplacian matrix in CSR format
+
+        Parameters
+        ----------
+        weights : array_like, optional
+            The throat values (i.e. conductances) to enter into the matrix.
+            If Nt-long the matrix is symmetric. If Nt-by-2, the first
+            column is applied to the upper triangle and the second to the
+            lower triangle. If omitted, ones are used.
+        out : csr_matrix, optional
+            A matrix previously created by this method. If given, its
+            ``data`` array is overwritten in place instead of creating a
+            new matrix, provided its sparsity pattern is still valid.
+
+        Returns
+        -------
+        csr_matrix
+            The Laplacian matrix, which is identical to
+            ``scipy.sparse.csgraph.laplacian(am)`` where ``am`` is the
+            weighted adjacency matrix.
+
+        Notes
+        -----
+        The sparsity pattern is fetched from ``get_laplacian_pattern`` so
+        only the non-zero values are computed on each call.
+
+        """
+        if weights is None:
+            weights = np.ones((self.Nt,), dtype=float)
+        weights = np.array(weights, dtype=float)
+        if weights.shape == (self.Nt, 2):
+            g1, g2 = weights.T
+        elif weights.shape == (self.Nt,):
+            g1 = g2 = weights
+        else:
+            raise Exception('Received weights are of incorrect length')
+        pattern = self.get_laplacian_pattern()
+        vals = np.hstack((-g1, -g2, g2, g1))
+        data = np.bincount(pattern['tmap'], weights=vals,
+                           minlength=pattern['indices'].size)
+        if (out is not None) and (out.data.size == data.size):
+            out.data[:] = data
+            return out
+        A = sprs.csr_matrix((data, pattern['indices'], pattern['indptr']),
+                            shape=(self.Np, self.Np))
+        A.has_sorted_indices = True
+        return A
+
     def find_connected_pores(self, throats=[], flatten=False, mode='or'):
         r"""
         Return a list of pores connected to the given list of throats
@@ -736,9 +886,9 @@ class Network(Domain):
             num = self.find_neighbor_pores(pores, flatten=flatten,
                                            mode=mode, include_input=True)
             num = np.size(num)
-        else:   # Could be done much faster if flatten == False
-            am = self.create_adjacency_matrix(fmt="csr")
-            num = am[pores].sum(axis=1).A1
+        else:
+            am = self.get_adjacency_matrix(fmt="csr")
+            num = np.diff(am.indptr)[pores]
         return num
 
     def find_nearby_pores(self, pores, r, flatten=False, include_input=False):
@@ -795,33 +945,113 @@ class Network(Domain):
             return np.array([], dtype=np.int64)
         if r <= 0:
             raise Exception('Provided distances should be greater than 0')
-        # Create kdTree objects
-        kd = sptl.cKDTree(self['pore.coords'])
-        kd_pores = sptl.cKDTree(self['pore.coords'][pores])
-        # Perform search
-        Ps_within_r = kd_pores.query_ball_tree(kd, r=r)
-        # Remove self from each list
-        for i, P in enumerate(Ps_within_r):
-            Ps_within_r[i].remove(pores[i])
-        # Convert to flattened list by default
-        temp = np.concatenate((Ps_within_r))
-        Pn = np.unique(temp).astype(np.int64)
+        indptr, Ps = self.find_pores_within(self['pore.coords'][pores], r=r)
+        rows = np.repeat(np.arange(len(pores)), np.diff(indptr))
+        # Remove each input pore from its own list
+        keep = Ps != pores[rows]
+        Ps, rows = Ps[keep], rows[keep]
+        Pn = np.unique(Ps)
         # Remove inputs if necessary
         if include_input is False:
             Pn = Pn[~np.in1d(Pn, pores)]
-        # Convert list of lists to a list of ndarrays
+        # Split into a list of ndarrays, one per input pore
         if flatten is False:
-            if len(Pn) == 0:  # Deal with no nearby neighbors
-                Pn = [np.array([], dtype=np.int64) for i in pores]
-            else:
-                mask = np.zeros(shape=np.amax((Pn.max(), pores.max())) + 1, dtype=bool)
-                mask[Pn] = True
-                temp = []
-                for item in Ps_within_r:
-                    temp.append(np.array(item, dtype=np.int64)[mask[item]])
-                Pn = temp
+            mask = np.zeros(shape=self.Np, dtype=bool)
+            mask[Pn] = True
+            keep = mask[Ps]
+            counts = np.bincount(rows[keep], minlength=len(pores))
+            Pn = np.split(Ps[keep], np.cumsum(counts)[:-1])
         return Pn
 
+    def find_pores_within(self, coords, r):
+        r"""
+        Finds the pores within a given distance of each of the given points
+
+        Parameters
+        ----------
+        coords : array_like
+            An N-by-3 array of the points around which pores are sought
+        r : scalar
+            The distance from each point within which pores are sought
+
+        Returns
+        -------
+        indptr : ndarray
+            An (N + 1)-long array such that the pores near point ``i`` are
+            ``indices[indptr[i]:indptr[i+1]]``
+        indices : ndarray
+            The indices of the pores near each point, listed point by
+            point and in ascending order for each one
+
+        Notes
+        -----
+        The search uses the tree returned by ``get_kdtree``, so the pore
+        coordinates are only indexed once no matter how many searches are
+        performed. Each call does its search for all points at once, so
+        searching for many points in one call is much faster than making
+        one call per point. The result is in the same form as the rows of
+        a sparse matrix in CSR format, and can be converted to one with
+        ``scipy.sparse.csr_matrix((np.ones_like(indices), indices, indptr))``.
+
+        Examples
+        --------
+        >>> import openpnm as op
+        >>> pn = op.network.Cubic(shape=[3, 3, 3])
+        >>> indptr, indices = pn.find_pores_within([[0.5, 0.5, 0.5]], r=0.5)
+        >>> print(indices[indptr[0]:indptr[1]])
+        [0]
+
+        """
+        coords = np.array(coords, ndmin=2, dtype=float)
+        tree = sptl.cKDTree(coords)
+        hits = tree.sparse_distance_matrix(self.get_kdtree(), max_distance=r,
+                                           output_type='ndarray')
+        order = np.lexsort((hits['j'], hits['i']))
+        indices = hits['j'][order].astype(np.int64)
+        indptr = np.zeros(coords.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(hits['i'], minlength=coords.shape[0]),
+                  out=indptr[1:])
+        return indptr, indices
+
+    def find_nearest_pores(self, coords, k=1):
+        r"""
+        Finds the nearest pores to each of the given points
+
+        Parameters
+        ----------
+        coords : array_like
+            An N-by-3 array of the points whose nearest pores are sought
+        k : int
+            The number of pores to find for each point. The default is 1.
+
+        Returns
+        -------
+        distances : ndarray
+            An N-by-k array of the distances from each point to its
+            nearest pores, in ascending order
+        indices : ndarray
+            An N-by-k array containing the indices of the nearest pores to
+            each point
+
+        Notes
+        -----
+        This uses the tree returned by ``get_kdtree``, so the pore
+        coordinates are only indexed once no matter how many searches are
+        performed.
+
+        Examples
+        --------
+        >>> import openpnm as op
+        >>> pn = op.network.Cubic(shape=[3, 3, 3])
+        >>> d, Ps = pn.find_nearest_pores([[0.5, 0.5, 0.9]], k=2)
+        >>> print(Ps)
+        [[0 1]]
+
+        """
+        coords = np.array(coords, ndmin=2, dtype=float)
+        d, Ps = self.get_kdtree().query(coords, k=[i + 1 for i in range(k)])
+        return d, Ps.astype(np.int64)
+
     @property
     def conns(self):
         r"""Returns the connectivity matrix of the network."""
@@ -67,7 +67,7 @@ class Phase(Domain):
                 self[element + '.' + prop] = temp
             # Insert values into masked locations
             mask = self.project._get_locations(element + '.' + domain)
-            temp[mask] = value
+            temp[self._get_domain_index(element + '.' + domain, mask)] = value
 
     def __getitem__(self, key):
         try:  # If key exists, just get it
@@ -106,8 +106,9 @@ class Phase(Domain):
 
         # Finally get locs
         if domain == 'all':
-            locs = np.ones(self._count(element), dtype=bool)
-        else:
-            locs = self.project._get_locations(element + '.' + domain)
-
+            return vals.copy()
+        mask = self.project._get_locations(element + '.' + domain)
+        locs = self._get_domain_index(element + '.' + domain, mask)
+        if isinstance(locs, slice):
+            return vals.copy()
         return vals[locs]
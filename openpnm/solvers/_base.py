@@ -1,17 +1,69 @@
+import hashlib
+import numpy as np
 from numpy.linalg import norm
 
 __all__ = ['BaseSolver', 'DirectSolver', 'IterativeSolver']
 
 
 class BaseSolver:
-    """Base class for all solvers."""
-    def __init__(self):
-        ...
+    """
+    Base class for all solvers.
+
+    Parameters
+    ----------
+    cache : bool
+        If ``True`` (default), the factorization or preconditioner built
+        for the coefficient matrix is stored on the solver and reused by
+        subsequent calls to ``solve`` with the same matrix. Use
+        ``clear_cache`` to free it explicitly.
+
+    """
+    def __init__(self, cache=True):
+        self.cache = cache
+        self._cache = {}
 
     def solve(self):
         """Solves the given linear system of equations Ax=b."""
         raise NotImplementedError
 
+    def clear_cache(self):
+        """Discards any stored factorization or preconditioner."""
+        self._cache = {}
+
+    def _check_cache(self, A):
+        r"""
+        Compares ``A`` against the matrix from which the cached objects
+        were built.
+
+        Returns
+        -------
+        status : str
+            ``'hit'`` if both the sparsity pattern and the values of ``A``
+            are unchanged, ``'values'`` if only the values changed, and
+            ``'miss'`` if the pattern changed or nothing is cached yet.
+
+        Notes
+        -----
+        ``A`` must be in CSR or CSC format. The matrix is identified by a
+        fingerprint of its arrays rather than by identity since algorithms
+        overwrite the values of their matrices in place.
+
+        """
+        if not self.cache:
+            self._cache = {}
+            return 'miss'
+        pattern = _fingerprint(A.indptr, A.indices, np.array(A.shape))
+        values = _fingerprint(A.data)
+        if self._cache.get('pattern', None) != pattern:
+            status = 'miss'
+            self._cache = {}
+        elif self._cache.get('values', None) != values:
+            status = 'values'
+        else:
+            status = 'hit'
+        self._cache.update({'pattern': pattern, 'values': values})
+        return status
+
 
 class DirectSolver(BaseSolver):
     """Base class for all direct solvers."""
@@ -20,7 +72,8 @@ class DirectSolver(BaseSolver):
 
 class IterativeSolver(BaseSolver):
     """Base class for iterative solvers."""
-    def __init__(self, tol=1e-8, maxiter=1000):
+    def __init__(self, tol=1e-8, maxiter=1000, cache=True):
+        super().__init__(cache=cache)
         self.tol = tol
         self.maxiter = maxiter
         self.atol = None        # needs to be evaluated later
@@ -61,3 +114,11 @@ class IterativeSolver(BaseSolver):
             ``res = norm(A*x - b)``
         """
         return norm(A * x - b)
+
+
+def _fingerprint(*arrays):
+    r"""Returns a hash of the raw bytes of the given arrays."""
+    h = hashlib.blake2b(digest_size=16)
+    for arr in arrays:
+        h.update(np.ascontiguousarray(arr).view(np.uint8))
+    return h.digest()
@@ -208,14 +208,23 @@ class PETScLinearSolver(IterativeSolver):
         self.preconditioner = precondioner
 
         self.atol = self._get_atol(self.b)
-        self.rtol = self._get_rtol(self.x0)
+        self.rtol = self._get_rtol(self.A, self.b, self.x0)
 
         self._assemble_b_and_x()
-        self._assemble_A()
-
-        self._create_solver()
+        # Reuse the KSP (and its factorization/preconditioner) if cached
+        status = self._check_cache(self.A)
+        key = (solver_type, precondioner)
+        if (status == 'miss') or (self._cache.get('key', None) != key):
+            self._destroy_cache()
+            self._cache['key'] = key
+            self._assemble_A()
+            self._create_solver()
+            self.ksp.setOperators(self.petsc_A)
+        elif status == 'values':
+            PETSc.Mat.destroy(self.petsc_A)
+            self._assemble_A()
+            self.ksp.setOperators(self.petsc_A)
         self._set_tolerances(atol=atol, rtol=rtol, maxiter=maxiter)
-        self.ksp.setOperators(self.petsc_A)
         self.ksp.setFromOptions()
 
         # Solve the linear system
@@ -229,14 +238,31 @@ class PETScLinearSolver(IterativeSolver):
         # Convert solution vector from PETSc.Vec instance to a numpy array
         self.solution = PETSc.Vec.getArray(self.petsc_s)
 
-        # Destroy petsc solver, coefficients matrix, rhs, and solution vectors
-        PETSc.KSP.destroy(self.ksp)
-        PETSc.Mat.destroy(self.petsc_A)
+        # Destroy rhs and solution vectors, and the solver and coefficients
+        # matrix too unless they're being cached
         PETSc.Vec.destroy(self.petsc_b)
         PETSc.Vec.destroy(self.petsc_x)
         PETSc.Vec.destroy(self.petsc_s)
+        if not self.cache:
+            self._destroy_cache()
 
         # FIXME: fetch exit_code somehow from petsc
         exit_code = 0
 
         return self.solution, exit_code
+
+    def clear_cache(self):
+        """Destroys the stored PETSc solver and coefficients matrix."""
+        self._destroy_cache()
+        super().clear_cache()
+
+    def _destroy_cache(self):
+        r"""
+        Destroys the petsc solver and coefficients matrix to free memory.
+        """
+        if getattr(self, 'ksp', None) is not None:
+            PETSc.KSP.destroy(self.ksp)
+            self.ksp = None
+        if getattr(self, 'petsc_A', None) is not None:
+            PETSc.Mat.destroy(self.petsc_A)
+            self.petsc_A = None
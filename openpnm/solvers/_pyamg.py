@@ -7,10 +7,37 @@ __all__ = ['PyamgRugeStubenSolver']
 
 # write a PyamgRugeStubenSolver class
 class PyamgRugeStubenSolver(IterativeSolver):
-    """Brief description of 'PyamgRugeStubenSolver'"""
+    """
+    Solves a linear system using the Ruge-Stuben algebraic multigrid
+    solver from ``pyamg``.
+
+    Notes
+    -----
+    When ``cache`` is ``True`` the multilevel hierarchy is stored and
+    reused as long as ``A`` is unchanged. If only the values of ``A``
+    changed (e.g. between Newton iterations), the stored hierarchy is used
+    as a preconditioner for ``pyamg.krylov.fgmres`` on the new matrix, and
+    the hierarchy is only rebuilt if that fails to converge.
+
+    """
 
     def solve(self, A, b, x0=None):
         if not isinstance(A, csr_matrix):
             A = A.tocsr()
-        ml = pyamg.ruge_stuben_solver(A)
-        return ml.solve(b, x0=x0, tol=self.tol, maxiter=self.maxiter, return_info=True)
+        status = self._check_cache(A)
+        if status == 'miss':
+            self._cache['ml'] = pyamg.ruge_stuben_solver(A)
+            self._cache['stale'] = False
+        elif status == 'values':
+            self._cache['stale'] = True
+        if self._cache['stale']:  # Hierarchy was built for different values
+            M = self._cache['ml'].aspreconditioner()
+            x, info = pyamg.krylov.fgmres(A, b, x0=x0, tol=self.tol,
+                                          maxiter=self.maxiter, M=M)
+            if info == 0:
+                return x, info
+            self._cache['ml'] = pyamg.ruge_stuben_solver(A)
+            self._cache['stale'] = False
+        ml = self._cache['ml']
+        return ml.solve(b, x0=x0, tol=self.tol, maxiter=self.maxiter,
+                        return_info=True)
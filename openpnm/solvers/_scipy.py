@@ -1,18 +1,37 @@
 from scipy.sparse import csr_matrix, csc_matrix
-from scipy.sparse.linalg import spsolve, cg
+from scipy.sparse.linalg import spsolve, splu, cg
 from openpnm.solvers import DirectSolver, IterativeSolver
 
 __all__ = ['ScipySpsolve', 'ScipyCG']
 
 
 class ScipySpsolve(DirectSolver):
-    """Solves a linear system using ``scipy.sparse.linalg.spsolve``."""
+    """
+    Solves a linear system using ``scipy.sparse.linalg.spsolve``.
+
+    Notes
+    -----
+    When ``cache`` is ``True`` the LU factorization of ``A`` is computed
+    with ``scipy.sparse.linalg.splu`` and reused for as long as ``A`` is
+    unchanged, so only the forward/backward substitutions are performed
+    when solving for new right-hand sides.
+
+    """
 
     def solve(self, A, b, **kwargs):
         """Solves the given linear system of equations Ax=b."""
-        if not isinstance(A, (csr_matrix, csc_matrix)):
-            A = A.tocsr()
-        return (spsolve(A, b), 0)
+        if not self.cache:
+            if not isinstance(A, (csr_matrix, csc_matrix)):
+                A = A.tocsr()
+            return (spsolve(A, b), 0)
+        if not isinstance(A, csc_matrix):
+            A = A.tocsc()
+        if self._check_cache(A) != 'hit':
+            # Sort a copy, the caller's matrix is left as it is
+            if not A.has_sorted_indices:
+                A = A.sorted_indices()
+            self._cache['lu'] = splu(A)
+        return (self._cache['lu'].solve(b), 0)
 
 
 class ScipyCG(IterativeSolver):
@@ -1,6 +1,5 @@
 import logging
 import numpy as np
-import scipy as sp
 from scipy.spatial import cKDTree
 from scipy.sparse import csgraph
 from scipy.spatial import ConvexHull
@@ -229,6 +228,8 @@ def trim(network, pores=[], throats=[]):
     # Clear adjacency and incidence matrices which will be out of date now
     network._am.clear()
     network._im.clear()
+    network._lm.clear()
+    network._kd.clear()
 
 
 def extend(network, coords=[], conns=[], labels=[], **kwargs):
@@ -317,6 +318,8 @@ def extend(network, coords=[], conns=[], labels=[], **kwargs):
     # Clear adjacency and incidence matrices which will be out of date now
     network._am.clear()
     network._im.clear()
+    network._lm.clear()
+    network._kd.clear()
 
 
 def label_faces(network, tol=0.0, label='surface'):
@@ -507,6 +510,8 @@ def clone_pores(network, pores, labels=['clone'], mode='parents'):
     # Clear adjacency and incidence matrices which will be out of date now
     network._am.clear()
     network._im.clear()
+    network._lm.clear()
+    network._kd.clear()
 
 
 def merge_networks(network, donor=[]):
@@ -585,6 +590,8 @@ def merge_networks(network, donor=[]):
     # Clear adjacency and incidence matrices which will be out of date now
     network._am.clear()
     network._im.clear()
+    network._lm.clear()
+    network._kd.clear()
 
 
 def stitch(network, donor, P_network, P_donor, method='nearest',
@@ -643,24 +650,25 @@ def stitch(network, donor, P_network, P_donor, method='nearest',
     N_init = {}
     N_init['pore'] = network.Np
     N_init['throat'] = network.Nt
+    if method not in ['nearest', 'radius']:
+        raise Exception('<{}> method not supported'.format(method))
+    P1 = np.array(P_network, ndmin=1)
+    P2 = np.array(P_donor, ndmin=1) + N_init['pore']  # Increment pores on donor
+    # Search trees instead of computing all the distances between P1 and P2
+    tree1 = cKDTree(network['pore.coords'][P_network])
+    tree2 = cKDTree(donor['pore.coords'][P_donor])
     if method == 'nearest':
-        P1 = P_network
-        P2 = P_donor + N_init['pore']  # Increment pores on donor
-        C1 = network['pore.coords'][P_network]
-        C2 = donor['pore.coords'][P_donor]
-        D = sp.spatial.distance.cdist(C1, C2)
-        [P1_ind, P2_ind] = np.where(D == D.min(axis=0))
-        conns = np.vstack((P1[P1_ind], P2[P2_ind])).T
+        # Connect each donor pore to all the pores tied for nearest to it
+        D = tree1.query(tree2.data, k=1)[0]
+        hits = tree1.query_ball_point(tree2.data, r=D*(1 + 1e-12))
+        P2_ind = np.repeat(np.arange(len(P2)), [len(h) for h in hits])
+        P1_ind = np.concatenate(list(hits) + [[]]).astype(int)
     elif method == 'radius':
-        P1 = P_network
-        P2 = P_donor + N_init['pore']  # Increment pores on donor
-        C1 = network['pore.coords'][P_network]
-        C2 = donor['pore.coords'][P_donor]
-        D = sp.spatial.distance.cdist(C1, C2)
-        [P1_ind, P2_ind] = np.where(D <= len_max)
-        conns = np.vstack((P1[P1_ind], P2[P2_ind])).T
-    else:
-        raise Exception('<{}> method not supported'.format(method))
+        hits = tree1.sparse_distance_matrix(tree2, max_distance=len_max,
+                                            output_type='ndarray')
+        P1_ind, P2_ind = hits['i'], hits['j']
+    order = np.lexsort((P2_ind, P1_ind))
+    conns = np.vstack((P1[P1_ind[order]], P2[P2_ind[order]])).T
 
     merge_networks(network, donor)
 
@@ -15,12 +15,14 @@ __all__ = [
     'PrintableDict',
     'HealthDict',
     'NestedDict',
+    'LazyArray',
     'flat_list',
     'sanitize_dict',
     'methods_to_table',
     'models_to_table',
     'ignore_warnings',
     'is_symmetric',
+    'segmented_reduce',
     'is_valid_propname',
     'is_transient',
     'get_mixture_model_args',
@@ -196,6 +198,68 @@ class NestedDict(dict):
         return p
 
 
+class LazyArray:
+    r"""
+    A placeholder for an array that is only read from disk when needed
+
+    Parameters
+    ----------
+    loader : callable
+        A function that takes no arguments and returns the array. It must
+        be picklable (e.g. a ``functools.partial`` of a module level
+        function) so that objects holding the placeholder can be saved.
+    shape : tuple
+        The shape of the array returned by ``loader``
+    dtype : dtype
+        The data type of the array returned by ``loader``
+
+    Notes
+    -----
+    OpenPNM objects store these placeholders in place of data arrays and
+    replace them with the loaded array on first access via ``__getitem__``,
+    ``items`` or ``values``. Since ``shape`` and ``dtype`` are known in
+    advance, finding the number of pores or listing the labels does not
+    trigger a read. The array is only read once, and is kept by the
+    placeholder for any further use of it.
+
+    """
+
+    def __init__(self, loader, shape, dtype):
+        self.loader = loader
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._arr = None
+
+    def __repr__(self):  # pragma: no cover
+        return f'LazyArray(shape={self.shape}, dtype={self.dtype})'
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def load(self):
+        r"""
+        Reads and returns the array
+        """
+        if self._arr is None:
+            self._arr = self.loader()
+        return self._arr
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self.load()
+        return arr if dtype is None else arr.astype(dtype)
+
+    def __getitem__(self, ind):
+        return self.load()[ind]
+
+
 class HealthDict(PrintableDict):
     r"""
     This class adds a 'health' check to a standard dictionary.
@@ -416,6 +480,78 @@ def is_symmetric(a, rtol=1e-10):
     return issym
 
 
+def segmented_reduce(values, indptr, mode='sum'):
+    r"""
+    Reduces each of the consecutive segments of an array to a single value
+
+    Parameters
+    ----------
+    values : ndarray
+        The values to reduce, with the segments laid end to end along the
+        first axis
+    indptr : ndarray
+        The start of each segment in ``values`` followed by the end of the
+        last one, as in the ``indptr`` attribute of a CSR sparse matrix
+    mode : str
+        How each segment is reduced. Options are:
+
+        ===========  =====================================================
+        mode         meaning
+        ===========  =====================================================
+        'sum'        The sum of the values, 0 for empty segments
+        'min'        The minimum value, ``inf`` for empty segments
+        'max'        The maximum value, ``-inf`` for empty segments
+        'mean'       The mean value, ``nan`` for empty segments
+        ===========  =====================================================
+
+    Returns
+    -------
+    result : ndarray
+        The reduced value of each segment. Any trailing dimensions of
+        ``values`` are kept.
+
+    Notes
+    -----
+    This uses the ``reduceat`` method of the numpy ufuncs, which works
+    through all the segments in one pass and is much faster than the
+    unbuffered ``np.add.at`` and ``np.minimum.at``. The values must be
+    sorted by segment. For pore-by-pore reductions of throat data this
+    order is given by the ``indices`` of the network's incidence matrix
+    in 'csr' format, which is cached on the network:
+
+    >>> im = network.get_incidence_matrix(fmt='csr')  # doctest: +SKIP
+    >>> vals = segmented_reduce(data[im.indices], im.indptr)  # doctest: +SKIP
+
+    The given ``values`` are not modified.
+
+    """
+    ufuncs = {'sum': np.add, 'mean': np.add,
+              'min': np.minimum, 'max': np.maximum}
+    fills = {'sum': 0, 'mean': 0, 'min': np.inf, 'max': -np.inf}
+    if mode not in ufuncs.keys():
+        raise Exception(f'Unrecognized mode: {mode}')
+    values = np.asarray(values)
+    indptr = np.asarray(indptr)
+    if values.dtype == bool:
+        values = values.astype(int)
+    counts = np.diff(indptr)
+    dtype = np.result_type(values.dtype, fills[mode])
+    result = np.full((counts.size, ) + values.shape[1:], fills[mode],
+                     dtype=dtype)
+    # reduceat gives the value at the start of an empty segment rather
+    # than nothing, so only the non-empty ones are passed to it
+    hits = counts > 0
+    if np.any(hits):
+        result[hits] = ufuncs[mode].reduceat(values[:indptr[-1]],
+                                             indptr[:-1][hits], axis=0)
+    if mode == 'mean':
+        result = result.astype(float)
+        shape = (-1, ) + (1, )*(values.ndim - 1)
+        result[hits] /= np.reshape(counts[hits], shape)
+        result[~hits] = np.nan
+    return result
+
+
 def get_mixture_model_args(
     phase,
     composition='xs',
@@ -141,7 +141,7 @@ class Workspace(dict):
         from zipfile import ZipFile
         with ZipFile(filename + '.wrk', 'w') as z:
             for prj in self.values():
-                prj.save_project()
+                self.save_project(prj)
                 z.write(prj.name + '.pnm')
 
     def load_workspace(self, filename):
@@ -188,14 +188,16 @@ class Workspace(dict):
         path object object such as that produced by ``pathlib`` or
         ``os.path`` in the Python standard library.
 
+        The file is written by ``openpnm.io.project_to_pnm``, which stores
+        the arrays in a form that can be memory mapped when loading.
+
         """
+        from openpnm.io import project_to_pnm
         if filename is None:
-            dt = datetime.now()
-            filename = dt.strftime("%Y_%m_%d_%H_%M_%S")
-        with open(filename.split('.')[-1]+'.pnm', 'wb') as f:
-            pickle.dump(project, f)
+            filename = project.name
+        project_to_pnm(project, filename=filename)
 
-    def load_project(self, filename):
+    def load_project(self, filename, mmap_mode=None):
         r"""
         Loads a Project from the specified 'pnm' file
 
@@ -207,6 +209,10 @@ class Workspace(dict):
         ----------
         filename : str or Path
             The name of the file to open. See Notes for more information.
+        mmap_mode : str, optional
+            If given, the arrays are memory mapped from the file instead of
+            being read into memory. Use 'r' for read-only access or 'c' for
+            copy-on-write. See ``openpnm.io.project_from_pnm`` for details.
 
         See Also
         --------
@@ -221,7 +227,14 @@ class Workspace(dict):
         path object object such as that produced by ``pathlib`` or
         ``os.path`` in the Python standard library.
 
+        Files pickled by earlier versions can still be loaded, but cannot
+        be memory mapped.
+
         """
+        from zipfile import is_zipfile
+        from openpnm.io import project_from_pnm
+        if is_zipfile(filename):
+            return project_from_pnm(filename, mmap_mode=mmap_mode)
         with open(filename, 'rb') as f:
             proj = pickle.load(f)
             proj.settings.uuid = str(uuid4())
@@ -0,0 +1,51 @@
+r"""
+Times InvasionPercolation on a large cubic lattice.
+
+The default shape of 150 x 150 x 150 gives about 3.4 million pores and 10
+million throats. A different size can be given on the command line, for
+instance ``python benchmark_invasion_percolation.py 50``. The first call to
+``run`` includes numba's compilation, so it is done on a small network
+first and excluded from the timings.
+
+"""
+import sys
+import time
+import numpy as np
+import openpnm as op
+
+
+op.Workspace().settings['loglevel'] = 40
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+np.random.seed(0)
+
+
+def setup(shape):
+    pn = op.network.Cubic(shape=shape)
+    pn['pore.volume'] = np.random.rand(pn.Np)
+    pn['throat.volume'] = np.random.rand(pn.Nt)
+    nwp = op.phase.Phase(network=pn)
+    nwp['throat.entry_pressure'] = np.random.rand(pn.Nt)
+    ip = op.algorithms.InvasionPercolation(network=pn, phase=nwp)
+    ip.set_inlet_BC(pores=pn.pores('left'))
+    return pn, ip
+
+
+# Trigger the jit compilation
+setup([5, 5, 5])[1].run()
+
+tic = time.perf_counter()
+pn, ip = setup([N, N, N])
+print(f'Network with {pn.Np} pores and {pn.Nt} throats '
+      f'built in {time.perf_counter() - tic:.2f} s')
+
+tic = time.perf_counter()
+ip.run(n_steps=pn.Nt//2)
+print(f'First half of the invasion took {time.perf_counter() - tic:.2f} s')
+tic = time.perf_counter()
+ip.run()
+print(f'Remainder of the invasion took {time.perf_counter() - tic:.2f} s')
+assert ip['throat.invasion_sequence'].max() == pn.Nt
+
+tic = time.perf_counter()
+pc = ip.pc_curve()
+print(f'Capillary pressure curve took {time.perf_counter() - tic:.2f} s')
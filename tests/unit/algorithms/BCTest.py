@@ -129,6 +129,38 @@ class BCTest:
         assert np.isfinite(fd['pore.bc.value']).sum() == 0
         assert np.isfinite(fd['pore.bc.rate']).sum() == 0
 
+    def test_changing_BCs_updates_A_and_b(self):
+        fd = op.algorithms.FickianDiffusion(network=self.pn, phase=self.air)
+        fd.set_value_BC(pores=self.pn.pores('left'), values=1.0)
+        fd.set_value_BC(pores=self.pn.pores('right'), values=0.0)
+        fd.run()
+        fd.set_value_BC(pores=self.pn.pores('right'), mode='remove')
+        fd.set_rate_BC(pores=self.pn.pores('right'), rates=1e-12)
+        fd._update_A_and_b()
+        fd2 = op.algorithms.FickianDiffusion(network=self.pn, phase=self.air)
+        fd2.set_value_BC(pores=self.pn.pores('left'), values=1.0)
+        fd2.set_rate_BC(pores=self.pn.pores('right'), rates=1e-12)
+        fd2._update_A_and_b()
+        np.testing.assert_allclose(fd.A.toarray(), fd2.A.toarray())
+        np.testing.assert_allclose(fd.b, fd2.b)
+
+    def test_changing_BCs_in_place_updates_A_and_b(self):
+        left, right = self.pn.pores('left'), self.pn.pores('right')
+        fd = op.algorithms.FickianDiffusion(network=self.pn, phase=self.air)
+        fd.set_value_BC(pores=left, values=1.0)
+        fd.set_rate_BC(pores=right, rates=1e-12)
+        fd.run()
+        fd['pore.bc.value'][right] = 0.0
+        fd['pore.bc.rate'][right] = np.nan
+        fd.run()
+        fd2 = op.algorithms.FickianDiffusion(network=self.pn, phase=self.air)
+        fd2.set_value_BC(pores=left, values=1.0)
+        fd2.set_value_BC(pores=right, values=0.0)
+        fd2.run()
+        np.testing.assert_allclose(fd.A.toarray(), fd2.A.toarray())
+        np.testing.assert_allclose(fd.b, fd2.b)
+        np.testing.assert_allclose(fd.x, fd2.x)
+
 
 if __name__ == "__main__":
     t = BCTest()
@@ -22,6 +22,47 @@ class DrainageTest:
         # plt.imshow((drn['pore.invasion_pressure'] +
         #             20000*self.pn['pore.left']).reshape([10, 10]), origin='lower')
 
+    def test_run_exact_pressures(self):
+        drn = op.algorithms.Drainage(network=self.pn, phase=self.air)
+        drn.set_inlet_BC(pores=self.pn.pores('left'), mode='add')
+        drn.run(pressures=None)
+        entry = self.air['throat.entry_pressure']
+        Tp = drn['throat.invasion_pressure']
+        assert np.all(Tp >= entry)
+        assert np.all(np.isin(Tp[np.isfinite(Tp)], entry))
+        # Each throat is invaded at the first given pressure at or above
+        # its exact invasion pressure
+        pressures = np.linspace(0, 50000, 37)
+        drn2 = op.algorithms.Drainage(network=self.pn, phase=self.air)
+        drn2.set_inlet_BC(pores=self.pn.pores('left'), mode='add')
+        drn2.run(pressures=pressures)
+        ind = np.searchsorted(pressures, Tp)
+        assert np.all(drn2['throat.invasion_pressure'] == pressures[ind])
+        assert np.all(drn2['throat.invasion_sequence'] == ind)
+
+    def test_run_skips_nan_pressures(self):
+        pressures = np.array([np.nan, 2000, np.nan, 8000, 50000])
+        drn = op.algorithms.Drainage(network=self.pn, phase=self.air)
+        drn.set_inlet_BC(pores=self.pn.pores('left'), mode='add')
+        drn.run(pressures=pressures)
+        drn2 = op.algorithms.Drainage(network=self.pn, phase=self.air)
+        drn2.set_inlet_BC(pores=self.pn.pores('left'), mode='add')
+        drn2.run(pressures=pressures[[1, 3, 4]])
+        for item in ['pore', 'throat']:
+            Pc = drn[f'{item}.invasion_pressure']
+            assert not np.any(np.isnan(Pc))
+            assert np.all(Pc == drn2[f'{item}.invasion_pressure'])
+            # The sequence refers to the position in the given pressures
+            seq = drn[f'{item}.invasion_sequence'][np.isfinite(Pc)]
+            assert np.all(pressures[seq] == Pc[np.isfinite(Pc)])
+        # A zero entry pressure gives nans in the automatic pressure points
+        entry = self.air['throat.entry_pressure'].copy()
+        self.air['throat.entry_pressure'][0] = 0.0
+        drn.set_outlet_BC(pores=self.pn.pores('right'), mode='add')
+        drn.run(pressures=10)
+        assert not np.any(np.isnan(drn['pore.invasion_pressure']))
+        self.air['throat.entry_pressure'] = entry
+
     def test_pccurve(self):
         drn = op.algorithms.Drainage(network=self.pn, phase=self.air)
         drn.set_inlet_BC(pores=self.pn.pores('left'), mode='add')
@@ -46,6 +87,37 @@ class DrainageTest:
         data = drn.pc_curve(np.linspace(0, 50000, 10))
         assert max(data[1]) < 1.0
 
+    def test_trapped_pores_are_not_connected_to_outlets(self):
+        drn = op.algorithms.Drainage(network=self.pn, phase=self.air)
+        drn.set_inlet_BC(pores=self.pn.pores('left'), mode='add')
+        drn.run(pressures=None)
+        pseq = drn['pore.invasion_pressure'].copy()
+        drn.set_outlet_BC(pores=self.pn.pores('right'), mode='add')
+        drn.apply_trapping()
+        assert drn['pore.trapped'].sum() > 0
+        # At the pressure just below each trapped pore's invasion pressure,
+        # its cluster of uninvaded pores contains no outlets
+        conns = self.pn.conns
+        for pore in np.where(drn['pore.trapped'])[0]:
+            p = pseq[pseq < pseq[pore]].max()
+            s, b = op._skgraph.simulations.site_percolation(
+                conns=conns, occupied_sites=pseq > p)
+            assert not np.any(s[self.pn.pores('right')] == s[pore])
+        # Throats next to trapped pores which were invaded last are trapped
+        last = conns[np.arange(self.pn.Nt), np.argmax(pseq[conns], axis=1)]
+        assert np.all(drn['throat.trapped'][drn['pore.trapped'][last]])
+
+    def test_apply_trapping_with_nan_and_inf_pressures(self):
+        drn = op.algorithms.Drainage(network=self.pn, phase=self.air)
+        drn.set_inlet_BC(pores=self.pn.pores('left'), mode='add')
+        drn.run(pressures=None)
+        drn['pore.invasion_pressure'][[5, 15]] = np.nan
+        drn['pore.invasion_pressure'][[25, 35]] = np.inf
+        drn.set_outlet_BC(pores=self.pn.pores('right'), mode='add')
+        drn.apply_trapping()  # Used to never return when nans were present
+        assert drn['pore.trapped'].sum() > 0
+        assert not np.any(drn['pore.trapped'][[5, 15]])
+
 
 if __name__ == "__main__":
 
@@ -212,6 +212,23 @@ class TransportTest:
         nt.assert_allclose(rate_individual, [0, 3.5, 0.4, -12], atol=1e-10)
         nt.assert_allclose(rate_net, sum([0, 3.5, 0.4, -12]))
 
+    def test_rate_matches_accumulated_throat_rates(self):
+        alg = op.algorithms.Transport(network=self.net,
+                                      phase=self.phase)
+        alg.settings['conductance'] = 'throat.diffusive_conductance'
+        alg.settings['quantity'] = 'pore.mole_fraction'
+        alg.set_value_BC(pores=self.net.pores('left'), values=1.0)
+        alg.set_value_BC(pores=self.net.pores('right'), values=0.0)
+        alg.run()
+        g = self.phase['throat.diffusive_conductance']
+        P12 = self.net['throat.conns']
+        Qt = g*(alg.x[P12[:, 1]] - alg.x[P12[:, 0]])
+        Qp = np.zeros(self.net.Np)
+        np.add.at(Qp, P12[:, 0], -Qt)
+        np.add.at(Qp, P12[:, 1], Qt)
+        nt.assert_allclose(alg.rate(pores=self.net.Ps, mode='single'), Qp,
+                           atol=1e-12)
+
     # def test_rate_Nt_by_2_conductance(self):
     #     net = op.network.Cubic(shape=[1, 6, 1])
     #     net.add_model_collection(
@@ -374,6 +391,72 @@ class TransportTest:
         with pytest.raises(KeyError):
             alg['pore.source_blah'] == {}
 
+    def test_run_batch(self):
+        alg = op.algorithms.Transport(network=self.net, phase=self.phase)
+        alg.settings['conductance'] = 'throat.diffusive_conductance'
+        alg.settings['quantity'] = 'pore.mole_fraction'
+        Pin, Pout = self.net.pores('top'), self.net.pores('bottom')
+        values = np.ones((3, self.net.Np))*np.nan
+        values[:, Pout] = 0.0
+        values[:2, Pin] = [[1.0], [2.0]]
+        values[2, self.net.pores('left')] = 1.0
+        values[2, Pout] = np.nan
+        values[2, self.net.pores('right')] = 0.0
+        alg.run_batch(values=values, solver=op.solvers.ScipySpsolve())
+        X = alg.soln['pore.mole_fraction']
+        assert X.shape == (self.net.Np, 3)
+        R = alg.rate(pores=Pin)
+        assert R.shape == (3, )
+        nt.assert_allclose(R[1], 2*R[0])
+        # BCs on the algorithm are left untouched
+        assert np.isfinite(alg['pore.bc.value']).sum() == 0
+        # Compare against individual runs
+        for i in range(3):
+            alg.set_BC(bctype='value', mode='remove')
+            Ps = np.where(np.isfinite(values[i]))[0]
+            alg.set_value_BC(pores=Ps, values=values[i][Ps])
+            alg.run()
+            nt.assert_allclose(alg.x, X[:, i], atol=1e-10)
+
+    def test_run_batch_with_b(self):
+        alg = op.algorithms.Transport(network=self.net, phase=self.phase)
+        alg.settings['conductance'] = 'throat.diffusive_conductance'
+        alg.settings['quantity'] = 'pore.mole_fraction'
+        alg.set_value_BC(pores=self.net.pores('top'), values=1)
+        alg.set_value_BC(pores=self.net.pores('bottom'), values=0)
+        alg.run()
+        x = alg.x.copy()
+        b = np.vstack((alg.b, 3*alg.b)).T
+        alg.run_batch(b=b, solver=op.solvers.ScipyCG())
+        nt.assert_allclose(alg.x[:, 0], x, rtol=1e-6)
+        nt.assert_allclose(alg.x[:, 1], 3*x, rtol=1e-6)
+        # A single vector is a batch of one, not a batch of Np scalars
+        alg.run_batch(b=b[:, 0], solver=op.solvers.ScipySpsolve())
+        assert alg.x.shape == (self.net.Np, 1)
+        nt.assert_allclose(alg.x[:, 0], x, rtol=1e-6)
+        with pytest.raises(Exception):
+            alg.run_batch(b=alg.b[:-1])
+
+    def test_run_batch_finds_BC_locations_once_per_group(self):
+        alg = op.algorithms.Transport(network=self.net, phase=self.phase)
+        alg.settings['conductance'] = 'throat.diffusive_conductance'
+        alg.settings['quantity'] = 'pore.mole_fraction'
+        values = np.ones((4, self.net.Np))*np.nan
+        values[:, self.net.pores('bottom')] = 0.0
+        values[:, self.net.pores('top')] = [[1.0], [2.0], [3.0], [4.0]]
+        found = []
+        update = alg._update_A_and_b
+
+        def spy():
+            update()
+            found.append(alg._BC_locs)
+        alg._update_A_and_b = spy
+        alg.run_batch(values=values, solver=op.solvers.ScipySpsolve())
+        assert len(found) == 4
+        assert all(locs is found[0] for locs in found)
+        R = alg.rate(pores=self.net.pores('top'))
+        nt.assert_allclose(R, R[0]*np.arange(1, 5))
+
     def teardown_class(self):
         ws = op.Workspace()
         ws.clear()
@@ -42,13 +42,41 @@ class IPTest:
         alg.run()
         assert alg["throat.invasion_sequence"].max() == alg.Nt
 
-    # def test_multiple_calls_to_run(self):
-    #     alg = op.algorithms.InvasionPercolation(network=self.net, phase=self.water)
-    #     alg.set_inlet_BC(pores=self.net.pores("top"))
-    #     alg.run(n_steps=10)
-    #     assert alg['pore.invasion_sequence'].max() == 10
-    #     alg.run(n_steps=10)
-    #     assert alg['pore.invasion_sequence'].max() == 20
+    def test_multiple_calls_to_run(self):
+        alg = op.algorithms.InvasionPercolation(network=self.net, phase=self.water)
+        alg.set_inlet_BC(pores=self.net.pores("top"))
+        alg.run(n_steps=10)
+        assert alg['throat.invasion_sequence'].max() == 10
+        alg.run(n_steps=10)
+        assert alg['throat.invasion_sequence'].max() == 20
+        alg.run()
+        ref = op.algorithms.InvasionPercolation(network=self.net, phase=self.water)
+        ref.set_inlet_BC(pores=self.net.pores("top"))
+        ref.run()
+        assert np.all(alg['throat.invasion_sequence']
+                      == ref['throat.invasion_sequence'])
+        assert np.all(alg['pore.invasion_sequence']
+                      == ref['pore.invasion_sequence'])
+        # Resetting the inlets starts the invasion over
+        alg.set_inlet_BC(pores=self.net.pores("top"), mode='overwrite')
+        alg.run(n_steps=5)
+        assert alg['throat.invasion_sequence'].max() == 5
+
+    def test_run_stopping_criteria(self):
+        alg = op.algorithms.InvasionPercolation(network=self.net, phase=self.water)
+        alg.set_inlet_BC(pores=self.net.pores("top"))
+        pmax = np.percentile(self.water['throat.entry_pressure'], 10)
+        alg.run(max_pressure=pmax)
+        Ts = alg['throat.invasion_sequence'] > 0
+        assert Ts.sum() > 0
+        assert np.all(self.water['throat.entry_pressure'][Ts] <= pmax)
+        assert np.all(np.isinf(alg['throat.invasion_pressure'][~Ts]))
+        snwp = alg.pc_curve().snwp.max()
+        assert snwp < 0.5
+        alg.run(target_saturation=0.5)
+        snwp = alg.pc_curve().snwp.max()
+        assert snwp >= 0.5
+        assert snwp < 0.51
 
     def test_results(self):
         alg = op.algorithms.InvasionPercolation(network=self.net, phase=self.water)
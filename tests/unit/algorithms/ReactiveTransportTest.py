@@ -1,4 +1,5 @@
 import pytest
+import logging
 import openpnm as op
 import numpy as np
 from openpnm.models.physics import source_terms
@@ -118,6 +119,29 @@ class ReactiveTransportTest:
         self.alg.set_source(pores=self.net.pores('left'), propname='pore.reaction')
         assert "pore.reaction" in self.alg.iterative_props
 
+    def test_iterative_props_cache_is_refreshed(self):
+        net = op.network.Cubic(shape=[3, 3, 1])
+        phase = op.phase.Phase(network=net)
+        phase['pore.A'] = 1.0
+        alg = op.algorithms.ReactiveTransport(network=net, phase=phase)
+        alg.settings['quantity'] = 'pore.foo'
+        assert alg.iterative_props == []
+        # Adding a model that depends on quantity
+        phase.add_model(propname='pore.bar', model=lambda target, x: x,
+                        x='pore.foo', regen_mode='deferred')
+        assert alg.iterative_props == ['pore.bar']
+        # Modifying the returned list should not affect the cache
+        alg.iterative_props.append('pore.baz')
+        assert alg.iterative_props == ['pore.bar']
+        # Changing quantity or variable_props
+        alg.settings['quantity'] = 'pore.A'
+        assert alg.iterative_props == []
+        alg.settings['variable_props'].add('pore.foo')
+        assert alg.iterative_props == ['pore.foo', 'pore.bar']
+        # Deleting the model
+        del phase.models['pore.bar@all']
+        assert alg.iterative_props == []
+
     def test_quantity_relaxation_consistency_w_base_solution(self):
         self.alg['pore.bc.rate'] = np.nan
         self.alg['pore.bc.value'] = np.nan
@@ -189,6 +213,78 @@ class ReactiveTransportTest:
             raise Exception
         self.alg.settings['newton_maxiter'] = 5000
 
+    def test_newton_matches_picard(self):
+        self.alg['pore.bc.rate'] = np.nan
+        self.alg['pore.bc.value'] = np.nan
+        self.alg.pop('pore.source', None)
+        self.alg.settings._update({'conductance': 'throat.diffusive_conductance',
+                                   'quantity': 'pore.concentration',
+                                   'relaxation_factor': 1.0})
+        self.alg.set_source(pores=self.net.pores('bottom'), propname='pore.reaction')
+        self.alg.set_value_BC(pores=self.net.pores('top'), values=1.0)
+        self.alg.run()
+        c_picard = self.alg['pore.concentration'].copy()
+        self.alg.settings['nonlinear_solver'] = 'newton'
+        self.alg.run()
+        self.alg.settings['nonlinear_solver'] = 'picard'
+        assert self.alg.soln.is_converged
+        assert_allclose(self.alg['pore.concentration'], c_picard, rtol=1e-5)
+
+    def test_newton_with_variable_conductance(self):
+        net = op.network.Cubic(shape=[5, 5, 1])
+        phase = op.phase.Phase(network=net)
+        phase['pore.concentration'] = 0.0
+
+        def g_var(phase, X='pore.concentration'):
+            X = phase[X][phase.network.conns]
+            return 1e-15 * (1 + 3 * X[:, 0]**2 + X[:, 1])
+
+        phase.add_model(propname='throat.diffusive_conductance', model=g_var)
+        phase['pore.A'] = -1e-14
+        phase['pore.k'] = 3
+        phase.add_model(propname='pore.reaction',
+                        model=source_terms.standard_kinetics,
+                        prefactor='pore.A', exponent='pore.k',
+                        X='pore.concentration', regen_mode='deferred')
+        iters, solns = [], []
+        for method in ['picard', 'newton']:
+            alg = op.algorithms.ReactiveTransport(network=net, phase=phase)
+            alg.settings._update({'conductance': 'throat.diffusive_conductance',
+                                  'quantity': 'pore.concentration',
+                                  'nonlinear_solver': method,
+                                  'relaxation_factor': 0.5})
+            alg.set_source(pores=net.pores('left'), propname='pore.reaction')
+            alg.set_value_BC(pores=net.pores('right'), values=1.0)
+            alg.run()
+            assert alg.soln.is_converged
+            iters.append(alg.soln.num_iter)
+            solns.append(alg.x.copy())
+        assert iters[1] < iters[0]
+        assert_allclose(solns[1], solns[0], rtol=1e-5)
+
+    def test_newton_warns_if_line_search_fails(self, caplog):
+        self.alg['pore.bc.rate'] = np.nan
+        self.alg['pore.bc.value'] = np.nan
+        self.alg.pop('pore.source', None)
+        self.alg.settings._update({'conductance': 'throat.diffusive_conductance',
+                                   'quantity': 'pore.concentration',
+                                   'nonlinear_solver': 'newton',
+                                   'newton_maxiter': 2})
+        self.alg.set_source(pores=self.net.pores('bottom'), propname='pore.reaction')
+        self.alg.set_value_BC(pores=self.net.pores('top'), values=1.0)
+        # A Jacobian of the wrong sign gives steps that increase the residual
+        get_jacobian = self.alg._get_jacobian
+        self.alg._get_jacobian = lambda: -get_jacobian()
+        try:
+            with caplog.at_level(logging.WARNING):
+                self.alg.run()
+        finally:
+            del self.alg._get_jacobian
+            self.alg.settings._update({'nonlinear_solver': 'picard',
+                                       'newton_maxiter': 5000})
+        assert 'line search failed' in caplog.text
+        assert not self.alg.soln.is_converged
+
     # def test_variable_conductance(self):
     #     self.alg.reset(bcs=True, source_terms=True)
 
@@ -44,6 +44,51 @@ class SolversTest:
         nt.assert_allclose(x.mean(), 0.624134, rtol=1e-5)
 
 
+    def test_scipy_spsolve_reuses_factorization(self):
+        solver = op.solvers.ScipySpsolve()
+        self.alg.run(solver=solver)
+        lu = solver._cache['lu']
+        x1 = self.alg['pore.x'].copy()
+        self.alg.run(solver=solver)
+        assert solver._cache['lu'] is lu
+        nt.assert_allclose(self.alg['pore.x'], x1)
+        # Different values in A must trigger a new factorization
+        A = self.alg.A.copy()
+        A.data *= 2.0
+        x, _ = solver.solve(A, self.alg.b)
+        assert solver._cache['lu'] is not lu
+        nt.assert_allclose(A @ x, self.alg.b, rtol=1e-8, atol=1e-12)
+        solver.clear_cache()
+        assert solver._cache == {}
+
+    def test_scipy_spsolve_leaves_A_unsorted(self):
+        solver = op.solvers.ScipySpsolve()
+        A = self.alg.A.tocsc()
+        # Reverse the order of the indices within each column
+        for i in range(A.shape[1]):
+            sl = slice(A.indptr[i], A.indptr[i+1])
+            A.indices[sl], A.data[sl] = A.indices[sl][::-1], A.data[sl][::-1]
+        A.has_sorted_indices = False
+        indices = A.indices.copy()
+        x, _ = solver.solve(A, self.alg.b)
+        nt.assert_array_equal(A.indices, indices)
+        nt.assert_allclose(A @ x, self.alg.b, rtol=1e-8, atol=1e-12)
+
+    def test_pyamg_reuses_hierarchy_when_values_change(self):
+        solver = op.solvers.PyamgRugeStubenSolver()
+        A, b = self.alg.A.copy(), self.alg.b
+        solver.solve(A, b)
+        ml = solver._cache['ml']
+        A.data[A.data < 0] *= 1.1
+        x, info = solver.solve(A, b)
+        assert info == 0
+        assert solver._cache['ml'] is ml
+        nt.assert_allclose(A @ x, b, rtol=1e-6, atol=1e-6)
+        # Solving again with the same A must not use the stale hierarchy
+        x, info = solver.solve(A, 2*b)
+        nt.assert_allclose(A @ x, 2*b, rtol=1e-6, atol=1e-6)
+
+
 if __name__ == '__main__':
     t = SolversTest()
     t.setup_class()
@@ -34,6 +34,22 @@ class TransientFickianDiffusionTest:
         actual = self.alg.x.mean()
         assert_allclose(actual, desired, rtol=1e-5)
 
+    def test_A_and_b_built_once_for_linear_problems(self):
+        alg = op.algorithms.TransientFickianDiffusion(network=self.net,
+                                                      phase=self.phase)
+        alg.set_value_BC(pores=self.net.pores('right'), values=1)
+        alg.set_value_BC(pores=self.net.pores('left'), values=0)
+        calls = []
+
+        def _update_A_and_b():
+            calls.append(1)
+            op.algorithms.TransientFickianDiffusion._update_A_and_b(alg)
+
+        alg._update_A_and_b = _update_A_and_b
+        alg.run(x0=0, tspan=(0, 10))
+        assert len(calls) == 1
+        assert_allclose(alg.x.mean(), 0.40803, rtol=1e-5)
+
     def teardown_class(self):
         ws = op.Workspace()
         ws.clear()
@@ -1,7 +1,14 @@
+import logging
 import numpy as np
 import numpy.testing as nt
 import openpnm as op
 from scipy.interpolate import interp1d
+from scipy.sparse import diags
+
+
+def conc_dependent_conductance(phase, X='pore.concentration'):
+    X = phase[X][phase.network.conns]
+    return 1e-12*(1 + X.mean(axis=1))
 
 
 class TransientReactiveTransportTest:
@@ -89,6 +96,115 @@ class TransientReactiveTransportTest:
         # alg.settings['conductance'] = 'throat.diffusive_conductance'
         # alg.run(x0=0, tspan=(0, 1))
 
+    def test_implicit_scipy_integrators(self):
+        quantity = self.alg.settings['quantity']
+        self.alg.run(x0=0, tspan=(0, 1), saveat=0.5)
+        desired = self.alg.soln[quantity][:, -1]
+        for cls in [op.integrators.ScipyBDF, op.integrators.ScipyRadau]:
+            self.alg.run(x0=0, tspan=(0, 1), saveat=0.5, integrator=cls())
+            actual = self.alg.soln[quantity][:, -1]
+            nt.assert_allclose(actual, desired, rtol=1e-4)
+
+    def test_theta_integrators(self):
+        quantity = self.alg.settings['quantity']
+        self.alg.run(x0=0, tspan=(0, 1), saveat=0.5)
+        desired = self.alg.soln[quantity]
+        for cls in [op.integrators.BackwardEuler,
+                    op.integrators.CrankNicolson]:
+            integrator = cls(dt=1e-2)
+            self.alg.run(x0=0, tspan=(0, 1), saveat=0.5, integrator=integrator)
+            actual = self.alg.soln[quantity]
+            nt.assert_array_equal(actual.t, desired.t)
+            nt.assert_allclose(actual, desired, atol=1e-2)
+        integrator = op.integrators.BackwardEuler(dt=1e-2, adaptive=True,
+                                                  atol=1e-4, rtol=1e-4)
+        self.alg.run(x0=0, tspan=(0, 1), saveat=0.5, integrator=integrator)
+        nt.assert_allclose(self.alg.soln[quantity], desired, atol=1e-2)
+
+    def test_theta_integrator_requires_jacobian(self):
+        integrator = op.integrators.BackwardEuler(dt=0.1)
+        with nt.assert_raises(Exception):
+            integrator.solve(lambda t, y: -y, np.ones(3), (0, 1), None)
+
+    def test_adaptive_crank_nicolson_uses_second_order_error(self):
+        def rhs(t, y):
+            return -y
+
+        def jac(t, y):
+            return diags(-np.ones_like(y))
+
+        solns = {}
+        for cls in [op.integrators.BackwardEuler,
+                    op.integrators.CrankNicolson]:
+            integrator = cls(dt=1e-2, adaptive=True, atol=1e-5, rtol=1e-5)
+            solns[cls] = integrator.solve(rhs, np.ones(3), (0, 5), None,
+                                          jac=jac)
+        be = solns[op.integrators.BackwardEuler]
+        cn = solns[op.integrators.CrankNicolson]
+        # Crank-Nicolson needs far fewer steps for at least the same accuracy
+        assert cn.t.size < be.t.size / 4
+        err = {k: abs(v[0, -1] - np.exp(-5)) for k, v in solns.items()}
+        assert err[op.integrators.CrankNicolson] < \
+            err[op.integrators.BackwardEuler]
+
+    def test_theta_integrator_warns_if_newton_fails(self, caplog):
+        def rhs(t, y):
+            return -y**3
+
+        def jac(t, y):
+            return diags(-3*y**2)
+
+        y0 = np.full(3, 10.0)
+        integrator = op.integrators.BackwardEuler(dt=0.5, maxiter=2)
+        with caplog.at_level(logging.WARNING):
+            integrator.solve(rhs, y0, (0, 1), None, jac=jac)
+        assert 'did not converge' in caplog.text
+        # The adaptive mode halves the step size instead
+        caplog.clear()
+        integrator = op.integrators.BackwardEuler(dt=0.5, maxiter=5,
+                                                  adaptive=True, atol=1e-3,
+                                                  rtol=1e-3)
+        with caplog.at_level(logging.WARNING):
+            soln = integrator.solve(rhs, y0, (0, 1), [1], jac=jac)
+        assert 'did not converge' not in caplog.text
+        nt.assert_allclose(soln[:, -1], 1/np.sqrt(2 + 1e-2), rtol=5e-2)
+
+    def test_A_and_b_cache_for_nonlinear_problems(self):
+        self.alg._reset_A_and_b_cache(maxsize=2)
+        y1, y2 = np.ones(self.alg.Np), np.linspace(0, 2, self.alg.Np)
+        self.alg._update_A_and_b_cached(y1)
+        A1, b1 = self.alg.A, self.alg.b
+        self.alg._update_A_and_b_cached(y2)
+        assert not np.array_equal(self.alg.b, b1)
+        self.alg._update_A_and_b_cached(y1.copy())
+        assert self.alg.A is A1
+        assert self.alg.b is b1
+        nt.assert_array_equal(self.alg.x, y1)
+        self.alg._update_A_and_b()
+        nt.assert_allclose(self.alg.A.toarray(), A1.toarray())
+        nt.assert_allclose(self.alg.b, b1)
+
+    def test_jacobian_after_A_and_b_cache_hit(self):
+        phase = op.phase.Phase(network=self.net)
+        phase['pore.concentration'] = 0.0
+        phase.add_model(propname='throat.diffusive_conductance',
+                        model=conc_dependent_conductance,
+                        regen_mode='deferred')
+        alg = op.algorithms.TransientReactiveTransport(network=self.net,
+                                                       phase=phase)
+        alg.settings._update({'quantity': 'pore.concentration',
+                              'conductance': 'throat.diffusive_conductance'})
+        alg.set_value_BC(pores=self.net.pores('front'), values=2)
+        alg._reset_A_and_b_cache()
+        rhs, jac = alg._build_rhs(), alg._build_jac()
+        ya, yb = np.linspace(0, 2, alg.Np), np.ones(alg.Np)*10
+        rhs(0, ya)
+        rhs(0, yb)
+        J = jac(0, ya).toarray()  # A and b come from the cache
+        nt.assert_allclose(phase['pore.concentration'], ya)
+        alg._reset_A_and_b_cache()
+        nt.assert_allclose(J, jac(0, ya).toarray())
+
     def teardown_class(self):
         ws = op.Workspace()
         ws.clear()
@@ -68,6 +68,23 @@ class BaseTest:
         a = self.net.pores(labels=[], mode='or')
         assert a.size == 0
 
+    def test_pores_three_labels_all_modes(self):
+        labels = ['top', 'left', 'front']
+        count = np.sum([self.net['pore.'+L] for L in labels], axis=0)
+        expected = {'or': count > 0, 'and': count == 3, 'xor': count == 1,
+                    'nor': count == 0, 'nand': (count > 0)*(count < 3),
+                    'xnor': count > 1}
+        for mode, mask in expected.items():
+            a = self.net.pores(labels=labels, mode=mode)
+            assert np.all(a == np.where(mask)[0])
+            assert a.dtype == int
+
+    def test_pores_sees_inplace_label_changes(self):
+        net = op.network.Cubic([3, 3, 3])
+        net['pore.left'][[10, 11]] = True
+        assert np.all(net.pores('left') == [0, 1, 2, 3, 4, 5, 6, 7, 8, 10, 11])
+        assert np.all(net.pores(['left', 'top'], mode='and') == [2, 5, 8, 11])
+
     def test_pores_asmask(self):
         a = self.net.pores(labels=['top', 'front'], mode='or', asmask=True)
         assert a.sum() == 15
@@ -824,6 +841,63 @@ class BaseTest:
         with pytest.raises(KeyError):
             pn.get_conduit_data('blah')
 
+    def test_getitem_name_returns_all_true(self):
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        a = pn['pore.'+pn.name]
+        assert a.shape == (27, ) and a.dtype == bool and np.all(a)
+        assert np.all(pn.pores(pn.name) == pn.Ps)
+        with pytest.raises(ValueError):
+            a[0] = False
+
+    def test_getitem_nested_keys_after_adding_and_removing(self):
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        pn['pore.bc.rate'] = 1.0
+        pn['pore.bc.value'] = 2.0
+        pn['pore.bcx'] = 3.0
+        assert set(pn['pore.bc'].keys()) == {'rate', 'value'}
+        del pn['pore.bc.rate']
+        pn['pore.bc.other'] = 4.0
+        assert set(pn['pore.bc'].keys()) == {'value', 'other'}
+        del pn['pore.bc']
+        with pytest.raises(KeyError):
+            pn['pore.bc']
+
+    def test_getitem_at_domain_after_label_changes(self):
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        pn['pore.vals'] = np.arange(pn.Np, dtype=float)
+        assert np.all(pn['pore.vals@left'] == pn.pores('left'))
+        # Changes made in place to the label are picked up
+        pn['pore.left'][[0, 1]] = False
+        pn['pore.left'][[9, 10]] = True
+        assert np.all(pn['pore.vals@left'] == pn.pores('left'))
+        pn['pore.vals@left'] = -1.0
+        assert np.all(pn['pore.vals'][pn.pores('left')] == -1.0)
+        assert pn['pore.vals'][0] == 0.0
+        # A domain covering all locations returns a copy
+        pn['pore.everywhere'] = True
+        a = pn['pore.vals@everywhere']
+        a[:] = 5.0
+        assert pn['pore.vals'][0] == 0.0
+
+    def test_writing_keys_resets_caches(self):
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        pn['pore.vals'] = np.arange(pn.Np, dtype=float)
+        pn['pore.vals@left']
+        assert 'pore.left' in pn._domains
+        pn['pore.bc.rate'] = 1.0
+        pn['pore.bc']
+        index = pn._key_index
+        assert index is not None
+        # Overwriting a key keeps the list of keys, adding one drops it
+        pn['pore.bc.rate'] = 2.0
+        assert pn._key_index is index
+        pn['pore.bc.value'] = 2.0
+        assert pn._key_index is None
+        # Writing a label drops the indices of its domain
+        pn['pore.left'] = pn['pore.right']
+        assert 'pore.left' not in pn._domains
+        assert np.all(pn['pore.vals@left'] == pn.pores('right'))
+
 
 if __name__ == '__main__':
 
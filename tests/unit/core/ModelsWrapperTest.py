@@ -41,6 +41,48 @@ class ModelsTest:
         e = self.net['pore.diameter'].copy()
         assert not np.any(b == e)
 
+    def test_changing_model_or_arguments_is_picked_up(self):
+        net = op.network.Cubic(shape=[3, 3, 1])
+        net['pore.a'] = 1.0
+        net['pore.b'] = 2.0
+
+        def f(target, x):
+            return target[x] * 2
+
+        def g(target, x, domain):
+            return target[x][target.pores(domain)] * 3
+
+        net.add_model(propname='pore.c', model=f, x='pore.a')
+        assert np.all(net['pore.c'] == 2.0)
+        version = net.models._version
+        net.models['pore.c@all']['x'] = 'pore.b'
+        assert net.models._version > version
+        net.regenerate_models()
+        assert np.all(net['pore.c'] == 4.0)
+        net.models['pore.c@all']['model'] = g
+        net.run_model('pore.c')
+        assert np.all(net['pore.c'] == 6.0)
+
+    def test_name_and_target_after_copying(self):
+        from copy import deepcopy
+        import pickle
+        mod = self.net.models['pore.diameter@all']
+        assert mod._models() is self.net.models
+        models = deepcopy(self.net.models)
+        assert models['pore.diameter@all']._models() is models
+        assert models['pore.diameter@all'].name == 'pore.diameter@all'
+        models = pickle.loads(pickle.dumps(self.net.models))
+        assert models['pore.diameter@all'].name == 'pore.diameter@all'
+        # The original wrapper still finds its own dict and target
+        assert mod.name == 'pore.diameter@all'
+        assert mod.target is self.net
+        # Moving a wrapper to a new key is detected
+        mod2 = deepcopy(mod)
+        self.net.models['pore.foo@all'] = mod2
+        assert mod2.name == 'pore.foo@all'
+        assert mod2.target is self.net
+        del self.net.models['pore.foo@all']
+
 
 
 
@@ -1,4 +1,5 @@
 import os
+import json
 import numpy as np
 import openpnm as op
 
@@ -33,6 +34,91 @@ class HDF5Test:
         f.close()
         os.remove(filename)
 
+    def test_project_from_hdf5(self, tmpdir):
+        fname = tmpdir.join(self.net.project.name)
+        self.net['pore.str'] = np.array(['a', 'bc'] * 4)
+        f = op.io.project_to_hdf5(project=self.net.project, filename=fname)
+        filename = f.filename
+        f.close()
+        for lazy in [True, False]:
+            proj = op.io.project_from_hdf5(filename, lazy=lazy)
+            assert proj.name != self.net.project.name
+            assert [obj.name for obj in proj] == \
+                [obj.name for obj in self.net.project]
+            net = proj.network
+            assert isinstance(net, op.network.Cubic)
+            if lazy:
+                assert isinstance(dict.__getitem__(net, 'pore.coords'),
+                                  op.utils.LazyArray)
+            assert net.Np == 8
+            assert net.Nt == 12
+            assert set(net.labels()) == set(self.net.labels())
+            for k in self.net.keys():
+                if k != 'pore.object':
+                    assert np.all(net[k] == self.net[k])
+                    assert net[k].dtype == self.net[k].dtype
+            assert isinstance(dict.__getitem__(net, 'pore.coords'), np.ndarray)
+            assert 'pore.object' not in net.keys()
+            assert np.all(proj.phases[1]['throat.bar'] == 2)
+            op.Workspace().close_project(proj)
+        del self.net['pore.str']
+        os.remove(filename)
+
+    def test_str_of_lazily_loaded_objects(self, tmpdir):
+        fname = tmpdir.join(self.net.project.name)
+        f = op.io.project_to_hdf5(project=self.net.project, filename=fname)
+        filename = f.filename
+        f.close()
+        proj = op.io.project_from_hdf5(filename, lazy=True)
+        net = proj.network
+        assert isinstance(dict.__getitem__(net, 'throat.boo'),
+                          op.utils.LazyArray)
+        # Listing props and labels only needs the dtypes
+        assert 'throat.boo' in net.props()
+        assert 'pore.left' in net.labels()
+        assert isinstance(dict.__getitem__(net, 'throat.boo'),
+                          op.utils.LazyArray)
+        # The objects print the same as when loaded eagerly
+        loaded = op.io.project_from_hdf5(filename, lazy=False)
+        for obj in proj:
+            assert str(obj).split('\n')[3:] == \
+                str(loaded[obj.name]).split('\n')[3:]
+        assert all(isinstance(v, np.ndarray) for v in net.values())
+        assert all(isinstance(v, np.ndarray) for k, v in net.items())
+        op.Workspace().close_project(proj)
+        op.Workspace().close_project(loaded)
+        os.remove(filename)
+
+    def test_lazy_array_reads_once(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return np.arange(5)
+
+        arr = op.utils.LazyArray(loader, shape=(5, ), dtype=int)
+        assert calls == []
+        assert arr[1] == 1
+        assert np.all(arr[2:4] == [2, 3])
+        assert np.all(np.array(arr) == np.arange(5))
+        assert len(calls) == 1
+
+    def test_project_to_hdf5_state_is_json(self, tmpdir):
+        fname = tmpdir.join(self.net.project.name)
+        self.net.create_adjacency_matrix(fmt='csr')
+        self.net.create_incidence_matrix(fmt='coo')
+        f = op.io.project_to_hdf5(project=self.net.project, filename=fname)
+        state = json.loads(f[self.net.name]['_state/spec'][()])
+        keys = [k for k, v in state['__items__']]
+        assert '_settings' in keys
+        # The topological matrices are rebuilt rather than stored
+        for k in ['_am', '_im']:
+            assert [v for key, v in state['__items__'] if key == k] \
+                == [{'__class__': 'builtins:dict', '__items__': []}]
+        filename = f.filename
+        f.close()
+        os.remove(filename)
+
     def test_print_hdf5(self, tmpdir):
         fname = tmpdir.join(self.net.project.name)
         f = op.io.project_to_hdf5(project=self.net.project, filename=fname)
@@ -32,6 +32,28 @@ class VTKTest:
         assert fname.is_file()
         os.remove(fname)
 
+    def test_save_and_load_network(self, tmpdir):
+        self.net['pore.rand'] = np.random.rand(self.net.Np)
+        self.net['throat.int'] = np.arange(self.net.Nt, dtype=np.int32)
+        fname = Path(tmpdir, 'test_save_vtk_2.vtp')
+        for encoding in ['raw', 'base64', 'ascii']:
+            for compress in [False, True]:
+                op.io.project_to_vtk(self.net.project, filename=fname,
+                                     encoding=encoding, compress=compress)
+                net = op.io.network_from_vtk(fname)
+                assert net.Np == self.net.Np
+                assert net.Nt == self.net.Nt
+                for k in ['pore.coords', 'throat.conns', 'pore.rand',
+                          'throat.int', 'pore.boo', 'pore.left']:
+                    assert np.all(net[k] == self.net[k])
+                assert net['pore.left'].dtype == bool
+                # Phase data and unsupported dtypes are not read back
+                assert 'pore.bar' not in net.keys()
+                assert 'pore.object' not in net.keys()
+                os.remove(fname)
+        del self.net['pore.rand']
+        del self.net['throat.int']
+
 
 if __name__ == '__main__':
     import py
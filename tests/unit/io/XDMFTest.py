@@ -1,6 +1,9 @@
 import os
+import h5py
 import numpy as np
 import openpnm as op
+import xml.etree.ElementTree as ET
+from numpy.testing import assert_allclose
 
 
 class XDMFTest:
@@ -34,6 +37,36 @@ class XDMFTest:
         os.remove(tmpdir.join('test_file.hdf'))
         os.remove(tmpdir.join('test_file.xmf'))
 
+    def test_xdmf_writer(self, tmpdir):
+        self.net['pore.volume'] = 1e-14
+        self.phase_1['throat.diffusive_conductance'] = 1e-15
+        alg = op.algorithms.TransientFickianDiffusion(network=self.net,
+                                                      phase=self.phase_1)
+        alg.set_value_BC(pores=self.net.pores('left'), values=1)
+        alg.run(x0=0, tspan=(0, 10), saveat=2)
+        desired = alg.soln['pore.concentration']
+        fname = tmpdir.join('test_writer')
+        with op.io.XdmfWriter(alg, filename=fname) as writer:
+            alg.run(x0=0, tspan=(0, 10), saveat=2, writer=writer)
+            # The xmf file is complete after each time step
+            root = ET.parse(str(tmpdir.join('test_writer.xmf'))).getroot()
+            assert len(root.findall('.//Time')) == 6
+        # Only the last time steps are kept in memory
+        assert alg.soln['pore.concentration'].shape == (self.net.Np, 2)
+        assert_allclose(alg.x, desired[:, -1], rtol=1e-4)
+        with h5py.File(tmpdir.join('test_writer.hdf'), 'r') as f:
+            assert_allclose(f['time'][:], [0, 2, 4, 6, 8, 10])
+            assert_allclose(f[writer.name][:].T, desired, rtol=1e-4,
+                            atol=1e-8)
+            assert np.all(f[self.net.name + '/pore/left'][:] == self.net['pore.left'])
+            assert self.net.name + '/pore/object' not in f
+        root = ET.parse(str(tmpdir.join('test_writer.xmf'))).getroot()
+        for item in root.findall(".//DataItem[@Format='HDF']"):
+            assert item.text.split(':')[0] == 'test_writer.hdf'
+        del self.net['pore.volume']
+        os.remove(tmpdir.join('test_writer.hdf'))
+        os.remove(tmpdir.join('test_writer.xmf'))
+
 
 if __name__ == '__main__':
     import py
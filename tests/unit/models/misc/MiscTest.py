@@ -210,6 +210,22 @@ class MiscTest:
                                               0.48484848, 0.54545455,
                                               0.57575758, 0.63636364]))
 
+    def test_neighbor_throats_does_not_change_input(self):
+        net = op.network.Cubic(shape=[2, 2, 2])
+        net['throat.values'] = np.linspace(0, 1, net.Nt)
+        net['throat.values'][0] = np.nan
+        for mode in ['min', 'max', 'mean']:
+            mods.from_neighbor_throats(net, prop='throat.values', mode=mode)
+        assert np.isnan(net['throat.values'][0])
+        assert np.all(net['throat.values'][1:] == np.linspace(0, 1, net.Nt)[1:])
+
+    def test_neighbor_pores_all_nans(self):
+        net = op.network.Cubic(shape=[3, 1, 1])
+        net['pore.values'] = [np.nan, np.nan, 1.0]
+        for mode in ['min', 'max', 'mean']:
+            a = mods.from_neighbor_pores(net, prop='pore.values', mode=mode)
+            assert np.isnan(a[0]) and (a[1] == 1.0)
+
     def test_from_neighbor_pores_min(self):
         del self.net['throat.seed']
         del self.net.models['throat.seed']
@@ -98,6 +98,27 @@ class MeniscusTest:
         #     if len(check) > 0:
         #         assert 1 == 2
 
+    def test_general_toroidal_bracket_and_chunks(self):
+        r_tor = 1e-6
+        self.phase["throat.scale_a"] = r_tor
+        self.phase["throat.scale_b"] = r_tor
+        self.net["throat.touch_length"] = 2e-6
+        f = pm.meniscus.general_toroidal
+        # Refining the maximum is more accurate than sampling
+        a = f(self.phase, mode="max", num_points=100000)
+        b = f(self.phase, mode="max", num_points=50, max_method="bracket")
+        c = f(self.phase, mode="max", num_points=1000)
+        assert np.allclose(a, b, rtol=1e-8)
+        assert np.all(b >= c)
+        # Chunking doesn't change the results
+        a = f(self.phase, mode="touch")
+        b = f(self.phase, mode="touch", chunk_size=3)
+        assert np.all(a == b)
+        a = f(self.phase, mode="men", target_Pc=1e4)
+        b = f(self.phase, mode="men", target_Pc=1e4, chunk_size=3)
+        for k in a.keys():
+            assert np.all(a[k] == b[k])
+
     def test_exceptions(self):
         r_tor = 1e-6
         self.phase["throat.scale_a"] = r_tor
@@ -1,4 +1,5 @@
 import collections
+import pytest
 import numpy as np
 import openpnm as op
 import openpnm.models.physics as pm
@@ -243,6 +244,31 @@ class GenericSourceTermTest:
         assert np.allclose(self.phase['pore.source1.S2'],
                            self.phase['pore.general.S2'])
 
+    def test_general_symbolic_cache_and_backends(self):
+        from openpnm.models.physics.source_terms import _funcs
+        y = "a*exp(b*x) + c"
+        self.phase['pore.item1'] = 0.16e-14
+        self.phase['pore.item2'] = 4
+        arg_map = {'a': 'pore.item1', 'b': 'pore.item2', 'c': 1e-15}
+        self.phase.add_model(propname='pore.general_np',
+                             model=pm.source_terms.general_symbolic,
+                             eqn=y, x='pore.mole_fraction', **arg_map)
+        key = (y, ('x', 'a', 'b', 'c'), 'numpy')
+        funcs = _funcs._symbolic_cache[key]
+        self.phase.regenerate_models(propnames='pore.general_np')
+        assert _funcs._symbolic_cache[key] is funcs
+        self.phase.add_model(propname='pore.general_nb',
+                             model=pm.source_terms.general_symbolic,
+                             eqn=y, x='pore.mole_fraction', backend='numba',
+                             **arg_map)
+        for item in ['rate', 'S1', 'S2']:
+            assert np.allclose(self.phase[f'pore.general_np.{item}'],
+                               self.phase[f'pore.general_nb.{item}'])
+        with pytest.raises(Exception):
+            pm.source_terms.general_symbolic(
+                self.phase, eqn=y, x='pore.mole_fraction', backend='foo',
+                **arg_map)
+
     def test_butler_volmer_kinetics(self):
         np.random.seed(10)
         self.net["pore.reaction_area"] = np.random.rand(self.net.Np)
@@ -193,7 +193,8 @@ class NetworkTest:
 
     def test_get_adjacency_matrix(self):
         net = op.network.Demo([4, 4, 1])
-        assert net._am == {}
+        # Neighbor queries made while building the network use the cache
+        net._am.clear()
         im = net.get_adjacency_matrix(fmt='coo')
         assert im.shape == (16, 16)
         assert im.data.shape == (48,)
@@ -203,6 +204,80 @@ class NetworkTest:
         assert len(net._am) == 2
 
 
+    def test_topology_cache_invalidated_on_write(self):
+        net = op.network.Cubic(shape=[3, 3, 1])
+        assert np.all(net.find_neighbor_pores(4) == [1, 3, 5, 7])
+        assert 'csr' in net._am.keys()
+        net['throat.conns'] = net['throat.conns'][:-1]
+        assert net._am == {}
+        assert np.all(net.find_neighbor_pores(8) == [7])
+        assert np.all(net.find_neighbor_throats(8) == [5])
+        net['pore.coords'] = net['pore.coords']
+        assert net._am == {}
+        assert net._im == {}
+        Ps = net.find_neighbor_pores([0, 4], flatten=False)
+        assert np.all(Ps[0] == [1, 3])
+        assert np.all(Ps[1] == [1, 3, 5, 7])
+        Ts = net.find_connecting_throat([0, 0, 7], [1, 4, 8])
+        assert np.all(Ts[[0, 2]] == [0, 5])
+        assert np.isnan(Ts[1])
+
+    def test_find_pores_within(self):
+        pts = self.net.coords[[0, 555]] + 0.1
+        indptr, Ps = self.net.find_pores_within(pts, r=1)
+        assert np.all(indptr == [0, 4, 8])
+        assert np.all(Ps[:4] == [0, 1, 10, 100])
+        assert np.all(Ps[4:] == [555, 556, 565, 655])
+        indptr, Ps = self.net.find_pores_within(pts, r=1e-3)
+        assert np.all(indptr == [0, 0, 0])
+        assert Ps.size == 0
+
+    def test_find_nearest_pores(self):
+        d, Ps = self.net.find_nearest_pores([[0.5, 0.5, 0.4], [9, 9, 9]], k=2)
+        assert Ps.shape == (2, 2)
+        assert np.all(Ps[0] == [0, 10])
+        assert np.allclose(d[0], [0.1, np.sqrt(1.01)])
+        assert Ps[1, 0] == 888
+
+    def test_kdtree_invalidated_on_write(self):
+        net = op.network.Cubic(shape=[3, 3, 3])
+        tree = net.get_kdtree()
+        assert net.get_kdtree() is tree
+        net['pore.coords'] = net['pore.coords'] + 10
+        assert net._kd == {}
+        assert np.all(net.find_nearest_pores([[10.5, 10.5, 10.5]])[1] == 0)
+        op.topotools.trim(net, pores=[0])
+        assert net._kd == {}
+        assert np.all(net.find_nearest_pores([[10.5, 10.5, 10.5]])[1] == 0)
+        assert np.allclose(net.coords[0], [10.5, 10.5, 11.5])
+        # Changes made in place are detected too
+        net['pore.coords'][5] = [10.5, 10.5, 10.5]
+        assert np.all(net.find_nearest_pores([[10.5, 10.5, 10.5]])[1] == 5)
+
+    def test_create_laplacian_matrix(self):
+        from scipy.sparse.csgraph import laplacian
+        net = op.network.Cubic(shape=[4, 3, 2])
+        g = np.random.rand(net.Nt)
+        am = net.create_adjacency_matrix(weights=g)
+        A = net.create_laplacian_matrix(weights=g)
+        assert A.format == 'csr'
+        np.testing.assert_allclose(A.toarray(), laplacian(am).toarray())
+        g = np.random.rand(net.Nt, 2)
+        am = net.create_adjacency_matrix(weights=g)
+        A2 = net.create_laplacian_matrix(weights=g, out=A)
+        assert A2 is A
+        np.testing.assert_allclose(A.toarray(), laplacian(am).toarray())
+
+    def test_laplacian_pattern_cleared_on_new_conns(self):
+        net = op.network.Cubic(shape=[4, 3, 2])
+        pattern = net.get_laplacian_pattern()
+        assert net.get_laplacian_pattern() is pattern
+        op.topotools.trim(network=net, throats=[0])
+        assert net.get_laplacian_pattern()['tmap'].size == 4*net.Nt
+        net['throat.conns'] = net['throat.conns'][1:]
+        assert net.get_laplacian_pattern()['tmap'].size == 4*net.Nt
+
+
 if __name__ == '__main__':
 
     t = NetworkTest()
@@ -94,6 +94,24 @@ class UtilsTest:
         assert not op.utils.is_valid_propname("throat.")
         assert not op.utils.is_valid_propname("pore.foo..bar")
 
+    def test_segmented_reduce(self):
+        vals = np.array([3., 1., 2., 5., 4.])
+        indptr = np.array([0, 2, 2, 5])
+        f = op.utils.segmented_reduce
+        assert np.all(f(vals, indptr, mode='sum') == [4, 0, 11])
+        assert np.all(f(vals, indptr, mode='min') == [1, np.inf, 2])
+        assert np.all(f(vals, indptr, mode='max') == [3, -np.inf, 5])
+        mean = f(vals, indptr, mode='mean')
+        assert np.allclose(mean[[0, 2]], [2, 11/3]) and np.isnan(mean[1])
+        # Trailing dimensions are reduced column by column
+        a = f(np.vstack([vals, -vals]).T, indptr, mode='sum')
+        assert np.all(a == [[4, -4], [0, 0], [11, -11]])
+        # Boolean values are counted
+        a = f(np.array([True, True, False, True, True]), indptr)
+        assert np.all(a == [2, 0, 2])
+        with pytest.raises(Exception):
+            f(vals, indptr, mode='foo')
+
 
 if __name__ == '__main__':
 
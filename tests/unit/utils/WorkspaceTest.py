@@ -29,6 +29,53 @@ class WorkspaceTest:
         assert proj2.name in self.ws.keys()
         self.ws.clear()
 
+    def test_save_and_load_project_pnm(self, tmpdir):
+        net = op.network.Cubic(shape=[5, 5, 5])
+        air = op.phase.Air(network=net)
+        air['throat.diffusive_conductance'] = 1e-15
+        fd = op.algorithms.FickianDiffusion(network=net, phase=air)
+        fd.set_value_BC(pores=net.pores('left'), values=1.0)
+        fd.set_value_BC(pores=net.pores('right'), values=0.0)
+        fd.run()
+        fname = os.path.join(tmpdir, 'test_proj.pnm')
+        self.ws.save_project(net.project, filename=fname)
+        for mmap_mode in [None, 'r']:
+            proj = self.ws.load_project(fname, mmap_mode=mmap_mode)
+            assert proj.name != net.project.name
+            assert [obj.name for obj in proj] == \
+                [obj.name for obj in net.project]
+            assert [type(obj) for obj in proj] == \
+                [type(obj) for obj in net.project]
+            assert set(proj.network.keys()) == set(net.keys())
+            assert_allclose(proj.network['pore.coords'], net['pore.coords'])
+            assert_allclose(proj.phases[0]['pore.diffusivity'],
+                            air['pore.diffusivity'])
+            if mmap_mode == 'r':
+                with pytest.raises(ValueError):
+                    proj.network['pore.coords'][0] = 0
+            # The loaded algorithm refers to the loaded objects and can be rerun
+            alg = proj.algorithms[0]
+            assert alg.network is proj.network
+            alg.run()
+            assert_allclose(alg.x, fd.x)
+        self.ws.clear()
+
+    def test_save_project_with_model_that_cannot_be_imported(self, tmpdir):
+        net = op.network.Cubic(shape=[3, 3, 3])
+        net.add_model(propname='pore.foo', model=lambda network: network.Ps)
+        fname = os.path.join(tmpdir, 'test_proj.pnm')
+        with pytest.raises(Exception, match='<lambda> cannot be saved'):
+            self.ws.save_project(net.project, filename=fname)
+
+        def local_model(network):
+            return network.Ps
+
+        net.models.clear()
+        net.add_model(propname='pore.foo', model=local_model)
+        with pytest.raises(Exception, match='local_model cannot be saved'):
+            self.ws.save_project(net.project, filename=fname)
+        self.ws.clear()
+
     # def test_assign_project(self):
     #     proj = self.ws.new_project()
     #     with pytest.raises(Exception):